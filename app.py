@@ -3,20 +3,35 @@ Smart Text Cleaner & Analyzer - Version 2
 Advanced NLP application with multiple features and beautiful UI
 """
 
+import os
+from io import BytesIO
 import streamlit as st
 import pandas as pd
 import textwrap
 import streamlit.components.v1 as components
-from utils.text_processing import preprocess_text, get_tokens, get_text_statistics
-from utils.nlp_features import (
-    get_sentiment, get_readability, get_language,
-    extract_entities, extract_ngrams, get_tfidf_keywords
-)
+from utils.text_processing import preprocess_text, get_tokens
 from utils.visualizations import (
     create_wordcloud, create_ngram_chart, create_sentiment_gauge,
-    create_frequency_comparison
+    create_frequency_comparison, create_trend_chart, create_similarity_heatmap
+)
+from utils.exporters import (
+    export_to_csv, export_to_json, create_download_button,
+    iter_detail_records, iter_jsonl
 )
-from utils.exporters import export_to_csv, export_to_json
+from utils.chunking import analyze_chunked, split_into_chunks
+from utils.filters import LANGUAGE_NAMES
+from utils.normalization import NORMALIZATION_STEPS, DEFAULT_NORMALIZATION
+from utils.topics import load_topic_model, update_topic_model, TOPIC_MODEL_PATH
+from utils.summarization import SUMMARY_THRESHOLD
+from utils.timeseries import analyze_timeseries
+from utils.classifiers import CLASSIFIER_TASKS, get_classifier
+from utils.jobs import create_job, start_job_in_background, job_progress, job_results, JOB_FEATURES
+from utils.budget import load_cost_model, sample_text, describe_plan
+from utils.analyzers import ANALYZERS, plan_analysis, execute_plan, run_analysis
+from utils.similarity import compare_corpus, shared_terms, SIMILARITY_METRICS, FULL_MATRIX_LIMIT
+from utils.models import warm_models, model_footprints, analysis_slot, active_analyses
+
+ANALYSIS_WAIT_SECONDS = 60
 
 # Page configuration
 st.set_page_config(
@@ -26,6 +41,40 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+
+@st.cache_resource(show_spinner="🔄 Loading NLP models...")
+def load_shared_models():
+    """Load heavy models once per server process, shared by all sessions."""
+    return warm_models()
+
+
+model_errors = load_shared_models()
+
+
+@st.cache_resource
+def get_cost_model():
+    """Stage cost model shared by all sessions and refined by their run times."""
+    return load_cost_model()
+
+
+cost_model = get_cost_model()
+
+
+@st.cache_resource(max_entries=1)
+def get_topic_model(mtime: float):
+    """Saved topic model shared by all sessions; keyed on the file's mtime so retraining reloads it."""
+    return load_topic_model()
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def get_timeseries(data: bytes, window: str, step: str, features: tuple, **options) -> dict:
+    """Windowed trends of an uploaded CSV, cached on its contents and options so reruns reuse them."""
+    records = pd.read_csv(BytesIO(data))
+    if not {"timestamp", "text"} <= set(records.columns):
+        return {"error": "The CSV needs 'timestamp' and 'text' columns."}
+    with analysis_slot(timeout=ANALYSIS_WAIT_SECONDS):
+        return analyze_timeseries(records, window, step, features, **options)
+
 # Note: theme-specific CSS is applied after the sidebar selection so
 # dark/light mode can be switched at runtime.
 
@@ -39,8 +88,38 @@ with st.sidebar:
     
     # Analysis options
     st.markdown("### Analysis Options")
-    remove_stopwords = st.checkbox("Remove English Stopwords", value=True)
+    remove_stopwords = st.checkbox("Remove Stopwords", value=True)
     min_word_length = st.slider("Minimum Word Length:", 1, 5, 3)
+    stopword_language = st.selectbox(
+        "Stopword Language:",
+        ["auto"] + sorted(LANGUAGE_NAMES.values()),
+        index=0,
+        help="'auto' picks the stopword list from the detected language",
+    )
+    with st.expander("Custom Stopwords"):
+        stopword_upload = st.file_uploader("Domain stopword list (one word per line):", type=["txt"])
+        extra_stopwords_input = st.text_area("Additional stopwords (comma separated):", height=68)
+        allow_words_input = st.text_area("Always keep (comma separated):", height=68)
+    with st.expander("Text Normalization"):
+        normalization = st.multiselect(
+            "Cleaning steps:",
+            list(NORMALIZATION_STEPS),
+            default=list(DEFAULT_NORMALIZATION),
+            help="Applied before tokenizing: Unicode folding (NFKC, curly quotes), HTML stripping, "
+                 "URL/email/@handle removal, contraction expansion and line-break de-hyphenation",
+        )
+    
+    extra_stopwords = [w for w in extra_stopwords_input.split(",") if w.strip()]
+    if stopword_upload is not None:
+        extra_stopwords += [
+            line.split("#", 1)[0] for line in stopword_upload.getvalue().decode("utf-8").splitlines()
+        ]
+    filter_options = {
+        "language": stopword_language,
+        "extra_stopwords": tuple(extra_stopwords),
+        "allow_words": tuple(w for w in allow_words_input.split(",") if w.strip()),
+        "normalization": tuple(normalization),
+    }
     
     st.markdown("---")
     
@@ -52,9 +131,34 @@ with st.sidebar:
     show_ngrams = st.checkbox("🔤 N-gram Analysis", value=True)
     show_wordcloud = st.checkbox("☁️ Word Cloud", value=True)
     show_tfidf = st.checkbox("🎯 TF-IDF Keywords", value=True)
+    show_keyphrases = st.checkbox("🔑 Keyphrases", value=True)
+    show_classification = st.checkbox("🎭 Emotion & Toxicity", value=True)
+    
+    st.markdown("---")
+    
+    # Long document handling
+    st.markdown("### Long Documents")
+    chunked_mode = st.checkbox("🧩 Chunked analysis for long texts", value=True)
+    chunk_size = st.slider("Chunk Size (characters):", 5000, 100000, 20000, step=5000)
+    latency_budget = st.slider(
+        "⏱️ Latency Budget (seconds):", 1, 120, 15,
+        help="Expensive stages are sampled, chunked or deferred to stay within this budget",
+    )
+    
+    st.markdown("---")
+    
+    # Export options
+    st.markdown("### Export")
+    compact_json = st.checkbox("Compact JSON", value=False)
     
     st.markdown("---")
     
+    with st.expander("🖥️ Server Status"):
+        st.metric("Running Analyses", active_analyses())
+        st.dataframe(model_footprints(), use_container_width=True, hide_index=True)
+        for name, error in model_errors.items():
+            st.caption(f"⚠️ {name} unavailable: {error}")
+    
     st.markdown("""
     ### 📖 About
     Smart Text Analyzer v2.0  
@@ -127,7 +231,7 @@ st.markdown(textwrap.dedent("""
 """), unsafe_allow_html=True)
 
 # Main content area
-tab1, tab2, tab3, tab4 = st.tabs(["📝 Analyze", "📊 Dashboard", "🔄 Compare", "ℹ️ Help"])
+tab1, tab2, tab3, tab5, tab4 = st.tabs(["📝 Analyze", "📊 Dashboard", "🔄 Compare", "⚙️ Jobs", "ℹ️ Help"])
 
 with tab1:
     col1, col2 = st.columns([3, 1])
@@ -160,153 +264,277 @@ with tab1:
     
     # Analysis results
     if analyze_btn and text_input.strip():
-        with st.spinner("🔄 Analyzing text..."):
-            try:
-                # Text processing
-                tokens = get_tokens(text_input, remove_stopwords, min_word_length)
-                cleaned_text = " ".join(tokens)
-                
-                if not tokens:
-                    st.error("❌ No meaningful words found. Try adjusting the minimum word length or using different text.")
-                else:
-                    # Get all statistics
-                    stats = get_text_statistics(text_input, tokens)
-                    sentiment = get_sentiment(text_input) if show_sentiment else None
-                    readability = get_readability(text_input) if show_readability else None
-                    language = get_language(text_input)
-                    entities = extract_entities(text_input) if show_entities else None
+        try:
+            with st.spinner("🔄 Analyzing text..."), analysis_slot(timeout=ANALYSIS_WAIT_SECONDS):
+                try:
+                    # Text processing; long texts in chunked mode are never tokenized
+                    # whole, so peak memory stays bounded by the chunk size
+                    n_chars = len(text_input)
+                    whole_text = not (chunked_mode and n_chars > chunk_size)
+                    tokens = get_tokens(text_input, remove_stopwords, min_word_length, **filter_options) if whole_text else None
+                    cleaned_text = " ".join(tokens) if whole_text else None
                     
-                    # Display Cleaned Text
-                    st.markdown("---")
-                    st.subheader("✨ Cleaned Text")
-                    st.info(cleaned_text)
+                    st.session_state["last_text"] = text_input
                     
-                    # Statistics Dashboard
-                    st.markdown("---")
-                    st.subheader("📊 Text Statistics")
-                    
-                    stat_cols = st.columns(5)
-                    with stat_cols[0]:
-                        st.metric("Total Words (Cleaned)", stats["total_words_cleaned"])
-                    with stat_cols[1]:
-                        st.metric("Unique Words", stats["unique_words"])
-                    with stat_cols[2]:
-                        st.metric("Sentences", stats["sentence_count"])
-                    with stat_cols[3]:
-                        st.metric("Avg Word Length", stats["avg_word_length"])
-                    with stat_cols[4]:
-                        st.metric("Reading Time (min)", stats["reading_time_minutes"])
-                    
-                    # Sentiment Analysis
-                    if show_sentiment and sentiment:
-                        st.markdown("---")
-                        st.subheader("💭 Sentiment Analysis")
-                        sent_cols = st.columns(3)
-                        with sent_cols[0]:
-                            st.metric("Polarity", sentiment["polarity"], delta=sentiment["label"])
-                        with sent_cols[1]:
-                            st.metric("Subjectivity", sentiment["subjectivity"])
-                        with sent_cols[2]:
-                            st.metric("Sentiment", sentiment["label"])
-                    
-                    # Readability
-                    if show_readability and readability:
+                    if whole_text and not tokens:
+                        st.error("❌ No meaningful words found. Try adjusting the minimum word length or using different text.")
+                    else:
+                        # Plan each stage against the latency budget
+                        stages = ["statistics", "language"]
+                        stages += [stage for stage, enabled in (
+                            ("sentiment", show_sentiment), ("readability", show_readability),
+                            ("entities", show_entities), ("classification", show_classification),
+                            ("summary", not whole_text or len(cleaned_text) > SUMMARY_THRESHOLD),
+                            ("ngrams", show_ngrams), ("tfidf", show_tfidf),
+                            ("keyphrases", show_keyphrases), ("wordcloud", show_wordcloud),
+                        ) if enabled]
+                        plan = cost_model.plan(
+                            n_chars, stages, latency_budget,
+                            force_chunked=not whole_text,
+                            required=("statistics", "language"),
+                        )
+                        analysis_options = {
+                            "remove_stopwords": remove_stopwords, "min_length": min_word_length,
+                            "filter_options": filter_options,
+                        }
+                        samples = {}
+                        
+                        def stage_text(stage):
+                            """Full text, or an evenly spread sample for sampled stages."""
+                            sample_chars = plan[stage]["sample_chars"]
+                            if plan[stage]["mode"] != "sampled":
+                                return text_input
+                            if sample_chars not in samples:
+                                samples[sample_chars] = sample_text(text_input, sample_chars)
+                            return samples[sample_chars]
+                        
+                        def stage_tokens(stage):
+                            if plan[stage]["mode"] == "sampled":
+                                return get_tokens(stage_text(stage), remove_stopwords, min_word_length, **filter_options)
+                            # Chunked long texts have no whole-text tokens; use the merged chunk counts
+                            return tokens if tokens is not None else stats["freq_df"].counts
+                        
+                        def run_stage(stage):
+                            """Output of a planned stage; sampled stages run on their sample."""
+                            mode = plan.get(stage, {}).get("mode")
+                            if mode == "exact":
+                                return exact[stage]
+                            if mode == "sampled":
+                                sample = stage_text(stage)
+                                with cost_model.timed(stage, len(sample)):
+                                    return run_analysis(sample, [stage], analysis_options)[stage]
+                            return None
+                        
+                        def approximation_note(stage):
+                            if plan.get(stage, {}).get("mode") == "sampled":
+                                share = plan[stage]["sample_chars"] / n_chars
+                                st.caption(f"≈ Approximate: computed on an evenly spread {share:.0%} sample of the text")
+                        
+                        # Get all statistics
+                        chunked_stages = [stage for stage in stages if plan[stage]["mode"] == "chunked"]
+                        chunked = {}
+                        if chunked_stages:
+                            workers = os.cpu_count() or 1
+                            chunked = analyze_chunked(
+                                text_input, tuple(chunked_stages),
+                                chunk_size=min(chunk_size, max(n_chars // workers + 1, 1000)),
+                                remove_stopwords=remove_stopwords, min_length=min_word_length,
+                                filter_options=filter_options,
+                            )
+                            st.caption(f"🧩 {', '.join(chunked_stages).title()} analyzed in {chunked['chunks']} chunks")
+                        
+                        # Exact stages run as one analyzer graph: shared intermediates are
+                        # computed once and independent analyzers run concurrently
+                        exact_stages = tuple(
+                            stage for stage in stages if plan[stage]["mode"] == "exact" and stage in ANALYZERS
+                        )
+                        exact, timings = execute_plan(
+                            plan_analysis(exact_stages), text_input, analysis_options,
+                            precomputed={"tokens": tokens} if tokens is not None else None,
+                        )
+                        for stage in exact_stages:
+                            cost_model.observe(stage, n_chars, sum(timings.get(node, 0.0) for node in plan_analysis((stage,))))
+                        
+                        stats = chunked.get("statistics") or run_stage("statistics")
+                        language = chunked.get("language") or run_stage("language")
+                        sentiment = chunked.get("sentiment") or run_stage("sentiment")
+                        readability = chunked.get("readability") or run_stage("readability")
+                        entities = chunked.get("entities") or run_stage("entities")
+                        classification = chunked.get("classification") or run_stage("classification")
+                        
+                        deferred = [stage for stage in stages if plan[stage]["mode"] == "deferred"]
+                        if deferred:
+                            st.info("⏱️ Deferred to stay within the latency budget: " + ", ".join(
+                                f"{stage} (~{plan[stage]['estimate_seconds']:.1f}s)" for stage in deferred
+                            ) + ". Raise the budget in the sidebar to include them.")
+                        if any(entry["mode"] != "exact" for entry in plan.values()):
+                            with st.expander("⏱️ Execution plan"):
+                                st.dataframe(describe_plan(plan, n_chars), use_container_width=True, hide_index=True)
+                        
+                        # Display Cleaned Text (short inputs) or an extractive summary
                         st.markdown("---")
-                        st.subheader("📚 Readability Score")
-                        read_cols = st.columns(3)
-                        with read_cols[0]:
-                            st.metric("Flesch-Kincaid Grade", readability["flesch_kincaid_grade"])
-                        with read_cols[1]:
-                            st.metric("Flesch Reading Ease", readability["flesch_reading_ease"])
-                        with read_cols[2]:
-                            st.write(f"**Difficulty Level:**  \n{readability['difficulty_level']}")
-                    
-                    # Named Entities
-                    if show_entities and entities and "error" not in entities:
+                        if whole_text and len(cleaned_text) <= SUMMARY_THRESHOLD:
+                            st.subheader("✨ Cleaned Text")
+                            st.info(cleaned_text)
+                        else:
+                            st.subheader("📝 Summary")
+                            summary_df = run_stage("summary")
+                            if summary_df is not None and not summary_df.empty and "error" not in summary_df.columns:
+                                for sentence in summary_df["sentence"]:
+                                    st.markdown(f"- {sentence}")
+                                approximation_note("summary")
+                            if whole_text:
+                                with st.expander(f"✨ Cleaned Text (first {SUMMARY_THRESHOLD:,} of {len(cleaned_text):,} characters)"):
+                                    st.text(cleaned_text[:SUMMARY_THRESHOLD])
+                        
+                        # Statistics Dashboard
                         st.markdown("---")
-                        st.subheader("🏷️ Named Entities")
-                        entity_cols = st.columns(2)
-                        with entity_cols[0]:
-                            if entities["PERSON"]:
-                                st.write("**👤 Persons:**")
-                                for person in entities["PERSON"][:5]:
-                                    st.write(f"- {person}")
-                        with entity_cols[1]:
-                            if entities["LOCATION"]:
-                                st.write("**📍 Locations:**")
-                                for loc in entities["LOCATION"][:5]:
-                                    st.write(f"- {loc}")
-                    
-                    # Word Frequency Table
-                    st.markdown("---")
-                    st.subheader("📈 Word Frequency")
-                    st.dataframe(stats["freq_df"].head(15), use_container_width=True, hide_index=True)
-                    
-                    # N-gram Analysis
-                    if show_ngrams:
+                        st.subheader("📊 Text Statistics")
+                        
+                        stat_cols = st.columns(5)
+                        with stat_cols[0]:
+                            st.metric("Total Words (Cleaned)", stats["total_words_cleaned"])
+                        with stat_cols[1]:
+                            st.metric("Unique Words", stats["unique_words"])
+                        with stat_cols[2]:
+                            st.metric("Sentences", stats["sentence_count"])
+                        with stat_cols[3]:
+                            st.metric("Avg Word Length", stats["avg_word_length"])
+                        with stat_cols[4]:
+                            st.metric("Reading Time (min)", stats["reading_time_minutes"])
+                        
+                        # Sentiment Analysis
+                        if show_sentiment and sentiment:
+                            st.markdown("---")
+                            st.subheader("💭 Sentiment Analysis")
+                            sent_cols = st.columns(3)
+                            with sent_cols[0]:
+                                st.metric("Polarity", sentiment["polarity"], delta=sentiment["label"])
+                            with sent_cols[1]:
+                                st.metric("Subjectivity", sentiment["subjectivity"])
+                            with sent_cols[2]:
+                                st.metric("Sentiment", sentiment["label"])
+                            approximation_note("sentiment")
+                        
+                        # Readability
+                        if show_readability and readability:
+                            st.markdown("---")
+                            st.subheader("📚 Readability Score")
+                            read_cols = st.columns(3)
+                            with read_cols[0]:
+                                st.metric("Flesch-Kincaid Grade", readability["flesch_kincaid_grade"])
+                            with read_cols[1]:
+                                st.metric("Flesch Reading Ease", readability["flesch_reading_ease"])
+                            with read_cols[2]:
+                                st.write(f"**Difficulty Level:**  \n{readability['difficulty_level']}")
+                            approximation_note("readability")
+                        
+                        # Named Entities
+                        if show_entities and entities and "error" not in entities:
+                            st.markdown("---")
+                            st.subheader("🏷️ Named Entities")
+                            entity_cols = st.columns(2)
+                            with entity_cols[0]:
+                                if entities["PERSON"]:
+                                    st.write("**👤 Persons:**")
+                                    for person in entities["PERSON"][:5]:
+                                        st.write(f"- {person}")
+                            with entity_cols[1]:
+                                if entities["LOCATION"]:
+                                    st.write("**📍 Locations:**")
+                                    for loc in entities["LOCATION"][:5]:
+                                        st.write(f"- {loc}")
+                            approximation_note("entities")
+                        
+                        # Emotion & Toxicity
+                        if show_classification and classification:
+                            st.markdown("---")
+                            st.subheader("🎭 Emotion & Toxicity")
+                            trained = [task for task in CLASSIFIER_TASKS if task in classification]
+                            if not trained:
+                                st.info("No classifiers trained yet. Train one from a labeled CSV with "
+                                        "`python -m utils.classifiers train tickets.csv --task emotion`.")
+                            class_cols = st.columns(max(len(trained), 1))
+                            for col, task in zip(class_cols, trained):
+                                with col:
+                                    shares = classification[task]
+                                    if get_classifier(task).multilabel:
+                                        raised = [label for label, share in shares.items() if share >= 0.5]
+                                        st.metric(task.title(), ", ".join(raised) or "None flagged")
+                                    else:
+                                        st.metric(task.title(), max(shares, key=shares.get))
+                                    st.dataframe(
+                                        pd.DataFrame(shares.items(), columns=["label", "share"]),
+                                        use_container_width=True, hide_index=True,
+                                    )
+                            approximation_note("classification")
+                        
+                        # Word Frequency Table
                         st.markdown("---")
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            st.subheader("🔤 Bigrams (2-word phrases)")
-                            bigrams = extract_ngrams(tokens, 2)
-                            if bigrams:
-                                bigrams_df = pd.DataFrame(bigrams, columns=["bigram", "frequency"])
-                                fig_bigram = create_ngram_chart(bigrams, 2)
-                                st.plotly_chart(fig_bigram, use_container_width=True)
-                        with col2:
-                            st.subheader("🔤 Trigrams (3-word phrases)")
-                            trigrams = extract_ngrams(tokens, 3)
-                            if trigrams:
-                                trigrams_df = pd.DataFrame(trigrams, columns=["trigram", "frequency"])
-                                fig_trigram = create_ngram_chart(trigrams, 3)
-                                st.plotly_chart(fig_trigram, use_container_width=True)
-                    
-                    # TF-IDF Keywords
-                    if show_tfidf:
+                        st.subheader("📈 Word Frequency")
+                        st.dataframe(stats["freq_df"].head(15), use_container_width=True, hide_index=True)
+                        
+                        # N-gram Analysis
+                        if show_ngrams and plan["ngrams"]["mode"] != "deferred":
+                            st.markdown("---")
+                            ngrams = run_stage("ngrams")
+                            if "error" not in ngrams:
+                                bigrams, trigrams = ngrams["bigrams"], ngrams["trigrams"]
+                                approximation_note("ngrams")
+                                col1, col2 = st.columns(2)
+                                with col1:
+                                    st.subheader("🔤 Bigrams (2-word phrases)")
+                                    if bigrams:
+                                        bigrams_df = pd.DataFrame(bigrams, columns=["bigram", "frequency"])
+                                        fig_bigram = create_ngram_chart(bigrams, 2)
+                                        st.plotly_chart(fig_bigram, use_container_width=True)
+                                with col2:
+                                    st.subheader("🔤 Trigrams (3-word phrases)")
+                                    if trigrams:
+                                        trigrams_df = pd.DataFrame(trigrams, columns=["trigram", "frequency"])
+                                        fig_trigram = create_ngram_chart(trigrams, 3)
+                                        st.plotly_chart(fig_trigram, use_container_width=True)
+                        
+                        # TF-IDF Keywords
+                        if show_tfidf and plan["tfidf"]["mode"] != "deferred":
+                            st.markdown("---")
+                            st.subheader("🎯 TF-IDF Keywords")
+                            tfidf_df = run_stage("tfidf")
+                            if not tfidf_df.empty and "error" not in tfidf_df.columns:
+                                st.dataframe(tfidf_df.head(10), use_container_width=True, hide_index=True)
+                                approximation_note("tfidf")
+                        
+                        # Keyphrases
+                        if show_keyphrases and plan["keyphrases"]["mode"] != "deferred":
+                            st.markdown("---")
+                            st.subheader("🔑 Keyphrases")
+                            keyphrases_df = run_stage("keyphrases")
+                            if not keyphrases_df.empty and "error" not in keyphrases_df.columns:
+                                st.dataframe(keyphrases_df, use_container_width=True, hide_index=True)
+                                approximation_note("keyphrases")
+                        
+                        # Word Cloud
+                        if show_wordcloud and plan["wordcloud"]["mode"] != "deferred":
+                            st.markdown("---")
+                            st.subheader("☁️ Word Cloud")
+                            cloud_tokens = stage_tokens("wordcloud")
+                            with cost_model.timed("wordcloud", len(stage_text("wordcloud"))):
+                                wc_fig = create_wordcloud(cloud_tokens, "Most Frequent Words")
+                            if wc_fig:
+                                st.pyplot(wc_fig)
+                                approximation_note("wordcloud")
+                        
+                        # Frequency Chart
                         st.markdown("---")
-                        st.subheader("🎯 TF-IDF Keywords")
-                        tfidf_df = get_tfidf_keywords(text_input, 10)
-                        if not tfidf_df.empty and "error" not in tfidf_df.columns:
-                            st.dataframe(tfidf_df.head(10), use_container_width=True, hide_index=True)
-                    
-                    # Word Cloud
-                    if show_wordcloud:
+                        st.subheader("📊 Interactive Frequency Chart")
+                        freq_chart = create_frequency_comparison(stats["freq_df"], 10)
+                        st.plotly_chart(freq_chart, use_container_width=True)
+                        
+                        # Export Section
+                        # Payloads are built only when a download button is clicked
                         st.markdown("---")
-                        st.subheader("☁️ Word Cloud")
-                        wc_fig = create_wordcloud(tokens, "Most Frequent Words")
-                        if wc_fig:
-                            st.pyplot(wc_fig)
-                    
-                    # Frequency Chart
-                    st.markdown("---")
-                    st.subheader("📊 Interactive Frequency Chart")
-                    freq_chart = create_frequency_comparison(stats["freq_df"], 10)
-                    st.plotly_chart(freq_chart, use_container_width=True)
-                    
-                    # Export Section
-                    st.markdown("---")
-                    st.subheader("💾 Export Results")
-                    exp_col1, exp_col2 = st.columns(2)
-                    
-                    with exp_col1:
-                        csv_data = export_to_csv({
-                            "total_words_cleaned": stats["total_words_cleaned"],
-                            "unique_words": stats["unique_words"],
-                            "total_words_original": stats["total_words_original"],
-                            "characters": stats["characters"],
-                            "reading_time_minutes": stats["reading_time_minutes"],
-                            "sentiment": sentiment,
-                            "readability": readability,
-                        })
-                        st.download_button(
-                            label="📥 Download CSV",
-                            data=csv_data,
-                            file_name="analysis_results.csv",
-                            mime="text/csv"
-                        )
-                    
-                    with exp_col2:
-                        json_data = export_to_json({
+                        st.subheader("💾 Export Results")
+                        export_results = {
                             "total_words_cleaned": stats["total_words_cleaned"],
                             "unique_words": stats["unique_words"],
                             "total_words_original": stats["total_words_original"],
@@ -316,52 +544,347 @@ with tab1:
                             "readability": readability,
                             "language": language,
                             "entities": entities,
+                            "classification": classification,
                             "freq_df": stats["freq_df"],
-                        })
-                        st.download_button(
-                            label="📥 Download JSON",
-                            data=json_data,
-                            file_name="analysis_results.json",
-                            mime="application/json"
-                        )
-            
-            except Exception as e:
-                st.error(f"❌ Error during analysis: {str(e)}")
+                        }
+                        exp_col1, exp_col2, exp_col3 = st.columns(3)
+                        
+                        with exp_col1:
+                            create_download_button(
+                                "csv", lambda: export_to_csv(export_results), "analysis_results.csv"
+                            )
+                        
+                        with exp_col2:
+                            create_download_button(
+                                "json", lambda: export_to_json(export_results, compact_json),
+                                "analysis_results.json"
+                            )
+                        
+                        with exp_col3:
+                            create_download_button(
+                                "jsonl",
+                                lambda: b"".join(iter_jsonl(
+                                    iter_detail_records(text_input, tokens if tokens is not None else (
+                                        token for chunk in split_into_chunks(text_input, chunk_size)
+                                        for token in get_tokens(chunk, remove_stopwords, min_word_length, **filter_options)
+                                    ), entities)
+                                )),
+                                "analysis_details.jsonl",
+                            )
+                
+                except Exception as e:
+                    st.error(f"❌ Error during analysis: {str(e)}")
+        except TimeoutError:
+            st.warning("⏳ The server is busy with other analyses. Please try again in a moment.")
 
 with tab2:
     st.markdown("### 📊 Dashboard")
     st.info("Analyze text in the first tab to see the dashboard with visualizations.")
+    
+    # Topic Modeling
+    st.markdown("---")
+    st.subheader("🧠 Corpus Topics")
+    topic_model = get_topic_model(
+        os.path.getmtime(TOPIC_MODEL_PATH) if os.path.exists(TOPIC_MODEL_PATH) else None
+    )
+    
+    topic_cols = st.columns([2, 1])
+    with topic_cols[0]:
+        corpus_input = st.text_area(
+            "Add documents (one per line):", height=150, key="topic_corpus"
+        )
+        corpus_files = st.file_uploader(
+            "Or upload text files:", type=["txt"], accept_multiple_files=True, key="topic_files"
+        )
+    with topic_cols[1]:
+        n_topics = st.slider("Number of Topics:", 2, 20, 8, disabled=topic_model is not None)
+        topic_method = st.radio(
+            "Method:", ["lda", "nmf"], horizontal=True, disabled=topic_model is not None
+        )
+        update_topics_btn = st.button("🔄 Update Topic Model", use_container_width=True)
+        reset_topics_btn = st.button("🗑️ Reset Topic Model", use_container_width=True)
+    
+    if reset_topics_btn and topic_model is not None:
+        os.remove(TOPIC_MODEL_PATH)
+        topic_model = None
+        st.rerun()
+    
+    batch = [line for line in corpus_input.splitlines() if line.strip()]
+    batch += [f.getvalue().decode("utf-8", errors="ignore") for f in corpus_files or []]
+    
+    if update_topics_btn:
+        if batch:
+            with st.spinner("🔄 Updating topic model..."):
+                topic_model = update_topic_model(batch, n_topics, topic_method)
+            st.success(f"✅ Model updated with {len(batch)} documents")
+        else:
+            st.warning("⚠️ Add at least one document first.")
+    
+    if topic_model is not None and topic_model.n_documents:
+        st.caption(
+            f"{topic_model.method.upper()} model with {topic_model.n_topics} topics, "
+            f"trained on {topic_model.n_documents} documents"
+        )
+        st.dataframe(topic_model.topic_summary(), use_container_width=True, hide_index=True)
+        
+        if batch:
+            assignments = topic_model.assign_topics(batch)
+            assignments.insert(0, "document", [doc[:80] for doc in batch])
+            st.write("**Topic assignments for this batch:**")
+            st.dataframe(assignments, use_container_width=True, hide_index=True)
+        
+        if st.session_state.get("last_text"):
+            last = topic_model.assign_topics([st.session_state["last_text"]]).iloc[0]
+            st.metric("Topic of last analyzed text", int(last["topic"]), delta=f"weight {last['weight']}")
+    else:
+        st.write("No topic model yet. Add documents and click **Update Topic Model**.")
+    
+    # Time-series trends
+    st.markdown("---")
+    st.subheader("📈 Trends Over Time")
+    trend_cols = st.columns([2, 1])
+    with trend_cols[0]:
+        trend_file = st.file_uploader(
+            "Upload timestamped records (CSV with 'timestamp' and 'text' columns):",
+            type=["csv"], key="trend_file",
+        )
+    with trend_cols[1]:
+        trend_window = st.selectbox("Window:", ["1h", "6h", "1D", "7D", "30D"], index=2)
+        trend_step = st.selectbox(
+            "Slide every:", ["1h", "6h", "1D", "7D", "30D"], index=2,
+            help="Equal to the window for tumbling windows; smaller for sliding windows",
+        )
+        trend_entities = st.checkbox("Track named entities", value=False)
+    
+    if trend_file is not None:
+        trend_features = ("statistics", "sentiment", "language")
+        if trend_entities:
+            trend_features += ("entities",)
+        try:
+            with st.spinner("🔄 Aggregating records..."):
+                series = get_timeseries(
+                    trend_file.getvalue(), trend_window, trend_step, trend_features,
+                    remove_stopwords=remove_stopwords, min_length=min_word_length,
+                    filter_options=filter_options,
+                )
+        except TimeoutError:
+            st.warning("⏳ The server is busy with other analyses. Please try again in a moment.")
+        else:
+            if "error" in series:
+                st.error(f"❌ {series['error']}")
+            elif not series["trends"].empty:
+                trends = series["trends"]
+                st.plotly_chart(
+                    create_trend_chart(trends, ["polarity", "subjectivity"], "Sentiment Over Time", "Score"),
+                    use_container_width=True,
+                )
+                term_trends = series["term_trends"]
+                term_columns = [c for c in term_trends.columns if c != "window_start"]
+                if term_columns:
+                    st.plotly_chart(
+                        create_trend_chart(term_trends, term_columns, "Top Terms Over Time", "Count"),
+                        use_container_width=True,
+                    )
+                entity_trends = series.get("entity_trends")
+                if entity_trends is not None and len(entity_trends.columns) > 1:
+                    st.plotly_chart(
+                        create_trend_chart(entity_trends, [c for c in entity_trends.columns if c != "window_start"],
+                                           "Named Entities Over Time", "Mentions"),
+                        use_container_width=True,
+                    )
+                st.write("**🔥 Bursty terms**")
+                st.dataframe(series["bursts"].head(20), use_container_width=True, hide_index=True)
+                with st.expander("Window details"):
+                    st.dataframe(trends, use_container_width=True, hide_index=True)
 
 with tab3:
     st.markdown("### 🔄 Text Comparison")
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        text1 = st.text_area("Text 1:", height=200, key="text1")
+    compare_mode = st.radio("Mode:", ["Two texts", "Many documents"], horizontal=True)
     
-    with col2:
-        text2 = st.text_area("Text 2:", height=200, key="text2")
+    if compare_mode == "Two texts":
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            text1 = st.text_area("Text 1:", height=200, key="text1")
+        
+        with col2:
+            text2 = st.text_area("Text 2:", height=200, key="text2")
+        
+        if st.button("Compare Texts", type="primary"):
+            if text1 and text2:
+                tokens1 = set(get_tokens(text1, True, 3))
+                tokens2 = set(get_tokens(text2, True, 3))
+                
+                st.markdown("---")
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    st.metric("Common Words", len(tokens1 & tokens2))
+                with col2:
+                    st.metric("Unique to Text 1", len(tokens1 - tokens2))
+                with col3:
+                    st.metric("Unique to Text 2", len(tokens2 - tokens1))
+                
+                st.markdown("---")
+                st.subheader("📝 Common Words")
+                common_words = sorted(list(tokens1 & tokens2))
+                if common_words:
+                    st.write(", ".join(common_words[:50]))
     
-    if st.button("Compare Texts", type="primary"):
-        if text1 and text2:
-            tokens1 = set(get_tokens(text1, True, 3))
-            tokens2 = set(get_tokens(text2, True, 3))
-            
+    else:
+        compare_cols = st.columns([2, 1])
+        with compare_cols[0]:
+            compare_input = st.text_area("Documents (one per line):", height=150, key="compare_corpus")
+            compare_files = st.file_uploader(
+                "Or upload text files:", type=["txt"], accept_multiple_files=True, key="compare_files"
+            )
+        with compare_cols[1]:
+            compare_metric = st.radio("Similarity:", list(SIMILARITY_METRICS), horizontal=True)
+            compare_top_k = st.slider(
+                "Neighbours kept per document (large corpora):", 1, 50, 10,
+                help=f"Above {FULL_MATRIX_LIMIT:,} documents only the most similar neighbours are kept",
+            )
+            compare_btn = st.button("Compare Documents", type="primary", use_container_width=True)
+        
+        if compare_btn:
+            lines = [line for line in compare_input.splitlines() if line.strip()]
+            documents = lines + [f.getvalue().decode("utf-8", errors="ignore") for f in compare_files or []]
+            names = [f"Line {i + 1}" for i in range(len(lines))] + [f.name for f in compare_files or []]
+            with st.spinner("🔄 Comparing documents..."):
+                st.session_state["comparison"] = compare_corpus(
+                    documents, names, compare_metric,
+                    compare_top_k if len(documents) > FULL_MATRIX_LIMIT else None,
+                    remove_stopwords=remove_stopwords, min_length=min_word_length,
+                    filter_options=filter_options,
+                )
+        
+        comparison = st.session_state.get("comparison")
+        if comparison and "error" in comparison:
+            st.error(f"❌ {comparison['error']}")
+        elif comparison:
+            names = comparison["names"]
             st.markdown("---")
-            col1, col2, col3 = st.columns(3)
+            if comparison["order"] is not None:
+                st.subheader("🗺️ Clustered Similarity Heatmap")
+                st.plotly_chart(
+                    create_similarity_heatmap(
+                        comparison["matrix"], names, comparison["order"],
+                        f"{comparison['metric'].title()} Similarity",
+                    ),
+                    use_container_width=True,
+                )
+            else:
+                st.caption(f"{len(names):,} documents: showing the most similar pairs only")
             
-            with col1:
-                st.metric("Common Words", len(tokens1 & tokens2))
-            with col2:
-                st.metric("Unique to Text 1", len(tokens1 - tokens2))
-            with col3:
-                st.metric("Unique to Text 2", len(tokens2 - tokens1))
+            st.subheader("🔗 Most Similar Pairs")
+            st.dataframe(comparison["pairs"], use_container_width=True, hide_index=True)
             
-            st.markdown("---")
-            st.subheader("📝 Common Words")
-            common_words = sorted(list(tokens1 & tokens2))
-            if common_words:
-                st.write(", ".join(common_words[:50]))
+            st.subheader("🔍 Shared Terms")
+            pair_cols = st.columns(2)
+            with pair_cols[0]:
+                doc_a = st.selectbox("Document A:", range(len(names)), format_func=lambda i: names[i])
+            with pair_cols[1]:
+                doc_b = st.selectbox("Document B:", range(len(names)), index=1, format_func=lambda i: names[i])
+            matrix = comparison["matrix"]
+            st.metric("Similarity", round(float(matrix[doc_a, doc_b]), 4))
+            terms_df = shared_terms(comparison["vectors"], comparison["terms"], doc_a, doc_b)
+            if terms_df.empty:
+                st.info("These documents share no terms.")
+            else:
+                st.dataframe(terms_df, use_container_width=True, hide_index=True)
+
+with tab5:
+    st.markdown("### ⚙️ Batch Jobs")
+    st.write("Analyze a large corpus in resumable shards. Progress is saved after every shard.")
+    
+    with st.form("new_job"):
+        job_cols = st.columns([3, 2, 1, 1])
+        with job_cols[0]:
+            job_source = st.text_input(
+                "Input source:", placeholder="Directory of .txt files or a file with one document per line"
+            )
+        with job_cols[1]:
+            job_features = st.multiselect("Features:", list(JOB_FEATURES), default=["statistics", "sentiment"])
+        with job_cols[2]:
+            job_shard_size = st.number_input("Shard size:", min_value=1, value=100)
+        with job_cols[3]:
+            job_workers = st.number_input("Workers:", min_value=1, max_value=32, value=2)
+        create_job_btn = st.form_submit_button("➕ Create & Start Job", type="primary")
+    
+    if create_job_btn:
+        if not job_source or not os.path.exists(job_source):
+            st.error("❌ Input source not found.")
+        elif not job_features:
+            st.error("❌ Select at least one feature.")
+        else:
+            job_id = create_job(job_source, tuple(job_features), int(job_shard_size))
+            start_job_in_background(job_id, int(job_workers))
+            st.success(f"✅ Job {job_id} started")
+    
+    jobs_df = job_progress()
+    if jobs_df.empty:
+        st.info("No jobs yet.")
+    else:
+        st.button("🔄 Refresh")
+        st.dataframe(
+            jobs_df,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "progress": st.column_config.ProgressColumn("progress", min_value=0.0, max_value=1.0),
+                "eta_seconds": st.column_config.NumberColumn("ETA (s)"),
+            },
+        )
+        
+        manage_cols = st.columns([1, 1, 3])
+        with manage_cols[0]:
+            selected_job = st.selectbox("Job:", jobs_df["job"].tolist())
+        with manage_cols[1]:
+            st.write("")
+            if st.button("▶️ Run / Resume", use_container_width=True):
+                if start_job_in_background(int(selected_job)):
+                    st.success(f"✅ Job {selected_job} resumed")
+                else:
+                    st.info(f"Job {selected_job} is already running")
+        
+        job_summary = job_results(int(selected_job))
+        if job_summary.get("chunks"):
+            st.markdown(f"**Results so far** ({job_summary['chunks']} documents)")
+            result_cols = st.columns(3)
+            if "statistics" in job_summary:
+                with result_cols[0]:
+                    st.metric("Total Words", job_summary["statistics"]["total_words_original"])
+                    st.metric("Unique Words", job_summary["statistics"]["unique_words"])
+            if "sentiment" in job_summary:
+                with result_cols[1]:
+                    st.metric("Mean Polarity", job_summary["sentiment"]["polarity"],
+                              delta=job_summary["sentiment"]["label"])
+            if "language" in job_summary:
+                with result_cols[2]:
+                    st.metric("Main Language", job_summary["language"])
+            if "statistics" in job_summary:
+                st.dataframe(job_summary["statistics"]["top10"], use_container_width=True, hide_index=True)
+            if "sketches" in job_summary:
+                sketches = job_summary["sketches"]
+                st.write("**Corpus sketches** (approximate)")
+                sketch_cols = st.columns(2)
+                with sketch_cols[0]:
+                    st.metric("Distinct Terms (≈)", f"{sketches['distinct_terms']:,}")
+                with sketch_cols[1]:
+                    st.metric("Distinct Entities (≈)", f"{sketches['distinct_entities']:,}")
+                sketch_tables = st.columns(2)
+                with sketch_tables[0]:
+                    st.dataframe(sketches["top_terms"].head(10), use_container_width=True, hide_index=True)
+                with sketch_tables[1]:
+                    st.dataframe(sketches["top_bigrams"].head(10), use_container_width=True, hide_index=True)
+                st.dataframe(sketches["quantiles"], use_container_width=True, hide_index=True)
+            for task in CLASSIFIER_TASKS:
+                if task in job_summary.get("classification", {}):
+                    st.write(f"**{task.title()}** (share of documents)")
+                    st.dataframe(
+                        pd.DataFrame(job_summary["classification"][task].items(), columns=["label", "share"]),
+                        use_container_width=True, hide_index=True,
+                    )
 
 with tab4:
     st.markdown("### ℹ️ Help & Guide")
@@ -369,9 +892,12 @@ with tab4:
 #### 🎯 Features
 
 **Text Cleaning**
+- Unicode normalization (NFKC, curly quotes, dashes, invisible characters)
+- Strip HTML, remove URLs, emails and @handles, expand contractions, rejoin line-break hyphens
 - Remove punctuation and special characters
 - Convert to lowercase
-- Remove English stopwords (optional)
+- Remove stopwords for the detected language (optional)
+- Custom domain stopword lists and an always-keep list
 - Filter by minimum word length
 
 **Analysis Features**
@@ -381,11 +907,22 @@ with tab4:
 - 🔤 N-gram Analysis (Bigrams & Trigrams)
 - ☁️ Word Cloud Visualization
 - 🎯 TF-IDF Keyword Extraction
+- 🔑 Keyphrase Extraction (TextRank / RAKE)
+- 📝 Extractive Summary for long texts (TF-IDF centrality with MMR diversity)
+- 🎭 Emotion & Toxicity Classification (train with `python -m utils.classifiers train data.csv --task emotion`)
 - 📈 Interactive Frequency Charts
 
 **Export Options**
 - 📥 Download as CSV
-- 📥 Download as JSON
+- 📥 Download as JSON (pretty or compact)
+- 📥 Download per-sentence/token/entity details as JSON Lines
+
+**Trends Over Time**
+- 📈 Upload timestamped records in the Dashboard for windowed sentiment, language and term trends
+- 🔥 Bursty terms are flagged when a window's count jumps well above the recent baseline
+
+**Batch Jobs**
+- ⚙️ Resumable corpus analysis in shards, with progress, throughput and ETA
 
 #### 💡 Tips
 - Adjust the minimum word length to filter very short words
@@ -0,0 +1,80 @@
+"""Test configuration: offline corpora, golden outputs and performance calibration"""
+import json
+import time
+from pathlib import Path
+import pytest
+
+TESTS_DIR = Path(__file__).parent
+CORPORA_DIR = TESTS_DIR / "corpora"
+GOLDEN_DIR = TESTS_DIR / "golden"
+
+CALIBRATION_ITERATIONS = 200000
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--update-golden", action="store_true", default=False,
+        help="Re-record golden outputs instead of comparing against them",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "perf: performance budget test (deselect with -m 'not perf')")
+
+
+def _normalize(value):
+    """Round floats and convert tuples so outputs compare stably as JSON."""
+    if isinstance(value, float):
+        return round(value, 4)
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if hasattr(value, "item"):  # NumPy scalars
+        return _normalize(value.item())
+    return value
+
+
+@pytest.fixture(scope="session")
+def corpus():
+    """Load a fixed offline corpus by name (tests/corpora/<name>.txt)."""
+    def load(name: str) -> str:
+        return (CORPORA_DIR / f"{name}.txt").read_text(encoding="utf-8")
+    return load
+
+
+@pytest.fixture
+def golden(request):
+    """Compare an output against tests/golden/<name>.json."""
+    update = request.config.getoption("--update-golden")
+
+    def check(name: str, actual):
+        path = GOLDEN_DIR / f"{name}.json"
+        actual = _normalize(actual)
+        if update:
+            path.write_text(json.dumps(actual, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+            return
+        if not path.exists():
+            pytest.fail(f"No golden output recorded for {name}; run pytest --update-golden")
+        expected = json.loads(path.read_text(encoding="utf-8"))
+        assert actual == expected
+    return check
+
+
+@pytest.fixture(scope="session")
+def calibration():
+    """
+    Operations per second of a fixed pure-Python loop on this machine.
+    
+    Performance budgets are expressed relative to this number so they hold
+    on fast and slow machines alike.
+    """
+    best = 0.0
+    for _ in range(5):
+        start = time.perf_counter()
+        total = 0
+        for i in range(CALIBRATION_ITERATIONS):
+            total += i % 7
+        elapsed = time.perf_counter() - start
+        best = max(best, CALIBRATION_ITERATIONS / elapsed)
+    return best
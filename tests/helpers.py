@@ -0,0 +1,36 @@
+"""Shared helpers for the test suite"""
+import importlib
+import pytest
+
+
+def import_or_skip(module_name: str):
+    """
+    Import a utils module, skipping the test module if NLTK data is missing.
+    
+    The utils package loads NLTK corpora at import time, which raises
+    LookupError rather than ImportError when the data is not installed.
+    """
+    try:
+        return importlib.import_module(module_name)
+    except LookupError as e:
+        resource = next((line.strip() for line in str(e).splitlines() if "Resource" in line), str(e))
+        pytest.skip(f"NLTK data not installed ({resource})", allow_module_level=True)
+
+
+def skip_if_resource_missing(result):
+    """Skip when an analyzer reports a missing NLTK resource in its error field."""
+    error = result.get("error") if isinstance(result, dict) else None
+    if error and "Resource" in error:
+        pytest.skip("NLTK model data not installed")
+
+
+# Features used by the batch job tests
+TEST_JOB_FEATURES = ("statistics", "sentiment")
+
+
+def write_review_corpus(tmp_path, corpus, copies: int = 12) -> str:
+    """Write alternating positive/negative reviews, one document per paragraph, and return the path."""
+    path = tmp_path / "corpus.txt"
+    lines = [corpus("review_positive").strip(), corpus("review_negative").strip()] * (copies // 2)
+    path.write_text("\n\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
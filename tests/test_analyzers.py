@@ -0,0 +1,88 @@
+"""Tests for utils.analyzers"""
+import time
+import pytest
+from .helpers import import_or_skip
+
+analyzers = import_or_skip("utils.analyzers")
+text_processing = import_or_skip("utils.text_processing")
+nlp_features = import_or_skip("utils.nlp_features")
+
+
+@pytest.fixture
+def registry():
+    """Restore the registry after a test registers its own analyzers."""
+    saved = dict(analyzers.ANALYZERS)
+    yield analyzers
+    analyzers.ANALYZERS.clear()
+    analyzers.ANALYZERS.update(saved)
+    analyzers.plan_analysis.cache_clear()
+
+
+def test_plan_shares_intermediates():
+    order = analyzers.plan_analysis(("statistics", "ngrams", "keyphrases", "summary"))
+    assert order.count("tokens") == 1 and order.count("language") == 1
+    assert order.index("tokens") < order.index("statistics")
+    assert order.index("language") < order.index("keyphrases")
+    with pytest.raises(ValueError):
+        analyzers.plan_analysis(("no_such_analyzer",))
+
+
+def test_cycle_is_rejected(registry):
+    registry.register_analyzer("a", lambda b: b, ("b",))
+    registry.register_analyzer("b", lambda a: a, ("a",))
+    with pytest.raises(ValueError, match="cycle"):
+        registry.plan_analysis(("a",))
+
+
+def test_results_match_direct_calls(corpus):
+    text = corpus("news")
+    results = analyzers.run_analysis(text, ["statistics", "sentiment", "language", "ngrams"])
+    tokens = text_processing.get_tokens(text)
+    assert results["statistics"]["unique_words"] == len(set(tokens))
+    assert results["sentiment"] == nlp_features.get_sentiment(text)
+    assert results["language"] == nlp_features.get_language(text)
+    assert results["ngrams"]["bigrams"] == nlp_features.extract_ngrams(tokens, 2)
+
+
+def test_independent_analyzers_run_concurrently(registry):
+    calls = []
+
+    def shared(text):
+        calls.append("shared")
+        return text.upper()
+
+    registry.register_analyzer("shared", shared, intermediate=True)
+    for name in ("slow_a", "slow_b", "slow_c"):
+        registry.register_analyzer(name, lambda value: time.sleep(0.3) or value, ("shared",))
+    began = time.perf_counter()
+    results = registry.run_analysis("abc", ["slow_a", "slow_b", "slow_c"], max_workers=3)
+    assert time.perf_counter() - began < 0.8
+    assert calls == ["shared"]
+    assert results == {"slow_a": "ABC", "slow_b": "ABC", "slow_c": "ABC"}
+
+
+def test_failures_propagate_and_precomputed_inputs_are_used(registry):
+    registry.register_analyzer("broken", lambda text: 1 / 0, intermediate=True)
+    registry.register_analyzer("downstream", lambda value: value, ("broken",))
+    results, timings = registry.execute_plan(
+        registry.plan_analysis(("downstream", "ngrams")), "text", precomputed={"tokens": ["a", "b", "a", "b"]},
+    )
+    assert "division by zero" in results["downstream"]["error"]
+    assert results["ngrams"]["bigrams"][0] == ("a b", 2)
+    assert "tokens" not in timings
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_failures_cascade_without_running_nodes(registry, max_workers):
+    registry.register_analyzer("broken", lambda text: 1 / 0, intermediate=True)
+    registry.register_analyzer("middle", lambda value: value, ("broken",), intermediate=True)
+    registry.register_analyzer("last", lambda value: value, ("middle",))
+    results = registry.run_analysis("text", ["last"], max_workers=max_workers)
+    assert "division by zero" in results["last"]["error"]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_missing_inputs_raise_instead_of_waiting(max_workers):
+    # A hand-written order that skips the tokens these analyzers need
+    with pytest.raises(ValueError, match="statistics"):
+        analyzers.execute_plan(("statistics", "ngrams"), "some text", max_workers=max_workers)
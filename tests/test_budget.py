@@ -0,0 +1,65 @@
+"""Tests for utils.budget"""
+from .helpers import import_or_skip
+
+budget = import_or_skip("utils.budget")
+
+STAGES = ["statistics", "language", "sentiment", "entities", "keyphrases", "wordcloud"]
+
+
+def test_small_input_runs_exactly():
+    plan = budget.CostModel().plan(2_000, STAGES, 10, workers=4)
+    assert {entry["mode"] for entry in plan.values()} == {"exact"}
+
+
+def test_large_input_is_chunked_sampled_or_deferred():
+    model = budget.CostModel()
+    plan = model.plan(2_000_000, STAGES, 5, workers=4, required=("statistics", "language"))
+    assert plan["statistics"]["mode"] in ("exact", "chunked")
+    assert plan["language"]["mode"] != "deferred"
+    assert plan["entities"]["mode"] in ("sampled", "deferred")
+    for entry in plan.values():
+        if entry["mode"] == "sampled":
+            assert 0 < entry["sample_chars"] < 2_000_000
+    planned = sum(entry["estimate_seconds"] for entry in plan.values() if entry["mode"] != "deferred")
+    assert planned <= 5 + model.estimate("statistics", 2_000_000)
+
+
+def test_single_worker_never_chunks():
+    plan = budget.CostModel().plan(5_000_000, ["sentiment"], 1, workers=1)
+    assert plan["sentiment"]["mode"] in ("sampled", "deferred")
+
+
+def test_force_chunked():
+    model = budget.CostModel()
+    plan = model.plan(100, ["statistics", "ngrams"], 60, workers=2, force_chunked=True)
+    assert plan["statistics"]["mode"] == "chunked"
+    assert plan["ngrams"]["mode"] == "exact"
+    plan = model.plan(10_000_000, ["statistics", "entities"], 1, workers=2, force_chunked=True,
+                      required=("statistics",))
+    assert plan["statistics"]["mode"] == "chunked"
+    assert plan["entities"]["mode"] == "deferred"
+
+
+def test_observe_moves_estimate():
+    model = budget.CostModel(smoothing=0.5)
+    before = model.estimate("sentiment", 100_000)
+    model.observe("sentiment", 100_000, before * 3)
+    assert model.estimate("sentiment", 100_000) > before * 1.5
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / "costs.json")
+    model = budget.CostModel({"entities": (0.1, 0.02)})
+    model.save(path)
+    loaded = budget.load_cost_model(path)
+    assert loaded.estimate("entities", 10_000) == model.estimate("entities", 10_000)
+    assert budget.load_cost_model(str(tmp_path / "missing.json")).costs == budget.DEFAULT_COSTS
+
+
+def test_sample_text_spreads_over_document(corpus):
+    text = "\n\n".join(f"Paragraph {i} " + corpus("news") for i in range(20))
+    sample = budget.sample_text(text, len(text) // 10)
+    assert len(sample) <= len(text) // 5
+    assert sample == budget.sample_text(text, len(text) // 10)
+    assert "Paragraph 0 " in sample and "Paragraph 19 " not in sample[:len(sample) // 2]
+    assert budget.sample_text("short", 100) == "short"
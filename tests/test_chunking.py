@@ -0,0 +1,88 @@
+"""Tests for utils.chunking"""
+from collections import Counter
+from .helpers import import_or_skip
+
+chunking = import_or_skip("utils.chunking")
+nlp_features = import_or_skip("utils.nlp_features")
+text_processing = import_or_skip("utils.text_processing")
+
+FEATURES = ("statistics", "sentiment", "language")
+
+
+def _document(corpus):
+    return "\n\n".join(corpus(name) for name in ("news", "review_positive", "review_negative", "technical"))
+
+
+def test_chunks_respect_size_and_boundaries(corpus):
+    text = _document(corpus)
+    chunks = list(chunking.split_into_chunks(text, 400))
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 400 for chunk in chunks)
+    assert all(chunk.rstrip()[-1] in ".!?" for chunk in chunks)
+
+
+def test_long_sentence_is_hard_split():
+    chunks = list(chunking.split_into_chunks("word " * 100, 50))
+    assert all(len(chunk) <= 50 for chunk in chunks)
+    assert sum(len(chunk.split()) for chunk in chunks) == 100
+
+
+def test_chunked_counts_match_whole_document(corpus):
+    text = _document(corpus)
+    result = chunking.analyze_chunked(text, FEATURES, chunk_size=400, use_processes=False)
+    tokens = text_processing.get_tokens(text)
+    stats = result["statistics"]
+    assert stats["total_words_cleaned"] == len(tokens)
+    assert stats["unique_words"] == len(set(tokens))
+    assert stats["total_words_original"] == len(text.split())
+    assert dict(zip(stats["freq_df"]["word"], stats["freq_df"]["count"])) == Counter(tokens)
+    assert result["language"] == "en"
+
+
+def test_chunked_golden(corpus, golden):
+    result = chunking.analyze_chunked(_document(corpus), FEATURES, chunk_size=400, use_processes=False)
+    stats = result.pop("statistics")
+    stats.pop("freq_df")
+    stats["top10"] = stats["top10"].to_dict(orient="records")
+    result["statistics"] = stats
+    golden("chunked_document", result)
+
+
+def test_single_chunk_matches_unchunked(corpus):
+    text = corpus("review_positive")
+    result = chunking.analyze_chunked(text, FEATURES)
+    assert result["chunks"] == 1
+    assert result["sentiment"] == nlp_features.get_sentiment(text)
+
+
+def test_merge_readability_from_counts():
+    partial = {"words": 100, "characters": 500,
+               "readability": Counter(words=100, sentences=5, syllables=150, difficult_words=10)}
+    result = chunking.merge_results([partial])["readability"]
+    assert result["flesch_reading_ease"] == 59.64
+    assert result["flesch_kincaid_grade"] == 9.91
+    assert result["dale_chall_score"] == 6.21
+
+
+def test_entity_counts_are_unioned():
+    a = {"words": 1, "characters": 1, "entities": {"PERSON": Counter({"Ada": 1})}}
+    b = {"words": 1, "characters": 1, "entities": {"PERSON": Counter({"Ada": 2, "Bob": 1})}}
+    result = chunking.merge_results([a, b])
+    assert result["entity_counts"] == {"PERSON": {"Ada": 3, "Bob": 1}}
+    assert result["entities"] == {"PERSON": ["Ada", "Bob"]}
+
+
+def test_failed_partials_propagate_their_error():
+    def ok():
+        return {"words": 10, "characters": 50, "characters_no_space": 41, "sentence_count": 1,
+                "freq": Counter({"error": 2}),
+                "readability": Counter(words=10, sentences=1, syllables=15, difficult_words=1),
+                "classification": Counter({"documents": 1, "emotion:joy": 1})}
+
+    failed = dict(ok(), freq=Counter({"error": 1}),
+                  readability={"error": "syllable data missing"}, classification={"error": "no model"})
+    result = chunking.merge_results([ok(), failed, ok()])
+    assert result["readability"] == {"error": "syllable data missing"}
+    assert result["classification"] == {"error": "no model"}
+    assert result["statistics"]["total_words_cleaned"] == 5
+    assert chunking.merge_results([dict(failed)])["readability"] == {"error": "syllable data missing"}
@@ -0,0 +1,112 @@
+"""Tests for utils.classifiers"""
+import csv
+import random
+from collections import Counter
+import pytest
+from .helpers import import_or_skip
+
+classifiers = import_or_skip("utils.classifiers")
+models = import_or_skip("utils.models")
+
+EMOTION_WORDS = {
+    "joy": ["love", "great", "happy", "wonderful", "thanks"],
+    "anger": ["furious", "angry", "outraged", "unacceptable", "worst"],
+    "sadness": ["sad", "disappointed", "lonely", "unfortunately", "lost"],
+}
+FILLER = "the product order ticket support team delivery app update account payment today".split()
+
+
+def _write_csv(path, header, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return str(path)
+
+
+@pytest.fixture
+def emotion_csv(tmp_path):
+    rng = random.Random(0)
+    rows = []
+    for _ in range(300):
+        label = rng.choice(sorted(EMOTION_WORDS))
+        words = rng.sample(FILLER, 5) + rng.sample(EMOTION_WORDS[label], 2)
+        rng.shuffle(words)
+        rows.append((" ".join(words), label))
+    return _write_csv(tmp_path / "emotion.csv", ["text", "label"], rows)
+
+
+@pytest.fixture
+def toxicity_csv(tmp_path):
+    rng = random.Random(1)
+    rows = []
+    for _ in range(300):
+        insult, threat = rng.random() < 0.3, rng.random() < 0.3
+        words = rng.sample(FILLER, 5) + ["idiot"] * insult + ["destroy"] * threat
+        rng.shuffle(words)
+        rows.append((" ".join(words), int(insult), int(threat)))
+    return _write_csv(tmp_path / "toxicity.csv", ["text", "insult", "threat"], rows)
+
+
+def test_train_and_classify_multiclass(tmp_path, emotion_csv):
+    path = str(tmp_path / "emotion.joblib")
+    report = classifiers.train_classifier(emotion_csv, "emotion", path=path)
+    assert report["labels"] == ["anger", "joy", "sadness"] and not report["multilabel"]
+    assert report["accuracy"] > 0.9
+
+    classifier = classifiers.load_classifier("emotion", path)
+    result = classifier.classify(["I love it, thanks!", "This is unacceptable, I’m furious", "So sad it got lost"])
+    assert result["label"].tolist() == ["joy", "anger", "sadness"]
+    assert result["confidence"].between(0, 1).all()
+
+
+def test_train_and_classify_multilabel(tmp_path, toxicity_csv):
+    path = str(tmp_path / "toxicity.joblib")
+    report = classifiers.train_classifier(toxicity_csv, "toxicity", path=path)
+    assert report["labels"] == ["insult", "threat"] and report["multilabel"]
+
+    classifier = classifiers.load_classifier("toxicity", path)
+    result = classifier.classify(["you idiot", "I will destroy your account, idiot", "thanks for the update"])
+    assert result["flags"].tolist() == ["insult", "insult, threat", ""]
+
+
+def test_train_multilabel_with_constant_label(tmp_path):
+    rng = random.Random(2)
+    rows = [(" ".join(rng.sample(FILLER, 5) + ["idiot"] * (i % 3 == 0)), int(i % 3 == 0), 0) for i in range(120)]
+    path = str(tmp_path / "toxicity.joblib")
+    classifiers.train_classifier(_write_csv(tmp_path / "rare.csv", ["text", "insult", "threat"], rows),
+                                 "toxicity", path=path)
+    result = classifiers.load_classifier("toxicity", path).classify(["you idiot", "thanks for the update"])
+    assert result["flags"].tolist() == ["insult", ""]
+
+
+def test_classification_counts_merge(tmp_path, emotion_csv):
+    path = str(tmp_path / "emotion.joblib")
+    classifiers.train_classifier(emotion_csv, "emotion", path=path)
+    models.register_model("emotion_classifier", lambda: classifiers.load_classifier("emotion", path))
+    models.reset_model("emotion_classifier")
+    try:
+        texts = ["love it, great", "worst, furious", "great thanks", "so sad"]
+        whole = classifiers.classification_counts(texts, ("emotion",))
+        parts = classifiers.classification_counts(texts[:2], ("emotion",))
+        parts.update(classifiers.classification_counts(texts[2:], ("emotion",)))
+        assert whole == parts == Counter({"documents": 4, "emotion:joy": 2, "emotion:anger": 1,
+                                          "emotion:sadness": 1})
+        summary = classifiers.summarize_classification(whole)
+        assert summary == {"documents": 4, "emotion": {"anger": 0.25, "joy": 0.5, "sadness": 0.25}}
+    finally:
+        models.register_model("emotion_classifier", lambda: classifiers.load_classifier("emotion"))
+        models.reset_model("emotion_classifier")
+
+
+def test_shared_classifier_reloads_after_training_elsewhere(tmp_path, emotion_csv, monkeypatch):
+    monkeypatch.setattr(classifiers, "MODEL_DIR", str(tmp_path))
+    models.reset_model("emotion_classifier")
+    try:
+        assert classifiers.get_classifier("emotion") is None
+        # An explicit path skips the in-process reset, as training in another process would
+        classifiers.train_classifier(emotion_csv, "emotion", path=classifiers.classifier_path("emotion"))
+        first = classifiers.get_classifier("emotion")
+        assert first is not None and classifiers.get_classifier("emotion") is first
+    finally:
+        models.reset_model("emotion_classifier")
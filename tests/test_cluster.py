@@ -0,0 +1,50 @@
+"""Tests for utils.cluster"""
+import threading
+import pytest
+from .helpers import import_or_skip, write_review_corpus, TEST_JOB_FEATURES
+
+jobs = import_or_skip("utils.jobs")
+cluster = import_or_skip("utils.cluster")
+
+
+def test_local_cluster_matches_single_machine_run(tmp_path, corpus):
+    source = write_review_corpus(tmp_path, corpus)
+    db_path = str(tmp_path / "jobs.sqlite3")
+    local_job = jobs.create_job(source, TEST_JOB_FEATURES, 3, db_path)
+    cluster_job = jobs.create_job(source, TEST_JOB_FEATURES, 3, db_path)
+    assert jobs.run_job(local_job, 2, db_path) == "done"
+    assert cluster.run_local_cluster(cluster_job, workers=3, db_path=db_path, timeout=120) == "done"
+
+    expected = jobs.job_results(local_job, db_path)
+    merged = jobs.job_results(cluster_job, db_path)
+    assert merged["chunks"] == 12
+    assert merged["sentiment"] == expected["sentiment"]
+    assert merged["statistics"]["top10"].equals(expected["statistics"]["top10"])
+
+
+def test_lost_worker_shard_is_reassigned(tmp_path, corpus, monkeypatch):
+    monkeypatch.setenv(cluster.CLUSTER_KEY_ENV, "test-secret")
+    source = write_review_corpus(tmp_path, corpus, copies=6)
+    db_path = str(tmp_path / "jobs.sqlite3")
+    job_id = jobs.create_job(source, TEST_JOB_FEATURES, 2, db_path)
+    coordinator = cluster.Coordinator(job_id, ("127.0.0.1", 0), db_path=db_path)
+    runner = threading.Thread(target=lambda: setattr(coordinator, "status", coordinator.serve(60, 0.5)))
+    runner.start()
+
+    # A worker that takes a shard and disappears without answering
+    conn = cluster.Client(coordinator.address, authkey=b"test-secret")
+    cluster.send_message(conn, "ready", "flaky")
+    assert cluster.recv_message(conn)[0] == "shard"
+    conn.close()
+
+    assert cluster.run_worker(coordinator.address, name="steady", warm=False) == 3
+    runner.join()
+    assert coordinator.status == "done"
+    assert coordinator.workers == {"steady": 3}
+    assert jobs.job_results(job_id, db_path)["chunks"] == 6
+
+
+def test_cluster_requires_a_shared_key(monkeypatch):
+    monkeypatch.delenv(cluster.CLUSTER_KEY_ENV, raising=False)
+    with pytest.raises(ValueError, match=cluster.CLUSTER_KEY_ENV):
+        cluster.run_worker(("127.0.0.1", 1), warm=False)
@@ -0,0 +1,49 @@
+"""Tests for utils.exporters"""
+import json
+from io import BytesIO
+import pandas as pd
+from .helpers import import_or_skip
+
+exporters = import_or_skip("utils.exporters")
+
+RESULTS = {
+    "total_words_cleaned": 12,
+    "unique_words": 10,
+    "total_words_original": 20,
+    "characters": 120,
+    "reading_time_minutes": 0.1,
+    "sentiment": {"polarity": 0.5, "subjectivity": 0.6, "label": "Positive 😊", "color": "green"},
+    "readability": {"flesch_kincaid_grade": 5.2, "flesch_reading_ease": 80.1},
+    "language": "en",
+    "entities": {"PERSON": ["Ada Lovelace"]},
+    "freq_df": pd.DataFrame({"word": ["engine", "analytical"], "count": [3, 2]}),
+}
+
+
+def test_json_export_round_trips():
+    data = json.loads(exporters.export_to_json(RESULTS))
+    assert data["text_statistics"]["unique_words"] == 10
+    assert data["sentiment"]["label"] == "Positive 😊"
+    assert data["top_keywords"] == [{"word": "engine", "count": 3}, {"word": "analytical", "count": 2}]
+
+
+def test_compact_json_is_smaller():
+    pretty = exporters.export_to_json(RESULTS)
+    compact = exporters.export_to_json(RESULTS, compact=True)
+    assert json.loads(pretty) == json.loads(compact)
+    assert len(compact) < len(pretty)
+
+
+def test_csv_export():
+    df = pd.read_csv(BytesIO(exporters.export_to_csv(RESULTS)))
+    assert df.loc[df["Analysis Metric"] == "Unique Words", "Value"].item() == 10
+
+
+def test_detail_export_in_chunks():
+    text = "Ada wrote notes. Babbage built engines!"
+    records = list(exporters.iter_detail_records(text, ["ada", "wrote", "notes"], {"PERSON": {"Ada": 2}}))
+    chunks = list(exporters.iter_jsonl(records, chunk_rows=2))
+    assert len(chunks) == 3
+    lines = b"".join(chunks).decode().splitlines()
+    assert [json.loads(line)["section"] for line in lines] == ["sentence", "sentence", "token", "token", "token", "entity"]
+    assert json.loads(lines[1])["text"] == "Babbage built engines!"
@@ -0,0 +1,36 @@
+"""Tests for utils.filters"""
+from .helpers import import_or_skip
+
+filters = import_or_skip("utils.filters")
+text_processing = import_or_skip("utils.text_processing")
+
+
+def test_filter_is_cached_per_configuration():
+    assert filters.get_token_filter("en", True, 3) is filters.get_token_filter("english", True, 3)
+    assert filters.get_token_filter("en", True, 3) is not filters.get_token_filter("en", True, 4)
+
+
+def test_unsupported_language_falls_back_to_english():
+    assert filters.resolve_language("xx") == "english"
+    assert filters.resolve_language("en") == "english"
+
+
+def test_extra_stopwords_and_allow_list():
+    text = "The server crashed over the weekend"
+    assert text_processing.get_tokens(text) == ["server", "crashed", "weekend"]
+    assert text_processing.get_tokens(text, extra_stopwords=("server",)) == ["crashed", "weekend"]
+    assert text_processing.get_tokens(text, allow_words=("over",)) == ["server", "crashed", "over", "weekend"]
+
+
+def test_stopword_file(tmp_path):
+    path = tmp_path / "domain.txt"
+    path.write_text("# domain words\nserver\nweekend  # trailing comment\n", encoding="utf-8")
+    tokens = text_processing.get_tokens("The server crashed over the weekend", stopword_files=(str(path),))
+    assert tokens == ["crashed"]
+
+
+def test_filter_matches_reference_implementation(corpus):
+    stop = filters.get_stopwords("en")
+    raw = text_processing.get_tokens(corpus("news"), False, 1)
+    expected = [t for t in raw if t.isalpha() and t not in stop and len(t) >= 3]
+    assert filters.get_token_filter("en", True, 3)(raw) == expected
@@ -0,0 +1,35 @@
+"""Tests for utils.jobs"""
+from .helpers import import_or_skip, write_review_corpus, TEST_JOB_FEATURES
+
+jobs = import_or_skip("utils.jobs")
+
+
+def test_plan_shards_covers_every_document(tmp_path, corpus):
+    source = write_review_corpus(tmp_path, corpus)
+    shards = jobs.plan_shards(source, 5)
+    assert [(start, end) for start, end, _ in shards] == [(0, 5), (5, 10), (10, 12)]
+    texts = [text for _, _, locator in shards for text in jobs.read_shard(source, locator)]
+    assert len(texts) == 12 and texts[1] == corpus("review_negative").strip()
+
+
+def test_run_and_resume_is_idempotent(tmp_path, corpus):
+    db_path = str(tmp_path / "jobs.sqlite3")
+    job_id = jobs.create_job(write_review_corpus(tmp_path, corpus), TEST_JOB_FEATURES, 5, db_path)
+    assert jobs.run_job(job_id, 2, db_path) == "done"
+    first = jobs.job_results(job_id, db_path)
+    assert first["chunks"] == 12
+
+    # Simulate a crash that lost two shards, then resume
+    with jobs._session(db_path) as conn:
+        conn.execute("UPDATE shards SET status = 'running', result = NULL WHERE shard_index IN (0, 2)")
+    assert jobs.job_results(job_id, db_path)["chunks"] == 5
+    assert jobs.run_job(job_id, 2, db_path) == "done"
+
+    resumed = jobs.job_results(job_id, db_path)
+    assert resumed["chunks"] == 12
+    assert resumed["sentiment"] == first["sentiment"]
+    assert resumed["statistics"]["total_words_cleaned"] == first["statistics"]["total_words_cleaned"]
+
+    progress = jobs.job_progress(db_path)
+    assert progress.loc[0, "progress"] == 1.0
+    assert progress.loc[0, "shards"] == "3/3"
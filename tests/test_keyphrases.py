@@ -0,0 +1,25 @@
+"""Tests for utils.keyphrases"""
+from .helpers import import_or_skip
+
+keyphrases = import_or_skip("utils.keyphrases")
+
+
+def test_textrank_golden(corpus, golden):
+    df = keyphrases.extract_keyphrases(corpus("technical"), 10, "textrank")
+    golden("keyphrases_textrank_technical", df.to_dict(orient="records"))
+
+
+def test_rake_golden(corpus, golden):
+    df = keyphrases.extract_keyphrases(corpus("technical"), 10, "rake")
+    golden("keyphrases_rake_technical", df.to_dict(orient="records"))
+
+
+def test_keyphrases_occur_in_text(corpus):
+    text = corpus("news")
+    df = keyphrases.extract_keyphrases(text, 20)
+    for phrase, offset in zip(df["keyphrase"], df["offset"]):
+        assert text[offset:offset + len(phrase)] == phrase
+
+
+def test_empty_text():
+    assert keyphrases.extract_keyphrases("", 5).empty
@@ -0,0 +1,43 @@
+"""Tests for utils.nlp_features"""
+from .helpers import import_or_skip, skip_if_resource_missing
+
+nlp_features = import_or_skip("utils.nlp_features")
+text_processing = import_or_skip("utils.text_processing")
+
+
+def test_sentiment_golden(corpus, golden):
+    for name in ("review_positive", "review_negative", "news"):
+        golden(f"sentiment_{name}", nlp_features.get_sentiment(corpus(name)))
+
+
+def test_sentiment_labels(corpus):
+    assert nlp_features.get_sentiment(corpus("review_positive"))["color"] == "green"
+    assert nlp_features.get_sentiment(corpus("review_negative"))["color"] == "red"
+
+
+def test_language(corpus):
+    assert nlp_features.get_language(corpus("news")) == "en"
+    assert nlp_features.get_language(corpus("french")) == "fr"
+    assert nlp_features.get_language("") == "unknown"
+
+
+def test_readability_golden(corpus, golden):
+    result = nlp_features.get_readability(corpus("technical"))
+    skip_if_resource_missing(result)
+    golden("readability_technical", result)
+
+
+def test_ngrams_golden(corpus, golden):
+    tokens = text_processing.get_tokens(corpus("technical"))
+    golden("bigrams_technical", nlp_features.extract_ngrams(tokens, 2))
+    golden("trigrams_technical", nlp_features.extract_ngrams(tokens, 3))
+
+
+def test_tfidf_golden(corpus, golden):
+    df = nlp_features.get_tfidf_keywords(corpus("news"), 10)
+    golden("tfidf_news", df.to_dict(orient="records"))
+
+
+def test_tfidf_too_short():
+    df = nlp_features.get_tfidf_keywords("one sentence only", 10)
+    assert df["keyword"].tolist() == ["text_too_short"]
@@ -0,0 +1,42 @@
+"""Tests for utils.normalization"""
+import pytest
+from .helpers import import_or_skip
+
+normalization = import_or_skip("utils.normalization")
+text_processing = import_or_skip("utils.text_processing")
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("I can’t say it’s “fine”", 'I can not say it "fine"'),
+    ("They'll say we've WON'T", "They will say we have will not"),
+    ("<p>Fish &amp; chips</p><script>var x = 1;</script>", " Fish & chips  "),
+    ("see https://example.com/a?b=1, or www.test.org.", "see  URL , or  URL ."),
+    ("mail jane.doe+news@mail.co.uk or ping @jane_d", "mail  EMAIL  or ping  USER "),
+    ("inter-\n   national co-operation", "international co-operation"),
+    ("ﬁne ｗｉｄｅ soft­hyphen zero​width", "fine wide softhyphen zerowidth"),
+])
+def test_normalize_text(text, expected):
+    assert normalization.normalize_text(text) == expected
+
+
+def test_steps_are_configurable():
+    text = "Don't email bob@example.com"
+    assert normalization.normalize_text(text, steps=()) == text
+    assert normalization.normalize_text(text, steps=("emails",)) == "Don't email  EMAIL "
+    with pytest.raises(ValueError):
+        normalization.get_normalizer(("spelling",))
+
+
+def test_ascii_fast_path_matches_full_path():
+    normalizer = normalization.get_normalizer()
+    text = "Plain ASCII text, nothing to fold: it's 100% fine."
+    assert normalizer(text) == normalizer(text + "é")[:-1]
+
+
+def test_tokens_are_normalized():
+    tokens = text_processing.get_tokens(
+        "<b>Don’t</b> visit https://spam.example or mail spam@example.com about inter-\nnational café’s", False, 3
+    )
+    assert tokens == ["not", "visit", "mail", "about", "international", "café"]
+    raw = text_processing.get_tokens("<b>Don’t</b> visit https://spam.example", False, 3, normalization=())
+    assert raw == ["don", "visit", "https", "spam", "example"]
@@ -0,0 +1,101 @@
+"""Performance budgets for the analyzers
+
+Throughput is measured in input characters per calibration-loop operation
+(see the calibration fixture), so budgets hold across machines. Memory is
+the tracemalloc peak in bytes per input character. Budgets leave roughly
+4x headroom over measured values; tighten them when an optimization lands.
+"""
+import time
+import tracemalloc
+import pytest
+from .helpers import import_or_skip
+
+text_processing = import_or_skip("utils.text_processing")
+nlp_features = import_or_skip("utils.nlp_features")
+keyphrases = import_or_skip("utils.keyphrases")
+chunking = import_or_skip("utils.chunking")
+summarization = import_or_skip("utils.summarization")
+
+pytestmark = pytest.mark.perf
+
+REPEAT = 20
+MIN_SECONDS = 0.3
+
+# name: (min characters per calibration op, max peak bytes per character)
+BUDGETS = {
+    "get_tokens": (0.025, 50),
+    "get_text_statistics": (0.15, 40),
+    "get_sentiment": (0.0014, 60),
+    "extract_keyphrases": (0.02, 90),
+    "split_into_chunks": (6.0, 10),
+    "summarize": (0.04, 25),
+}
+
+
+@pytest.fixture(scope="module")
+def document(corpus):
+    text = "\n\n".join(corpus(name) for name in ("news", "review_positive", "review_negative", "technical"))
+    return "\n\n".join([text] * REPEAT)
+
+
+def _throughput(fn) -> float:
+    """Calls per second, after one warm-up call."""
+    fn()
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_SECONDS:
+            return calls / elapsed
+
+
+def _peak_memory(fn) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _analyzers(document):
+    tokens = text_processing.get_tokens(document)
+    return {
+        "get_tokens": lambda: text_processing.get_tokens(document),
+        "get_text_statistics": lambda: text_processing.get_text_statistics(document, tokens),
+        "get_sentiment": lambda: nlp_features.get_sentiment(document),
+        "extract_keyphrases": lambda: keyphrases.extract_keyphrases(document, 10),
+        "split_into_chunks": lambda: list(chunking.split_into_chunks(document, 2000)),
+        "summarize": lambda: summarization.summarize(document, 5, "mmr"),
+    }
+
+
+@pytest.mark.parametrize("name", sorted(BUDGETS))
+def test_throughput_budget(name, document, calibration):
+    min_chars_per_op, _ = BUDGETS[name]
+    fn = _analyzers(document)[name]
+    chars_per_op = _throughput(fn) * len(document) / calibration
+    assert chars_per_op >= min_chars_per_op, f"{name}: {chars_per_op:.4f} chars/op"
+
+
+@pytest.mark.parametrize("name", sorted(BUDGETS))
+def test_memory_budget(name, document):
+    _, max_bytes_per_char = BUDGETS[name]
+    fn = _analyzers(document)[name]
+    fn()  # warm caches and lazily loaded models outside the measurement
+    bytes_per_char = _peak_memory(fn) / len(document)
+    assert bytes_per_char <= max_bytes_per_char, f"{name}: {bytes_per_char:.1f} bytes/char"
+
+
+def test_chunked_memory_bounded_by_chunk_size(document):
+    def run(text):
+        return lambda: chunking.analyze_chunked(
+            text, ("statistics",), chunk_size=2000, max_workers=2, use_processes=False
+        )
+
+    run(document)()
+    small = _peak_memory(run(document))
+    large = _peak_memory(run("\n\n".join([document] * 8)))
+    assert large < 1.5 * small
@@ -0,0 +1,69 @@
+"""Tests for utils.resources"""
+import numpy as np
+from .helpers import import_or_skip
+
+resources = import_or_skip("utils.resources")
+
+
+def test_round_trip_lookup(tmp_path):
+    path = str(tmp_path / "store.bin")
+    resources.write_resource_store({
+        "words/test": (["zebra", "apple", "café", "apple"], None, {}),
+        "scores/test": (["b", "a", "ß"], [[2.0, 0.5], [1.0, 0.25], [3.0, 0.75]], {"columns": ("x", "y")}),
+        "labels/test": (["damn", "wow"], [[1], [0]], {"columns": ("label",), "categories": ["mood", "profanity"]}),
+    }, path)
+    store = resources.ResourceStore(path)
+
+    words = store.table("words/test")
+    assert len(words) == 3 and "café" in words and "apple" in words
+    assert "cafe" not in words and "" not in words and "a-much-longer-word" not in words
+    assert words.words() == frozenset({"zebra", "apple", "café"})
+
+    scores = store.table("scores/test")
+    assert scores.columns == ("x", "y")
+    np.testing.assert_array_equal(scores.get("ß"), [3.0, 0.75])
+    np.testing.assert_array_equal(scores.get("a"), [1.0, 0.25])
+    assert scores.get("missing") is None
+
+    labels = store.table("labels/test")
+    assert labels.get("damn") == "profanity" and labels.get("wow") == "mood"
+
+
+def test_mapped_sentiment_matches_textblob(tmp_path, corpus):
+    from textblob.en.sentiments import PatternAnalyzer
+
+    path = str(tmp_path / "store.bin")
+    report = resources.build_resource_store(path)
+    assert report["tables"]["sentiment/en"] > 1000
+    analyzer = resources.load_mapped_sentiment_analyzer(resources.ResourceStore(path))
+    reference = PatternAnalyzer()
+
+    samples = [corpus(name) for name in ("review_positive", "review_negative", "news")]
+    samples += ["not very good!", "really not bad at all", "terribly boring", "(!) great :)"]
+    for text in samples:
+        assert tuple(analyzer.analyze(text)) == tuple(reference.analyze(text))
+
+
+def test_easy_words_are_served_from_the_store(tmp_path, monkeypatch, corpus):
+    import textstat
+    from textstat.backend.validations import _is_difficult_word
+    models = import_or_skip("utils.models")
+
+    text = corpus("technical")
+    expected = textstat.difficult_words(text, syllable_threshold=0, unique=False)
+    path = str(tmp_path / "store.bin")
+    monkeypatch.setitem(resources.RESOURCE_COLLECTORS, "sentiment", lambda tables: None)
+    resources.build_resource_store(path)
+    monkeypatch.setattr(resources, "RESOURCE_STORE_PATH", path)
+    monkeypatch.setattr(_is_difficult_word, "get_lang_easy_words", _is_difficult_word.get_lang_easy_words)
+    _is_difficult_word.is_difficult_word.cache_clear()
+    for name in ("resource_store", "easy_words"):
+        models.reset_model(name)
+    try:
+        assert "en" in models.get_model("easy_words")
+        assert isinstance(_is_difficult_word.get_lang_easy_words("en"), resources.MappedTable)
+        assert textstat.difficult_words(text, syllable_threshold=0, unique=False) == expected
+    finally:
+        _is_difficult_word.is_difficult_word.cache_clear()
+        for name in ("resource_store", "easy_words"):
+            models.reset_model(name)
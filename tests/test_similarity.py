@@ -0,0 +1,53 @@
+"""Tests for utils.similarity"""
+import numpy as np
+from .helpers import import_or_skip
+
+similarity = import_or_skip("utils.similarity")
+text_processing = import_or_skip("utils.text_processing")
+
+NAMES = ("news", "review_positive", "review_negative", "technical")
+
+
+def _documents(corpus):
+    docs = [corpus(name) for name in NAMES]
+    return docs + [doc + " Appendix with extra remarks." for doc in docs]
+
+
+def test_blocked_cosine_matches_dense(corpus):
+    X, _ = similarity.vectorize_documents(_documents(corpus))
+    full = similarity.similarity_matrix(X)
+    dense = X.toarray()
+    assert np.allclose(full, dense @ dense.T, atol=1e-5)
+    assert np.allclose(similarity.similarity_matrix(X, block_cells=3), full)
+
+
+def test_jaccard_matches_token_sets(corpus):
+    docs = _documents(corpus)
+    X, _ = similarity.vectorize_documents(docs)
+    matrix = similarity.similarity_matrix(X, "jaccard", block_cells=5)
+    sets = [set(text_processing.get_tokens(doc)) for doc in docs]
+    assert np.isclose(matrix[0, 2], len(sets[0] & sets[2]) / len(sets[0] | sets[2]))
+
+
+def test_top_k_keeps_best_neighbours(corpus):
+    X, _ = similarity.vectorize_documents(_documents(corpus))
+    full = similarity.similarity_matrix(X)
+    top = similarity.similarity_matrix(X, top_k=2, block_cells=7)
+    assert (top.getnnz(axis=1) == 2).all()
+    np.fill_diagonal(full, -1)
+    for row in range(full.shape[0]):
+        assert np.allclose(np.sort(top[row].data), np.sort(full[row])[-2:])
+    # Each document's nearest neighbour is its own copy with the appendix
+    pairs = similarity.top_pairs(top, list(range(8)), 4)
+    assert sorted(b - a for a, b in zip(pairs["document_a"], pairs["document_b"])) == [4, 4, 4, 4]
+
+
+def test_compare_corpus_clusters_and_explains(corpus):
+    result = similarity.compare_corpus(_documents(corpus))
+    order = list(result["order"])
+    for i in range(4):
+        assert abs(order.index(i) - order.index(i + 4)) == 1
+    terms = similarity.shared_terms(result["vectors"], result["terms"], 0, 4)
+    assert terms["contribution"].is_monotonic_decreasing
+    assert "appendix" not in set(similarity.shared_terms(result["vectors"], result["terms"], 0, 1)["term"])
+    assert "error" in similarity.compare_corpus(["only one"])
@@ -0,0 +1,80 @@
+"""Tests for utils.sketches"""
+import json
+from collections import Counter
+import numpy as np
+from .helpers import import_or_skip, write_review_corpus, TEST_JOB_FEATURES
+
+sketches = import_or_skip("utils.sketches")
+
+
+def _zipf_words(seed, n=100000):
+    rng = np.random.default_rng(seed)
+    return [f"w{x}" for x in rng.zipf(1.3, n) if x < 50000]
+
+
+def test_hyperloglog_estimates_and_merges_distinct_counts():
+    a = sketches.HyperLogLog().add(f"term{i}" for i in range(60000))
+    b = sketches.HyperLogLog().add(f"term{i}" for i in range(40000, 120000))
+    assert abs(a.count() - 60000) / 60000 < 0.03
+    assert sketches.HyperLogLog().add(["x", "y", "x"]).count() == 2
+
+    a.merge(b)
+    assert abs(a.count() - 120000) / 120000 < 0.03
+    restored = sketches.HyperLogLog.from_dict(json.loads(json.dumps(a.to_dict())))
+    assert restored.count() == a.count()
+
+
+def test_heavy_hitters_match_exact_top_terms_across_shards():
+    words = _zipf_words(0)
+    exact = Counter(words)
+    shards = [sketches.HeavyHitters(), sketches.HeavyHitters()]
+    for i in range(0, len(words), 1000):
+        shards[i // 1000 % 2].add(Counter(words[i:i + 1000]))
+    merged = shards[0].merge(sketches.HeavyHitters.from_dict(json.loads(json.dumps(shards[1].to_dict()))))
+
+    top = merged.top(10)
+    assert [word for word, _ in top] == [word for word, _ in exact.most_common(10)]
+    # Count-Min only over-estimates, and by little for frequent items
+    assert all(0 <= count - exact[word] <= merged.total / merged.width for word, count in top)
+
+
+def test_tdigest_quantiles_close_to_exact_after_merge():
+    values = np.random.default_rng(1).normal(50, 15, 40000)
+    digest = sketches.TDigest().add(values[:25000])
+    digest.merge(sketches.TDigest.from_dict(json.loads(json.dumps(sketches.TDigest().add(values[25000:]).to_dict()))))
+    assert digest.count() == 40000
+    assert len(digest.means) <= digest.compression
+    for q in (0.05, 0.5, 0.95):
+        assert abs(digest.quantile(q) - np.quantile(values, q)) < 0.5
+    assert np.isnan(sketches.TDigest().quantile(0.5))
+
+
+def test_corpus_sketch_summary_and_round_trip():
+    sketch = sketches.CorpusSketch()
+    sketch.add_document(["data", "science", "data", "science", "rocks"], {"PERSON": ["Ada"]}, 0.5, 70.0)
+    other = sketches.CorpusSketch().add_document(["data", "science"], {"PERSON": ["Alan"]}, -0.1, 50.0)
+    encoded = json.dumps(other.to_dict())
+    assert len(encoded) < 10000  # mostly-zero tables are stored compressed
+    sketch.merge(sketches.CorpusSketch.from_dict(json.loads(encoded)))
+
+    summary = sketch.summary()
+    assert summary["documents"] == 2
+    assert summary["distinct_terms"] == 3
+    assert summary["distinct_entities"] == 2
+    assert summary["top_terms"].iloc[0].tolist() == ["data", 3]
+    assert summary["top_bigrams"].iloc[0].tolist() == ["data science", 3]
+    assert summary["quantiles"].set_index("quantile").loc["p50", "flesch_reading_ease"] == 60.0
+
+
+def test_job_results_include_sketches(tmp_path, corpus):
+    jobs = import_or_skip("utils.jobs")
+    db_path = str(tmp_path / "jobs.sqlite3")
+    job_id = jobs.create_job(write_review_corpus(tmp_path, corpus, 6), TEST_JOB_FEATURES + ("sketches",), 2, db_path)
+    assert jobs.run_job(job_id, 1, db_path) == "done"
+
+    results = jobs.job_results(job_id, db_path)
+    summary = results["sketches"]
+    assert summary["documents"] == 6
+    assert abs(summary["distinct_terms"] - results["statistics"]["unique_words"]) <= 1
+    assert summary["top_terms"]["word"].iloc[0] == results["statistics"]["top10"]["word"].iloc[0]
+    assert summary["quantiles"]["polarity"].notna().all()
@@ -0,0 +1,37 @@
+"""Tests for utils.summarization"""
+from .helpers import import_or_skip
+
+summarization = import_or_skip("utils.summarization")
+
+
+def test_split_sentences_offsets():
+    text = "  First sentence is here. Second one follows right after!\nShort.\n\n“Quoted third sentence here.”"
+    spans = summarization.split_sentences(text)
+    assert [text[start:end] for start, end in spans] == [
+        "First sentence is here.", "Second one follows right after!", "“Quoted third sentence here.”",
+    ]
+
+
+def test_summary_sentences_come_from_text(corpus):
+    text = corpus("news")
+    for method in ("centrality", "mmr"):
+        summary = summarization.summarize(text, 3, method)
+        assert len(summary) == 3
+        assert summary["start"].is_monotonic_increasing
+        for sentence, start, end in zip(summary["sentence"], summary["start"], summary["end"]):
+            assert text[start:end] == sentence
+
+
+def test_mmr_skips_duplicates(corpus):
+    text = corpus("news")
+    repeated = "\n".join([text] * 5)
+    centrality = summarization.summarize(repeated, 3, "centrality")
+    mmr = summarization.summarize(repeated, 3, "mmr", diversity=0.5)
+    assert centrality["sentence"].nunique() < 3
+    assert mmr["sentence"].nunique() == 3
+
+
+def test_summarize_edge_cases():
+    assert summarization.summarize("", 3).empty
+    assert summarization.summarize("the and of it is", 3).empty
+    assert "error" in summarization.summarize("Some text here to read.", 3, "lexrank").columns
@@ -0,0 +1,56 @@
+"""Tests for utils.text_processing"""
+import re
+from collections import Counter
+from .helpers import import_or_skip
+
+text_processing = import_or_skip("utils.text_processing")
+
+
+def test_get_tokens_golden(corpus, golden):
+    for name in ("news", "review_positive", "technical"):
+        golden(f"tokens_{name}", text_processing.get_tokens(corpus(name)))
+
+
+def test_get_tokens_without_stopword_removal(corpus, golden):
+    golden("tokens_review_negative_all", text_processing.get_tokens(corpus("review_negative"), False, 1))
+
+
+def test_get_tokens_keeps_fused_forms_whole(golden):
+    text = "I cannot believe they're gonna ship it; we wanna wait. Gimme a minute, lemme check what we gotta fix!"
+    golden("tokens_fused_forms", text_processing.get_tokens(text, False, 1))
+
+
+def test_preprocess_text_matches_tokens(corpus):
+    text = corpus("news")
+    assert text_processing.preprocess_text(text) == " ".join(text_processing.get_tokens(text))
+
+
+def test_get_tokens_filters():
+    tokens = text_processing.get_tokens("The 3 cats and 12 dogs ran off!", True, 3)
+    assert tokens == ["cats", "dogs", "ran"]
+
+
+def test_text_statistics_golden(corpus, golden):
+    text = corpus("news")
+    stats = text_processing.get_text_statistics(text, text_processing.get_tokens(text))
+    top10 = stats.pop("top10")
+    freq_df = stats.pop("freq_df")
+    assert len(freq_df) == stats["unique_words"]
+    stats["top10"] = top10.to_dict(orient="records")
+    golden("statistics_news", stats)
+
+
+def test_scalar_counts_match_split(corpus):
+    text = corpus("news") + "\n\n...  Trailing fragment!?  . \t"
+    assert text_processing.count_words(text) == len(text.split())
+    assert text_processing.count_sentences(text) == len([s for s in re.split(r"[.!?]+", text) if s.strip()])
+
+
+def test_frequency_table_is_lazy():
+    table = text_processing.FrequencyTable(Counter({"b": 3, "a": 3, "c": 1, "d": 5}))
+    assert len(table) == 4 and not table.empty
+    assert table.head(2).to_dict(orient="records") == [{"word": "d", "count": 5}, {"word": "b", "count": 3}]
+    assert table._frame is None
+    assert list(table["word"]) == ["d", "b", "a", "c"]
+    assert table._frame is not None
+    assert text_processing.FrequencyTable(Counter()).empty
@@ -0,0 +1,69 @@
+"""Tests for utils.timeseries"""
+import pandas as pd
+import pytest
+from .helpers import import_or_skip
+
+timeseries = import_or_skip("utils.timeseries")
+
+NORMAL = ["Delivery arrived on time and support was helpful.", "Payment page works nicely after the update."]
+BURST = "Login outage again, the outage blocked checkout."
+
+
+def _records(days=8, per_day=4, burst_day=6):
+    rows = []
+    for day in range(days):
+        for i in range(per_day):
+            text = BURST if day == burst_day and i < 3 else NORMAL[i % 2]
+            rows.append((pd.Timestamp("2026-03-01") + pd.Timedelta(days=day, hours=2 * i), text))
+    return pd.DataFrame(rows, columns=["timestamp", "text"])
+
+
+def test_sliding_windows_match_direct_sums():
+    records = _records()
+    sliding = timeseries.WindowedAnalyzer("3D", "1D", ("statistics",)).add(records)
+    daily = timeseries.WindowedAnalyzer("1D", features=("statistics",)).add(records)
+
+    trends = sliding.trends()
+    daily_words = daily.trends().set_index("window_start")["words"]
+    for _, row in trends.iterrows():
+        window = daily_words[(daily_words.index >= row["window_start"]) & (daily_words.index < row["window_end"])]
+        assert row["words"] == window.sum()
+    assert trends["documents"].tolist() == [4, 8, 12, 12, 12, 12, 12, 12]
+
+    outage = sliding.term_trends(["outage"])["outage"].tolist()
+    assert outage == [0, 0, 0, 0, 0, 0, 6, 6]
+
+
+def test_incremental_add_equals_single_pass():
+    records = _records()
+    once = timeseries.WindowedAnalyzer("2D", "1D", ("statistics",)).add(records)
+    twice = timeseries.WindowedAnalyzer("2D", "1D", ("statistics",))
+    twice.add(records.iloc[::2]).add(records.iloc[1::2])
+    pd.testing.assert_frame_equal(once.trends(), twice.trends())
+
+
+def test_bursty_terms():
+    bursts = timeseries.WindowedAnalyzer("1D", features=("statistics",)).add(_records()).bursty_terms()
+    assert bursts.iloc[0]["term"] == "outage"
+    assert bursts.iloc[0]["window_start"] == pd.Timestamp("2026-03-07")
+    assert "delivery" not in set(bursts["term"])
+
+
+def test_analyze_timeseries_sentiment_and_errors():
+    result = timeseries.analyze_timeseries(_records(days=2), "1D", features=("sentiment", "statistics"))
+    assert len(result["trends"]) == 2 and result["trends"]["polarity"].notna().all()
+    assert "error" in timeseries.analyze_timeseries(_records(days=2), "1D", "7D")
+    with pytest.raises(ValueError):
+        timeseries.WindowedAnalyzer("3h", "2h")
+
+
+def test_outlier_timestamp_skips_empty_windows():
+    records = _records(days=3)
+    records.loc[len(records)] = (pd.Timestamp("1970-01-01"), NORMAL[0])
+    analyzer = timeseries.WindowedAnalyzer("2h", "1h", ("statistics",)).add(records)
+    windows = [(start, state["documents"]) for start, _, state in analyzer.iter_windows()]
+    assert windows[0] == (pd.Timestamp("1969-12-31 23:00"), 1)
+    assert all(documents > 0 for _, documents in windows)
+    assert len(windows) < 50
+    # Each record is in two windows, except the newest, whose second window ends after the data
+    assert analyzer.trends()["documents"].sum() == 2 * len(records) - 1
@@ -0,0 +1,35 @@
+"""Tests for utils.topics"""
+from .helpers import import_or_skip
+
+topics = import_or_skip("utils.topics")
+
+SPORTS = "The football match ended with a late goal and the team celebrated the win"
+FINANCE = "The stock market fell as investors sold shares and bond yields rose sharply"
+
+
+def test_incremental_fit_separates_topics(tmp_path):
+    model = topics.TopicModel(n_topics=2, method="nmf")
+    model.partial_fit([SPORTS] * 10)
+    model.partial_fit([FINANCE] * 10)
+    assignments = model.assign_topics([SPORTS, FINANCE])
+    assert assignments["topic"][0] != assignments["topic"][1]
+    assert model.n_documents == 20
+
+    path = tmp_path / "topics.joblib"
+    model.save(str(path))
+    loaded = topics.load_topic_model(str(path))
+    assert loaded.top_terms(3) == model.top_terms(3)
+
+
+def test_missing_model_loads_as_none(tmp_path):
+    assert topics.load_topic_model(str(tmp_path / "missing.joblib")) is None
+
+
+def test_update_leaves_loaded_models_untouched(tmp_path):
+    path = str(tmp_path / "topics.joblib")
+    first = topics.update_topic_model([SPORTS] * 5, n_topics=2, method="nmf", path=path)
+    shared = topics.load_topic_model(path)
+    updated = topics.update_topic_model([FINANCE] * 5, path=path)
+    assert shared.n_documents == first.n_documents == 5
+    assert updated.n_documents == topics.load_topic_model(path).n_documents == 10
+    assert not (tmp_path / "topics.joblib.tmp").exists()
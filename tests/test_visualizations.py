@@ -0,0 +1,54 @@
+"""Tests for utils.visualizations"""
+import pandas as pd
+from .helpers import import_or_skip
+
+visualizations = import_or_skip("utils.visualizations")
+
+
+def test_limit_points_aggregates_remainder():
+    labels, values = visualizations.limit_points(list("abcdef"), [1, 6, 2, 5, 3, 4], 4)
+    assert list(labels) == ["b", "d", "f", "(other)"]
+    assert list(values) == [6, 5, 4, 6]
+
+
+def test_limit_points_within_budget():
+    labels, values = visualizations.limit_points(["a", "b"], [1, 2], 4)
+    assert list(labels) == ["a", "b"]
+
+
+def test_figures_are_cached_by_data():
+    ngrams = [("linear constraints", 3), ("minimal set", 2)]
+    first = visualizations.create_ngram_chart(ngrams, 2)
+    key = next(reversed(visualizations._figure_cache))
+    again = visualizations.create_ngram_chart(list(ngrams), 2)
+    assert next(reversed(visualizations._figure_cache)) == key and again == first
+    visualizations.create_ngram_chart([("minimal set", 2)], 2)
+    assert next(reversed(visualizations._figure_cache)) != key
+
+
+def test_cached_figures_are_not_shared():
+    ngrams = [("linear constraints", 3), ("minimal set", 2)]
+    first = visualizations.create_ngram_chart(ngrams, 2)
+    first.update_layout(title="changed in one session")
+    second = visualizations.create_ngram_chart(ngrams, 2)
+    assert second is not first and second.layout.title.text != "changed in one session"
+    assert all(isinstance(spec, dict) for spec in visualizations._figure_cache.values())
+
+
+def test_figure_cache_is_thread_safe():
+    from concurrent.futures import ThreadPoolExecutor
+
+    def chart(i):
+        return visualizations.create_ngram_chart([(f"term {i % 80}", i % 7 + 1)], 2)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        figures = list(pool.map(chart, range(160)))
+    assert len(figures) == 160
+    assert len(visualizations._figure_cache) <= visualizations.FIGURE_CACHE_SIZE
+
+
+def test_frequency_chart_payload_is_bounded():
+    freq_df = pd.DataFrame({"word": [f"w{i}" for i in range(5000)], "count": range(5000, 0, -1)})
+    small = visualizations.create_frequency_comparison(freq_df, 10)
+    assert len(small.data[0].x) == 10
+    assert visualizations.figure_payload_size(small) < 20000
@@ -6,6 +6,21 @@ from .nlp_features import (
 )
 from .visualizations import create_wordcloud, create_ngram_chart
 from .exporters import export_to_csv, export_to_json
+from .chunking import analyze_chunked, split_into_chunks
+from .filters import get_token_filter
+from .topics import TopicModel, load_topic_model, update_topic_model
+from .keyphrases import extract_keyphrases
+from .jobs import create_job, run_job, job_progress, job_results
+from .resources import build_resource_store, ResourceStore
+from .normalization import normalize_text, get_normalizer
+from .classifiers import TextClassifier, train_classifier, load_classifier
+from .summarization import summarize
+from .timeseries import WindowedAnalyzer, analyze_timeseries
+from .budget import CostModel, load_cost_model, sample_text
+from .cluster import Coordinator, run_worker, run_local_cluster
+from .similarity import compare_corpus, similarity_matrix
+from .analyzers import register_analyzer, plan_analysis, run_analysis
+from .sketches import CorpusSketch, HyperLogLog, HeavyHitters, TDigest
 
 __all__ = [
     'preprocess_text',
@@ -20,4 +35,40 @@ __all__ = [
     'create_ngram_chart',
     'export_to_csv',
     'export_to_json',
+    'analyze_chunked',
+    'split_into_chunks',
+    'get_token_filter',
+    'TopicModel',
+    'load_topic_model',
+    'update_topic_model',
+    'extract_keyphrases',
+    'create_job',
+    'run_job',
+    'job_progress',
+    'job_results',
+    'build_resource_store',
+    'ResourceStore',
+    'normalize_text',
+    'get_normalizer',
+    'TextClassifier',
+    'train_classifier',
+    'load_classifier',
+    'summarize',
+    'WindowedAnalyzer',
+    'analyze_timeseries',
+    'CostModel',
+    'load_cost_model',
+    'sample_text',
+    'Coordinator',
+    'run_worker',
+    'run_local_cluster',
+    'compare_corpus',
+    'similarity_matrix',
+    'register_analyzer',
+    'plan_analysis',
+    'run_analysis',
+    'CorpusSketch',
+    'HyperLogLog',
+    'HeavyHitters',
+    'TDigest',
 ]
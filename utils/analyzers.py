@@ -0,0 +1,282 @@
+"""Analyzer registry and dependency-aware execution plans"""
+import argparse
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import lru_cache
+import textstat
+from nltk.tokenize import sent_tokenize
+from .text_processing import get_tokens, get_text_statistics
+from .nlp_features import (
+    get_sentiment, get_readability, get_language, tag_sentences, count_tagged_entities,
+    extract_ngrams, get_tfidf_keywords,
+)
+from .keyphrases import extract_keyphrases
+from .summarization import summarize
+from .classifiers import classification_counts, summarize_classification
+from .models import get_model
+
+# Inputs every plan is given rather than computes
+SOURCES = ("text", "options")
+
+ANALYZERS = {}
+
+
+class Analyzer:
+    """
+    One node of the analysis graph.
+
+    Args:
+        name: Output name other analyzers depend on
+        func: Callable taking the outputs of inputs, in order
+        inputs: Names of sources or analyzers this one consumes
+        intermediate: Shared preprocessing rather than a user-facing feature
+    """
+
+    def __init__(self, name: str, func, inputs: tuple = ("text",), intermediate: bool = False):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.intermediate = intermediate
+
+
+def register_analyzer(name: str, func, inputs: tuple = ("text",), intermediate: bool = False):
+    """
+    Register (or replace) an analyzer.
+
+    Args:
+        name: Output name
+        func: Callable taking the outputs of inputs, in order
+        inputs: Sources ("text", "options") or other analyzer names
+        intermediate: Shared preprocessing rather than a user-facing feature
+    """
+    ANALYZERS[name] = Analyzer(name, func, inputs, intermediate)
+    plan_analysis.cache_clear()
+
+
+def list_analyzers(include_intermediate: bool = False) -> list:
+    """Names of registered analyzers (features only by default)."""
+    return [name for name, analyzer in ANALYZERS.items() if include_intermediate or not analyzer.intermediate]
+
+
+@lru_cache(maxsize=64)
+def plan_analysis(features: tuple) -> tuple:
+    """
+    Resolve the analyzers needed for a set of features, dependencies first.
+
+    Each intermediate appears once no matter how many features need it.
+
+    Args:
+        features: Analyzer names to produce
+
+    Returns:
+        Tuple of analyzer names in a valid execution order
+    """
+    order, visiting = [], set()
+
+    def visit(name):
+        if name in SOURCES or name in order:
+            return
+        if name not in ANALYZERS:
+            raise ValueError(f"Unknown analyzer: {name}")
+        if name in visiting:
+            raise ValueError(f"Analyzer dependency cycle through: {name}")
+        visiting.add(name)
+        for dependency in ANALYZERS[name].inputs:
+            visit(dependency)
+        visiting.discard(name)
+        order.append(name)
+
+    for feature in features:
+        visit(feature)
+    return tuple(order)
+
+
+def _run_node(analyzer: Analyzer, args: list) -> tuple:
+    """Run one analyzer, capturing its error and wall time."""
+    began = time.perf_counter()
+    try:
+        value, failed = analyzer.func(*args), False
+    except Exception as e:
+        value, failed = {"error": str(e)}, True
+    return value, failed, time.perf_counter() - began
+
+
+def execute_plan(order: tuple, text: str, options: dict = None, max_workers: int = None,
+                 precomputed: dict = None) -> tuple:
+    """
+    Run a plan, starting each analyzer as soon as its inputs are ready.
+
+    Independent analyzers run concurrently on a thread pool; an analyzer
+    whose input failed is not run and reports the failure instead.
+
+    Args:
+        order: Plan from plan_analysis
+        text: Input text
+        options: Shared options (remove_stopwords, min_length, filter_options)
+        max_workers: Concurrent analyzers (1 runs the plan in order on this thread)
+        precomputed: Outputs already available, e.g. {"tokens": tokens}
+
+    Returns:
+        Tuple of (outputs by name, seconds by analyzer name)
+
+    Raises:
+        ValueError: If an analyzer's inputs are neither in the plan nor precomputed
+    """
+    results = {"text": text, "options": options or {}}
+    results.update(precomputed or {})
+    failed, timings = set(), {}
+    todo = [name for name in order if name not in results]
+
+    def inputs_of(name):
+        return ANALYZERS[name].inputs
+
+    def record(name, value, node_failed, seconds):
+        results[name] = value
+        timings[name] = seconds
+        if node_failed:
+            failed.add(name)
+
+    def unsatisfiable(names):
+        return ValueError(f"Inputs never become available for: {', '.join(names)}")
+
+    def blocked(name):
+        broken = [dependency for dependency in inputs_of(name) if dependency in failed]
+        if broken:
+            record(name, {"error": f"{broken[0]} failed: {results[broken[0]]['error']}"}, True, 0.0)
+        return bool(broken)
+
+    if max_workers == 1 or len(todo) <= 1:
+        for name in todo:
+            if any(i not in results for i in inputs_of(name)):
+                raise unsatisfiable(todo[todo.index(name):])
+            if not blocked(name):
+                record(name, *_run_node(ANALYZERS[name], [results[i] for i in inputs_of(name)]))
+        return results, timings
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        running = {}
+        while todo or running:
+            ready = [n for n in todo if all(i in results for i in inputs_of(n))]
+            for name in ready:
+                todo.remove(name)
+                if not blocked(name):
+                    args = [results[i] for i in inputs_of(name)]
+                    running[executor.submit(_run_node, ANALYZERS[name], args)] = name
+            if not running:
+                if not ready:
+                    raise unsatisfiable(todo)
+                continue  # only failures were recorded; their dependents may now be ready
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                record(running.pop(future), *future.result())
+    return results, timings
+
+
+def run_analysis(text: str, features, options: dict = None, max_workers: int = None,
+                 precomputed: dict = None) -> dict:
+    """
+    Compute features of a text, sharing intermediates between them.
+
+    Args:
+        text: Input text
+        features: Analyzer names (see list_analyzers)
+        options: Shared options (remove_stopwords, min_length, filter_options)
+        max_workers: Concurrent analyzers (1 for sequential)
+        precomputed: Outputs already available, e.g. {"tokens": tokens}
+
+    Returns:
+        Dictionary mapping each requested feature to its output
+    """
+    features = tuple(features)
+    results, _ = execute_plan(plan_analysis(features), text, options, max_workers, precomputed)
+    return {feature: results[feature] for feature in features}
+
+
+def _tokens(text: str, options: dict) -> list:
+    return get_tokens(
+        text, options.get("remove_stopwords", True), options.get("min_length", 3),
+        **(options.get("filter_options") or {}),
+    )
+
+
+def _content_language(language: str, options: dict) -> str:
+    """Stopword language: the configured one, or the detected one for "auto"."""
+    configured = (options.get("filter_options") or {}).get("language", "auto")
+    return language if configured == "auto" else configured
+
+
+def _readability_counts(text: str) -> Counter:
+    """Additive readability inputs (chunked results merge these)."""
+    get_model("easy_words")  # Dale-Chall list from the resource store, when built
+    return Counter({
+        "words": textstat.lexicon_count(text),
+        "sentences": textstat.sentence_count(text),
+        "syllables": textstat.syllable_count(text),
+        "difficult_words": textstat.difficult_words(text, syllable_threshold=0, unique=False),
+    })
+
+
+# Shared intermediates
+register_analyzer("tokens", _tokens, ("text", "options"), intermediate=True)
+register_analyzer("sentences", sent_tokenize, ("text",), intermediate=True)
+register_analyzer("pos_tags", tag_sentences, ("sentences",), intermediate=True)
+register_analyzer("entity_counts", count_tagged_entities, ("pos_tags",), intermediate=True)
+register_analyzer("classification_counts", lambda text: classification_counts([text]), ("text",), intermediate=True)
+register_analyzer("readability_counts", _readability_counts, ("text",), intermediate=True)
+
+# Features
+register_analyzer("statistics", get_text_statistics, ("text", "tokens"))
+register_analyzer("language", get_language, ("text",))
+register_analyzer("sentiment", get_sentiment, ("text",))
+register_analyzer("readability", get_readability, ("text",))
+register_analyzer("entities", lambda counts: {key: list(names) for key, names in counts.items()},
+                  ("entity_counts",))
+register_analyzer("classification", summarize_classification, ("classification_counts",))
+register_analyzer("ngrams", lambda tokens: {"bigrams": extract_ngrams(tokens, 2), "trigrams": extract_ngrams(tokens, 3)},
+                  ("tokens",))
+register_analyzer("tfidf", lambda text: get_tfidf_keywords(text, 10), ("text",))
+register_analyzer(
+    "keyphrases",
+    lambda text, language, options: extract_keyphrases(text, 10, "textrank", _content_language(language, options)),
+    ("text", "language", "options"),
+)
+register_analyzer(
+    "summary",
+    lambda text, language, options: summarize(text, 5, "mmr", language=_content_language(language, options)),
+    ("text", "language", "options"),
+)
+
+
+def main():
+    from .exporters import dumps
+    parser = argparse.ArgumentParser(description="Analyze a text file")
+    parser.add_argument("path", help="Text file to analyze")
+    parser.add_argument("--features", nargs="+", default=["statistics", "language", "sentiment", "readability"],
+                        choices=list_analyzers())
+    parser.add_argument("--keep-stopwords", action="store_true")
+    parser.add_argument("--min-length", type=int, default=3)
+    parser.add_argument("--language", default="en", help="Stopword language (or 'auto')")
+    parser.add_argument("--plan", action="store_true", help="Print the execution plan and exit")
+    args = parser.parse_args()
+
+    if args.plan:
+        for name in plan_analysis(tuple(args.features)):
+            print(f"{name} <- {', '.join(ANALYZERS[name].inputs)}")
+        return
+    with open(args.path, encoding="utf-8") as f:
+        text = f.read()
+    options = {
+        "remove_stopwords": not args.keep_stopwords,
+        "min_length": args.min_length,
+        "filter_options": {"language": args.language},
+    }
+    results = run_analysis(text, args.features, options)
+    if "statistics" in results:
+        results["statistics"]["freq_df"] = results["statistics"]["freq_df"].head(10)
+        results["statistics"].pop("top10")
+    print(dumps(results).decode())
+
+
+if __name__ == "__main__":
+    main()
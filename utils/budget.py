@@ -0,0 +1,272 @@
+"""Latency budget planning: choose exact, sampled, chunked or deferred execution per stage"""
+import argparse
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import partial
+import pandas as pd
+from .topics import MODEL_DIR
+
+COST_MODEL_PATH = os.path.join(MODEL_DIR, "cost_model.json")
+
+# stage: (fixed seconds, seconds per 1,000 characters), from benchmarks on a
+# development machine; `python -m utils.budget` re-measures them locally
+DEFAULT_COSTS = {
+    "statistics": (0.0, 0.0027),
+    "language": (0.01, 0.001),
+    "sentiment": (0.0, 0.001),
+    "readability": (0.005, 0.004),
+    "entities": (0.0, 0.05),
+    "classification": (0.0, 0.0002),
+    "ngrams": (0.0, 0.0008),
+    "tfidf": (0.015, 0.0008),
+    "keyphrases": (0.02, 0.004),
+    "summary": (0.02, 0.0012),
+    "wordcloud": (0.6, 0.0013),
+}
+
+# Stages analyze_chunked can run in parallel, and stages that can run on a sample
+CHUNKABLE_STAGES = ("statistics", "language", "sentiment", "readability", "entities", "classification")
+SAMPLEABLE_STAGES = ("sentiment", "readability", "entities", "classification", "ngrams", "tfidf",
+                     "keyphrases", "summary", "wordcloud")
+
+POOL_OVERHEAD_SECONDS = 0.5  # process pool start-up for chunked execution
+MIN_SAMPLE_FRACTION = 0.05  # below this a sample is too small to be useful
+ESTIMATE_SLACK = 0.1  # estimates are rough; don't sample away the last few percent
+SAMPLE_PIECE_CHARS = 1000
+
+
+class CostModel:
+    """
+    Linear per-stage cost estimates that adapt to observed run times.
+
+    Each stage costs fixed + per_kchar * characters / 1000. Observed
+    timings update the per-character coefficient with an exponential
+    moving average, so estimates follow the machine the app runs on.
+    """
+
+    def __init__(self, costs: dict = None, smoothing: float = 0.3):
+        self.costs = dict(DEFAULT_COSTS)
+        self.costs.update(costs or {})
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+
+    def estimate(self, stage: str, n_chars: int) -> float:
+        """Estimated seconds to run a stage on n_chars characters."""
+        fixed, per_kchar = self.costs.get(stage, (0.0, 0.0))
+        return fixed + per_kchar * n_chars / 1000
+
+    def affordable_chars(self, stage: str, seconds: float) -> int:
+        """Largest input a stage can process within seconds."""
+        fixed, per_kchar = self.costs.get(stage, (0.0, 0.0))
+        if seconds <= fixed:
+            return 0
+        if per_kchar <= 0:
+            return 2 ** 62
+        return int((seconds - fixed) / per_kchar * 1000)
+
+    def observe(self, stage: str, n_chars: int, seconds: float):
+        """
+        Fold an observed run time into the stage's per-character cost.
+
+        Args:
+            stage: Stage name
+            n_chars: Characters the stage processed
+            seconds: Wall-clock time it took
+        """
+        if n_chars < SAMPLE_PIECE_CHARS or stage not in self.costs:
+            return  # tiny inputs are dominated by noise
+        with self._lock:
+            fixed, per_kchar = self.costs[stage]
+            measured = max(seconds - fixed, 0.0) / (n_chars / 1000)
+            self.costs[stage] = (fixed, (1 - self.smoothing) * per_kchar + self.smoothing * measured)
+
+    @contextmanager
+    def timed(self, stage: str, n_chars: int):
+        """Context manager that times a block and observes it for stage."""
+        start = time.perf_counter()
+        yield
+        self.observe(stage, n_chars, time.perf_counter() - start)
+
+    def plan(self, n_chars: int, stages: list, budget_seconds: float, workers: int = None,
+             force_chunked: bool = False, required: tuple = ()) -> dict:
+        """
+        Choose an execution mode for each stage within a latency budget.
+
+        Stages are planned in the given (priority) order. Each gets the
+        cheapest faithful mode that fits the remaining budget: exact, then
+        chunked across workers, then a sample of the text; otherwise it is
+        deferred (required stages run exactly instead).
+
+        Args:
+            n_chars: Input length in characters
+            stages: Stage names in priority order
+            budget_seconds: Total latency budget
+            workers: Parallel workers for chunked execution (CPU count by default)
+            force_chunked: Run chunkable stages chunked rather than exactly
+            required: Stages that are never deferred
+
+        Returns:
+            Dictionary mapping stage to {'mode', 'estimate_seconds', 'sample_chars'}
+        """
+        workers = max(workers or os.cpu_count() or 1, 1)
+        remaining = budget_seconds
+        pool_started = False
+        plan = {}
+        for stage in stages:
+            exact = self.estimate(stage, n_chars)
+            overhead = 0.0 if pool_started else POOL_OVERHEAD_SECONDS
+            chunked = exact / workers + overhead
+            entry = {"mode": "deferred", "estimate_seconds": exact, "sample_chars": 0}
+
+            if stage in CHUNKABLE_STAGES and force_chunked and chunked <= remaining:
+                entry.update(mode="chunked", estimate_seconds=chunked)
+            elif exact <= remaining * (1 + ESTIMATE_SLACK):
+                entry.update(mode="exact")
+            elif stage in CHUNKABLE_STAGES and workers > 1 and chunked <= remaining:
+                entry.update(mode="chunked", estimate_seconds=chunked)
+            elif stage in SAMPLEABLE_STAGES:
+                sample_chars = min(self.affordable_chars(stage, remaining), n_chars)
+                if sample_chars >= MIN_SAMPLE_FRACTION * n_chars:
+                    entry.update(mode="sampled", sample_chars=sample_chars,
+                                 estimate_seconds=self.estimate(stage, sample_chars))
+            if entry["mode"] == "deferred" and stage in required:
+                if stage in CHUNKABLE_STAGES and force_chunked:
+                    entry.update(mode="chunked", estimate_seconds=chunked)
+                else:
+                    entry.update(mode="exact")
+
+            if entry["mode"] == "chunked":
+                pool_started = True
+            if entry["mode"] != "deferred":
+                remaining -= entry["estimate_seconds"]
+            plan[stage] = entry
+        return plan
+
+    def save(self, path: str = COST_MODEL_PATH):
+        """Save the cost coefficients as JSON."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.costs, f, indent=2)
+
+
+def load_cost_model(path: str = COST_MODEL_PATH) -> CostModel:
+    """
+    Load benchmarked costs, falling back to the reference defaults.
+
+    Args:
+        path: Path to a saved cost model
+
+    Returns:
+        CostModel
+    """
+    if not os.path.exists(path):
+        return CostModel()
+    with open(path, encoding="utf-8") as f:
+        return CostModel({stage: tuple(cost) for stage, cost in json.load(f).items()})
+
+
+def sample_text(text: str, max_chars: int, piece_chars: int = SAMPLE_PIECE_CHARS) -> str:
+    """
+    Take an evenly spread sample of a text.
+
+    The text is split into paragraph/sentence-aligned pieces and every k-th
+    piece is kept, so the sample covers the whole document rather than
+    just its beginning.
+
+    Args:
+        text: Input text
+        max_chars: Approximate sample size in characters
+        piece_chars: Size of the pieces the sample is built from
+
+    Returns:
+        Sampled text (the text itself if it already fits)
+    """
+    from .chunking import split_into_chunks
+    if len(text) <= max_chars:
+        return text
+    pieces = list(split_into_chunks(text, piece_chars))
+    keep = max(int(len(pieces) * max_chars / len(text)), 1)
+    step = len(pieces) / keep
+    return "\n\n".join(pieces[int(i * step)] for i in range(keep))
+
+
+def describe_plan(plan: dict, n_chars: int) -> pd.DataFrame:
+    """
+    Summarize an execution plan for display.
+
+    Args:
+        plan: Plan returned by CostModel.plan
+        n_chars: Input length in characters
+
+    Returns:
+        DataFrame with stage, mode, coverage and estimated seconds
+    """
+    rows = []
+    for stage, entry in plan.items():
+        coverage = 1.0 if entry["mode"] in ("exact", "chunked") else entry["sample_chars"] / max(n_chars, 1)
+        rows.append((stage, entry["mode"], f"{coverage:.0%}", round(entry["estimate_seconds"], 2)))
+    return pd.DataFrame(rows, columns=["stage", "mode", "coverage", "est_seconds"])
+
+
+def _stage_runners() -> dict:
+    """Map each stage to a callable on raw text, for benchmarking."""
+    from .analyzers import run_analysis
+    from .text_processing import get_tokens
+    from .visualizations import create_wordcloud
+
+    runners = {stage: partial(_run_stage, stage, run_analysis) for stage in DEFAULT_COSTS}
+    runners["wordcloud"] = lambda t: create_wordcloud(get_tokens(t))
+    return runners
+
+
+def _run_stage(stage: str, run_analysis, text: str):
+    return run_analysis(text, [stage], max_workers=1)[stage]
+
+
+def benchmark_costs(text: str, stages: tuple = tuple(DEFAULT_COSTS), sizes: tuple = (1, 8)) -> CostModel:
+    """
+    Fit fixed and per-character costs by timing each stage at two input sizes.
+
+    Args:
+        text: Representative sample text
+        stages: Stages to benchmark
+        sizes: Two repetition counts of text to time
+
+    Returns:
+        CostModel with the measured coefficients (defaults for stages that fail)
+    """
+    runners = _stage_runners()
+    costs = {}
+    small, large = ("\n\n".join([text] * n) for n in sizes)
+    for stage in stages:
+        try:
+            runners[stage](text[:len(text) // 2])  # load models; a different text avoids result caches
+            timings = []
+            for sample in (small, large):
+                start = time.perf_counter()
+                runners[stage](sample)
+                timings.append(time.perf_counter() - start)
+            per_char = max((timings[1] - timings[0]) / (len(large) - len(small)), 0.0)
+            costs[stage] = (max(timings[0] - per_char * len(small), 0.0), per_char * 1000)
+        except Exception:
+            continue
+    return CostModel(costs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark analyzer costs for the latency budget")
+    parser.add_argument("sample", help="Representative text file")
+    parser.add_argument("--path", default=COST_MODEL_PATH, help="Where to save the cost model")
+    args = parser.parse_args()
+    with open(args.sample, encoding="utf-8") as f:
+        model = benchmark_costs(f.read())
+    model.save(args.path)
+    for stage, (fixed, per_kchar) in model.costs.items():
+        print(f"{stage}: {fixed:.4f}s + {per_kchar:.5f}s/1k chars")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+"""Chunked map-reduce analysis for very long documents"""
+import os
+import re
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from .text_processing import FrequencyTable, count_words, count_sentences
+from .nlp_features import label_sentiment, interpret_reading_ease
+from .classifiers import summarize_classification
+from .analyzers import run_analysis
+from .sketches import CorpusSketch
+
+DEFAULT_CHUNK_SIZE = 20000  # characters per chunk
+
+CHUNK_FEATURES = ("statistics", "sentiment", "readability", "entities", "language", "classification")
+
+PARAGRAPH_SPLIT = re.compile(r"\n\s*\n")
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+
+
+def _split_long_piece(piece: str, chunk_size: int):
+    """Hard-split a single sentence longer than chunk_size on whitespace."""
+    start = 0
+    while start < len(piece):
+        end = start + chunk_size
+        if end < len(piece):
+            space = piece.rfind(" ", start, end)
+            if space > start:
+                end = space
+        yield piece[start:end]
+        start = end
+
+
+def _iter_paragraphs(text: str):
+    """Lazily yield paragraphs without materializing the full split list."""
+    start = 0
+    for match in PARAGRAPH_SPLIT.finditer(text):
+        yield text[start:match.start()]
+        start = match.end()
+    yield text[start:]
+
+
+def split_into_chunks(text: str, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Split text into chunks on paragraph and sentence boundaries.
+
+    Args:
+        text: Input text
+        chunk_size: Maximum number of characters per chunk
+
+    Yields:
+        Text chunks no longer than chunk_size characters
+    """
+    buffer = []
+    buffer_len = 0
+
+    for paragraph in _iter_paragraphs(text):
+        pieces = [paragraph] if len(paragraph) <= chunk_size else SENTENCE_SPLIT.split(paragraph)
+        for piece in pieces:
+            if not piece.strip():
+                continue
+            if len(piece) > chunk_size:
+                if buffer:
+                    yield "\n\n".join(buffer)
+                    buffer, buffer_len = [], 0
+                yield from _split_long_piece(piece, chunk_size)
+                continue
+            if buffer and buffer_len + len(piece) + 2 > chunk_size:
+                yield "\n\n".join(buffer)
+                buffer, buffer_len = [], 0
+            buffer.append(piece)
+            buffer_len += len(piece) + 2
+
+    if buffer:
+        yield "\n\n".join(buffer)
+
+
+def analyze_chunk(chunk: str, features: tuple = CHUNK_FEATURES,
+                  remove_stopwords: bool = True, min_length: int = 3,
+                  filter_options: dict = None) -> dict:
+    """
+    Map step: compute additive partial results for one chunk.
+
+    Args:
+        chunk: Text chunk
+        features: Features to compute (see CHUNK_FEATURES); "sketches" also
+            adds a CorpusSketch in which this chunk counts as one document
+        remove_stopwords: Whether to remove stopwords from frequency counts
+        min_length: Minimum word length for frequency counts
+        filter_options: Extra get_tokens keyword arguments (language, stopword lists)
+
+    Returns:
+        Dictionary of raw counts and weighted sums (see combine_partials)
+    """
+    words = count_words(chunk)
+    partial = {"words": words, "characters": len(chunk)}
+    needed = {
+        "statistics": "tokens", "sentiment": "sentiment", "readability": "readability_counts",
+        "entities": "entity_counts", "language": "language", "classification": "classification_counts",
+        "sketches": "tokens",
+    }
+    options = {"remove_stopwords": remove_stopwords, "min_length": min_length, "filter_options": filter_options}
+    # Chunks already run in parallel, so each chunk's plan runs sequentially
+    outputs = run_analysis(chunk, [needed[f] for f in features if f in needed], options, max_workers=1)
+
+    if "statistics" in features:
+        partial["freq"] = Counter(outputs["tokens"])
+        partial["characters_no_space"] = len(chunk) - chunk.count(" ")
+        partial["sentence_count"] = count_sentences(chunk)
+
+    if "sentiment" in features:
+        sentiment = outputs["sentiment"]
+        weight = 0 if "error" in sentiment else words
+        partial["sentiment"] = Counter({
+            "weight": weight,
+            "polarity": sentiment["polarity"] * weight,
+            "subjectivity": sentiment["subjectivity"] * weight,
+        })
+
+    if "readability" in features:
+        partial["readability"] = outputs["readability_counts"]
+
+    if "entities" in features:
+        partial["entities"] = outputs["entity_counts"]
+
+    if "language" in features:
+        partial["language"] = Counter({outputs["language"]: len(chunk)})
+
+    if "classification" in features:
+        partial["classification"] = outputs["classification_counts"]
+
+    if "sketches" in features:
+        # Quantiles and distinct entities come from whichever of those features are computed too
+        sentiment = outputs.get("sentiment", {})
+        entities = outputs.get("entity_counts", {})
+        counts = outputs.get("readability_counts", {})
+        readability = _finalize_readability(counts) if counts and not _failed(counts) else {}
+        partial["sketches"] = CorpusSketch().add_document(
+            outputs["tokens"],
+            entities=None if "error" in entities else entities,
+            polarity=sentiment.get("polarity") if "error" not in sentiment else None,
+            reading_ease=readability.get("flesch_reading_ease"),
+        )
+
+    return partial
+
+
+def combine_partials(a: dict, b: dict) -> dict:
+    """
+    Combine two partial results into one.
+
+    Every field is additive: integers are summed, Counters are added,
+    entity categories are unioned with their mention counts and sketches
+    are merged. A field whose analyzer failed in either chunk keeps that
+    error instead.
+
+    Args:
+        a: Partial result (updated in place)
+        b: Partial result
+
+    Returns:
+        The combined partial result
+    """
+    for key, value in b.items():
+        if key not in a:
+            a[key] = value
+        elif _failed(a[key]) or _failed(value):
+            a[key] = a[key] if _failed(a[key]) else value
+        elif key == "entities":
+            for category, names in value.items():
+                a[key].setdefault(category, Counter()).update(names)
+        elif isinstance(value, CorpusSketch):
+            a[key].merge(value)
+        elif isinstance(value, Counter):
+            a[key].update(value)
+        else:
+            a[key] += value
+    return a
+
+
+def _failed(value) -> bool:
+    """Whether a partial field is an analyzer's {"error": message} result."""
+    return isinstance(value, dict) and isinstance(value.get("error"), str)
+
+
+def _finalize_readability(totals: Counter) -> dict:
+    """Recompute readability formulas from summed raw counts."""
+    words = totals["words"]
+    sentences = max(totals["sentences"], 1)
+    if not words:
+        return {"error": "No words found"}
+
+    words_per_sentence = words / sentences
+    syllables_per_word = totals["syllables"] / words
+    pct_difficult = 100 * totals["difficult_words"] / words
+
+    flesch_reading = 206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word
+    flesch_kincaid = 0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59
+    dale_chall = 0.1579 * pct_difficult + 0.0496 * words_per_sentence
+    if pct_difficult > 5:
+        dale_chall += 3.6365
+
+    return {
+        "flesch_kincaid_grade": round(flesch_kincaid, 2),
+        "flesch_reading_ease": round(flesch_reading, 2),
+        "dale_chall_score": round(dale_chall, 2),
+        "difficulty_level": interpret_reading_ease(flesch_reading),
+    }
+
+
+def finalize_results(combined: dict) -> dict:
+    """
+    Turn a combined partial result into final analysis results.
+
+    Sentiment is the word-weighted mean over chunks, readability scores are
+    recomputed from the merged counts and statistics match the shape of
+    get_text_statistics.
+
+    Args:
+        combined: Partial result produced by combine_partials
+
+    Returns:
+        Dictionary with statistics, sentiment, readability, entities, language,
+        classification and sketches (approximate corpus statistics)
+    """
+    results = {"chunks": combined.get("chunks", 0)}
+    total_words = combined.get("words", 0)
+
+    if "freq" in combined:
+        freq = combined["freq"]
+        characters_no_space = combined["characters_no_space"]
+        freq_df = FrequencyTable(freq)
+        results["statistics"] = {
+            "total_words_cleaned": sum(freq.values()),
+            "unique_words": len(freq),
+            "total_words_original": total_words,
+            "characters": combined["characters"],
+            "characters_no_space": characters_no_space,
+            "avg_word_length": round(characters_no_space / total_words, 2) if total_words else 0,
+            "sentence_count": combined["sentence_count"],
+            "reading_time_minutes": round(total_words / 200, 2),
+            "freq_df": freq_df,
+            "top10": freq_df.head(10),
+        }
+
+    if "sentiment" in combined:
+        sums = combined["sentiment"]
+        weight = sums["weight"]
+        polarity = sums["polarity"] / weight if weight else 0.0
+        subjectivity = sums["subjectivity"] / weight if weight else 0.0
+        label, color = label_sentiment(polarity)
+        results["sentiment"] = {
+            "polarity": round(polarity, 3),
+            "subjectivity": round(subjectivity, 3),
+            "label": label,
+            "color": color,
+        }
+
+    if "readability" in combined:
+        counts = combined["readability"]
+        results["readability"] = counts if _failed(counts) else _finalize_readability(counts)
+
+    if "entities" in combined:
+        entity_counts = combined["entities"]
+        if _failed(entity_counts):
+            results["entities"] = entity_counts
+        else:
+            results["entities"] = {key: [name for name, _ in names.most_common()]
+                                   for key, names in entity_counts.items()}
+            results["entity_counts"] = {key: dict(names) for key, names in entity_counts.items()}
+
+    if "language" in combined:
+        known = [lang for lang, _ in combined["language"].most_common() if lang != "unknown"]
+        results["language"] = known[0] if known else "unknown"
+
+    if "classification" in combined:
+        counts = combined["classification"]
+        results["classification"] = counts if _failed(counts) else summarize_classification(counts)
+
+    if "sketches" in combined:
+        results["sketches"] = combined["sketches"].summary()
+
+    return results
+
+
+def merge_results(partials) -> dict:
+    """
+    Reduce step: merge an iterable of per-chunk partial results.
+
+    Args:
+        partials: Iterable of dictionaries returned by analyze_chunk
+
+    Returns:
+        Dictionary of final results (see finalize_results)
+    """
+    combined = {"chunks": 0}
+    for partial in partials:
+        combine_partials(combined, partial)
+        combined["chunks"] += 1
+    return finalize_results(combined)
+
+
+def analyze_chunked(text: str, features: tuple = CHUNK_FEATURES,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE, max_workers: int = None,
+                    use_processes: bool = True, remove_stopwords: bool = True,
+                    min_length: int = 3, filter_options: dict = None) -> dict:
+    """
+    Analyze a long document chunk by chunk and merge the results.
+
+    Chunks are submitted to a worker pool in a bounded window and folded
+    into the running result as they complete, so peak memory depends on
+    the chunk size rather than the document size.
+
+    Args:
+        text: Input text
+        features: Features to compute (see CHUNK_FEATURES)
+        chunk_size: Maximum number of characters per chunk
+        max_workers: Number of parallel workers (None for one per CPU)
+        use_processes: Use a process pool (True) or a thread pool (False)
+        remove_stopwords: Whether to remove stopwords from frequency counts
+        min_length: Minimum word length for frequency counts
+        filter_options: Extra get_tokens keyword arguments (language, stopword lists)
+
+    Returns:
+        Dictionary of merged results (see finalize_results)
+    """
+    chunks = split_into_chunks(text, chunk_size)
+    first = next(chunks, None)
+    second = next(chunks, None)
+    if second is None:
+        # Zero or one chunk: skip the pool overhead
+        single = [first] if first is not None else []
+        return merge_results(analyze_chunk(c, features, remove_stopwords, min_length, filter_options)
+                             for c in single)
+
+    executor_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    workers = max_workers or os.cpu_count() or 1
+    with executor_cls(max_workers=workers) as executor:
+        return merge_results(_bounded_map(
+            executor, workers, _chain(first, second, chunks),
+            features, remove_stopwords, min_length, filter_options,
+        ))
+
+
+def _bounded_map(executor, workers, chunks, features, remove_stopwords, min_length, filter_options):
+    """Yield chunk results in order with at most 2 * workers in flight."""
+    window = 2 * workers
+    pending = deque()
+    for chunk in chunks:
+        pending.append(executor.submit(
+            analyze_chunk, chunk, features, remove_stopwords, min_length, filter_options,
+        ))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _chain(first: str, second: str, rest):
+    """Re-attach the chunks consumed while probing the generator."""
+    yield first
+    yield second
+    yield from rest
@@ -0,0 +1,303 @@
+"""Emotion and toxicity classification with compact hashed linear models"""
+import argparse
+import os
+from collections import Counter
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.model_selection import train_test_split
+from sklearn.multiclass import OneVsRestClassifier
+from .models import get_model, reset_model
+from .normalization import normalize_text
+from .topics import MODEL_DIR
+
+CLASSIFIER_TASKS = ("emotion", "toxicity")
+N_FEATURES = 2 ** 20
+FLAG_THRESHOLD = 0.5
+
+
+def classifier_path(task: str) -> str:
+    """Default location of the saved model for a task."""
+    return os.path.join(MODEL_DIR, f"{task}_classifier.joblib")
+
+
+def _preprocess(text: str) -> str:
+    """Normalize text for hashing (module-level so it pickles)."""
+    return normalize_text(text).lower()
+
+
+class TextClassifier:
+    """
+    Linear classifier over hashed word unigrams and bigrams.
+
+    A single-label column trains a multiclass model (e.g. emotion); several
+    0/1 label columns train one binary model per label (e.g. toxicity
+    flags). The stateless HashingVectorizer keeps the model compact and
+    lets a whole batch be scored with one sparse matrix product.
+    """
+
+    def __init__(self, task: str, n_features: int = N_FEATURES, alpha: float = 1e-5,
+                 random_state: int = 0):
+        self.task = task
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features,
+            ngram_range=(1, 2),
+            alternate_sign=False,
+            preprocessor=_preprocess,
+        )
+        self.alpha = alpha
+        self.random_state = random_state
+        self.labels = []
+        self.multilabel = False
+        self.model = None
+
+    def _estimator(self):
+        return SGDClassifier(
+            loss="log_loss", alpha=self.alpha, class_weight="balanced",
+            max_iter=50, tol=1e-4, random_state=self.random_state,
+        )
+
+    def fit(self, texts: list, labels):
+        """
+        Train the model.
+
+        Args:
+            texts: List of document strings
+            labels: List of class names (multiclass) or a DataFrame of 0/1
+                label columns (multilabel)
+
+        Returns:
+            self
+        """
+        X = self.vectorizer.transform(texts)
+        if isinstance(labels, pd.DataFrame):
+            self.multilabel = True
+            self.labels = [str(c) for c in labels.columns]
+            self.model = OneVsRestClassifier(self._estimator())
+            self.model.fit(X, labels.to_numpy().astype(int))
+        else:
+            self.multilabel = False
+            self.model = self._estimator()
+            self.model.fit(X, [str(label) for label in labels])
+            self.labels = [str(c) for c in self.model.classes_]
+        # Hashed columns never seen in training keep zero weight; storing
+        # the coefficients sparsely keeps the saved model small
+        for estimator in getattr(self.model, "estimators_", [self.model]):
+            if hasattr(estimator, "sparsify"):  # constant label columns get a _ConstantPredictor
+                estimator.sparsify()
+        return self
+
+    def predict_proba(self, texts: list) -> np.ndarray:
+        """
+        Score a batch of documents.
+
+        Args:
+            texts: List of document strings
+
+        Returns:
+            Array of shape (n_docs, n_labels) with a probability per label
+        """
+        return self.model.predict_proba(self.vectorizer.transform(texts))
+
+    def classify(self, texts: list, threshold: float = FLAG_THRESHOLD) -> pd.DataFrame:
+        """
+        Label a batch of documents.
+
+        Args:
+            texts: List of document strings
+            threshold: Probability at which a multilabel flag is raised
+
+        Returns:
+            DataFrame with label and confidence (multiclass), or one
+            probability column per flag plus the raised flags (multilabel)
+        """
+        proba = self.predict_proba(texts)
+        if self.multilabel:
+            df = pd.DataFrame(proba.round(3), columns=self.labels)
+            raised = proba >= threshold
+            df["flags"] = [", ".join(np.array(self.labels)[row]) for row in raised]
+            return df
+        best = proba.argmax(axis=1)
+        return pd.DataFrame({
+            "label": np.array(self.labels)[best],
+            "confidence": proba[np.arange(len(texts)), best].round(3),
+        })
+
+    def save(self, path: str = None):
+        """Save the trained model to disk."""
+        path = path or classifier_path(self.task)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        joblib.dump(self, path)
+
+
+def load_classifier(task: str, path: str = None):
+    """
+    Load a saved classifier.
+
+    Args:
+        task: Task name (see CLASSIFIER_TASKS)
+        path: Path to the saved model (defaults to classifier_path(task))
+
+    Returns:
+        TextClassifier, or None if no model has been trained yet
+    """
+    path = path or classifier_path(task)
+    if not os.path.exists(path):
+        return None
+    return joblib.load(path)
+
+
+_served = {}  # task -> (classifier last served, model file mtime at that time)
+
+
+def get_classifier(task: str):
+    """
+    Get the shared, warm classifier for a task.
+
+    The shared copy is reloaded when a model file appears or changes after
+    it was loaded, e.g. after `python -m utils.classifiers train` in
+    another process.
+
+    Args:
+        task: Task name (see CLASSIFIER_TASKS)
+
+    Returns:
+        TextClassifier, or None if no model has been trained yet
+    """
+    name = f"{task}_classifier"
+    path = classifier_path(task)
+    mtime = os.path.getmtime(path) if os.path.exists(path) else None
+    classifier = get_model(name)
+    served = _served.get(task)
+    if (classifier is None and mtime is not None) or (
+        served is not None and served[0] is classifier and served[1] != mtime
+    ):
+        reset_model(name)
+        classifier = get_model(name)
+    _served[task] = (classifier, mtime)
+    return classifier
+
+
+def train_classifier(csv_path: str, task: str, text_column: str = "text",
+                     label_columns: list = None, test_size: float = 0.2,
+                     path: str = None) -> dict:
+    """
+    Train a classifier from a labeled CSV file and save it.
+
+    Args:
+        csv_path: CSV with a text column and one label column (multiclass)
+            or several 0/1 label columns (multilabel)
+        task: Task name used for the saved model (see CLASSIFIER_TASKS)
+        text_column: Name of the text column
+        label_columns: Label columns (all other columns by default)
+        test_size: Fraction of rows held out for evaluation
+        path: Where to save the model (defaults to classifier_path(task))
+
+    Returns:
+        Dictionary with labels, row counts and held-out accuracy
+    """
+    data = pd.read_csv(csv_path)
+    data = data[data[text_column].notna()]
+    label_columns = label_columns or [c for c in data.columns if c != text_column]
+    texts = data[text_column].astype(str).tolist()
+    labels = data[label_columns] if len(label_columns) > 1 else data[label_columns[0]].astype(str).tolist()
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        texts, labels, test_size=test_size, random_state=0,
+    )
+    evaluation = TextClassifier(task).fit(X_train, y_train)
+    if isinstance(y_test, pd.DataFrame):
+        predicted = evaluation.predict_proba(X_test) >= FLAG_THRESHOLD
+        accuracy = float((predicted == y_test.to_numpy().astype(bool)).mean())
+    else:
+        accuracy = float((evaluation.classify(X_test)["label"].to_numpy() == np.array(y_test)).mean())
+
+    classifier = TextClassifier(task).fit(texts, labels)
+    classifier.save(path)
+    if path is None:
+        reset_model(f"{task}_classifier")
+    return {
+        "task": task,
+        "labels": classifier.labels,
+        "multilabel": classifier.multilabel,
+        "train_rows": len(X_train),
+        "test_rows": len(X_test),
+        "accuracy": round(accuracy, 3),
+    }
+
+
+def classification_counts(texts: list, tasks: tuple = CLASSIFIER_TASKS) -> Counter:
+    """
+    Classify a batch and count labels (an additive partial for chunked/batch runs).
+
+    Args:
+        texts: List of document strings
+        tasks: Tasks to run; tasks without a trained model are skipped
+
+    Returns:
+        Counter with 'documents' and one '<task>:<label>' count per predicted
+        class or raised flag
+    """
+    counts = Counter({"documents": len(texts)})
+    if not texts:
+        return counts
+    for task in tasks:
+        classifier = get_classifier(task)
+        if classifier is None:
+            continue
+        result = classifier.classify(texts)
+        if classifier.multilabel:
+            raised = result[classifier.labels].to_numpy() >= FLAG_THRESHOLD
+            counts.update({f"{task}:{label}": int(n) for label, n in zip(classifier.labels, raised.sum(axis=0))})
+        else:
+            counts.update(f"{task}:{label}" for label in result["label"])
+    return counts
+
+
+def summarize_classification(counts: Counter) -> dict:
+    """
+    Turn label counts into per-task shares of documents.
+
+    Args:
+        counts: Counter from classification_counts (possibly merged)
+
+    Returns:
+        Dictionary mapping task to {label: share of documents}, plus 'documents'
+    """
+    documents = counts.get("documents", 0)
+    summary = {"documents": documents}
+    for key, n in sorted(counts.items()):
+        if ":" in key and documents:
+            task, label = key.split(":", 1)
+            summary.setdefault(task, {})[label] = round(n / documents, 3)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train emotion/toxicity classifiers")
+    sub = parser.add_subparsers(dest="command", required=True)
+    train = sub.add_parser("train", help="Train a classifier from a labeled CSV")
+    train.add_argument("csv_path")
+    train.add_argument("--task", choices=CLASSIFIER_TASKS, required=True)
+    train.add_argument("--text-column", default="text")
+    train.add_argument("--labels", nargs="+", default=None, help="Label columns (default: all others)")
+    score = sub.add_parser("classify", help="Classify lines of a text file")
+    score.add_argument("path")
+    score.add_argument("--task", choices=CLASSIFIER_TASKS, required=True)
+    args = parser.parse_args()
+
+    if args.command == "train":
+        print(train_classifier(args.csv_path, args.task, args.text_column, args.labels))
+    else:
+        classifier = get_classifier(args.task)
+        if classifier is None:
+            raise SystemExit(f"No {args.task} model; train one first")
+        with open(args.path, encoding="utf-8") as f:
+            lines = [line.strip() for line in f if line.strip()]
+        print(classifier.classify(lines).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
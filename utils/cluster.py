@@ -0,0 +1,321 @@
+"""Coordinator/worker mode for batch jobs across several machines"""
+import argparse
+import json
+import os
+import secrets
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+from .jobs import JOBS_DB_PATH, process_shard, _session, _start_job, _record_shard, _finish_job
+from .models import warm_models
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 6470
+CLUSTER_KEY_ENV = "NLP_INSPECTOR_CLUSTER_KEY"
+LEASE_SECONDS = 600  # a shard handed out this long ago is given to the next idle worker
+MAX_ATTEMPTS = 2  # a shard that fails this many times is recorded as failed
+
+
+def cluster_key() -> bytes:
+    """
+    Shared secret from NLP_INSPECTOR_CLUSTER_KEY.
+
+    There is no default: anyone holding the key can hand work to, or
+    take work from, a coordinator.
+
+    Raises:
+        ValueError: If the variable is unset or empty
+    """
+    key = os.environ.get(CLUSTER_KEY_ENV)
+    if not key:
+        raise ValueError(f"Set {CLUSTER_KEY_ENV} to a shared secret on the coordinator and every worker")
+    return key.encode()
+
+
+def send_message(conn, *message):
+    """Send one protocol message as JSON (never pickled)."""
+    conn.send_bytes(json.dumps(message).encode())
+
+
+def recv_message(conn) -> list:
+    """Receive one protocol message sent by send_message."""
+    return json.loads(conn.recv_bytes())
+
+
+class Coordinator:
+    """
+    Hands out the shards of a batch job to workers and checkpoints their results.
+
+    Workers connect over a socket, ask for work and send back each shard's
+    encoded partial aggregate, which is written to the jobs database like
+    a local run_job would; job_results then merges them. Only the
+    coordinator touches the database. Messages are JSON, so a peer can
+    send data but never code. Shards held by a worker that
+    disconnects, or whose lease expires, go back in the queue; a late
+    duplicate result for a finished shard is ignored, so nothing is
+    counted twice and the job stays resumable.
+
+    The job source must be readable at the same path on every worker
+    (e.g. a shared filesystem).
+    """
+
+    def __init__(self, job_id: int, address: tuple = (DEFAULT_HOST, DEFAULT_PORT),
+                 authkey: bytes = None, db_path: str = JOBS_DB_PATH,
+                 lease_seconds: float = LEASE_SECONDS):
+        authkey = authkey or cluster_key()
+        self.job_id = job_id
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.listener = Listener(address, authkey=authkey)
+        self.address = self.listener.address
+        with _session(db_path) as conn:
+            job, todo = _start_job(conn, job_id)
+        self.source = job["source"]
+        self.features = json.loads(job["features"])
+        self.locators = {row["shard_index"]: json.loads(row["locator"]) for row in todo}
+        self.pending = deque(self.locators)
+        self.leases = {}  # shard index -> (worker name, lease time)
+        self.attempts = {index: 0 for index in self.locators}
+        self.finished = set()
+        self.workers = {}  # worker name -> shards completed
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._closed = threading.Event()
+        if not self.locators:
+            self._done.set()
+
+    def _next_shard(self, worker: str):
+        """Lease the next shard to a worker, or None when no work is left."""
+        with self._lock:
+            if not self.pending:
+                now = time.time()
+                expired = [index for index, (_, leased) in self.leases.items()
+                           if now - leased > self.lease_seconds]
+                self.pending.extend(expired)
+            while self.pending:
+                index = self.pending.popleft()
+                if index not in self.finished:
+                    self.leases[index] = (worker, time.time())
+                    self.attempts[index] += 1
+                    return index
+            return None
+
+    def _complete(self, index: int, status: str, result: str = None, error: str = None,
+                  seconds: float = None, worker: str = None):
+        """Record a shard outcome, requeueing failures that have attempts left."""
+        with self._lock:
+            if index in self.finished:
+                return
+            self.leases.pop(index, None)
+            if status == "failed" and self.attempts[index] < MAX_ATTEMPTS:
+                self.pending.append(index)
+                return
+            with _session(self.db_path) as conn:
+                _record_shard(conn, self.job_id, index, status, result, error, seconds)
+            self.finished.add(index)
+            if status == "done":
+                self.workers[worker] = self.workers.get(worker, 0) + 1
+            if len(self.finished) == len(self.locators):
+                self._done.set()
+
+    def _release(self, worker: str):
+        """Requeue the shards leased to a worker that went away."""
+        with self._lock:
+            for index in [i for i, (name, _) in self.leases.items() if name == worker]:
+                del self.leases[index]
+                self.pending.appendleft(index)
+
+    def _serve_worker(self, conn):
+        worker = None
+        try:
+            with conn:
+                message = recv_message(conn)
+                worker = message[1]
+                while True:
+                    index = self._next_shard(worker)
+                    if index is None:
+                        if self._done.is_set():
+                            send_message(conn, "stop")
+                            return
+                        # Others still hold leases; wait in case one is released
+                        send_message(conn, "wait", 1.0)
+                    else:
+                        send_message(conn, "shard", index, self.source, self.locators[index], self.features)
+                    message = recv_message(conn)
+                    if message[0] == "result":
+                        _, index, result, seconds = message
+                        self._complete(index, "done", result, seconds=seconds, worker=worker)
+                    elif message[0] == "error":
+                        _, index, error = message
+                        self._complete(index, "failed", error=error, worker=worker)
+        except (EOFError, OSError, ValueError):
+            pass  # disconnected or sent a malformed message
+        finally:
+            if worker is not None:
+                self._release(worker)
+
+    def _accept_loop(self):
+        while True:
+            try:
+                conn = self.listener.accept()
+            except (OSError, EOFError, AuthenticationError):
+                if self._closed.is_set():
+                    return
+                continue  # failed handshake (e.g. wrong key)
+            threading.Thread(target=self._serve_worker, args=(conn,), daemon=True).start()
+
+    def serve(self, timeout: float = None, linger: float = 2.0) -> str:
+        """
+        Serve shards until every shard is finished.
+
+        Args:
+            timeout: Give up after this many seconds (None to wait indefinitely)
+            linger: Seconds to keep answering so connected workers get a stop message
+
+        Returns:
+            Final job status ("done", "failed", or "running" on timeout)
+        """
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        try:
+            if not self._done.wait(timeout):
+                return "running"
+            time.sleep(linger)
+            with _session(self.db_path) as conn:
+                return _finish_job(conn, self.job_id)
+        finally:
+            self._closed.set()
+            self.listener.close()
+
+
+def run_worker(address: tuple = (DEFAULT_HOST, DEFAULT_PORT), authkey: bytes = None,
+               name: str = None, connect_timeout: float = 30.0, warm: bool = True) -> int:
+    """
+    Process shards from a coordinator until it has no more work.
+
+    Args:
+        address: Coordinator (host, port)
+        authkey: Shared secret (NLP_INSPECTOR_CLUSTER_KEY by default)
+        name: Worker name (host:pid by default)
+        connect_timeout: Seconds to keep retrying while the coordinator starts
+        warm: Load models before taking work
+
+    Returns:
+        Number of shards processed
+    """
+    authkey = authkey or cluster_key()
+    name = name or f"{socket.gethostname()}:{os.getpid()}"
+    if warm:
+        warm_models()
+    deadline = time.time() + connect_timeout
+    while True:
+        try:
+            conn = Client(tuple(address), authkey=authkey)
+            break
+        except ConnectionRefusedError:
+            if time.time() > deadline:
+                raise
+            time.sleep(0.5)
+
+    processed = 0
+    with conn:
+        send_message(conn, "ready", name)
+        while True:
+            try:
+                message = recv_message(conn)
+            except EOFError:
+                break  # coordinator finished and closed
+            if message[0] == "stop":
+                break
+            if message[0] == "wait":
+                time.sleep(message[1])
+                send_message(conn, "idle")
+                continue
+            _, index, source, locator, features = message
+            try:
+                result, seconds = process_shard(source, locator, tuple(features))
+                send_message(conn, "result", index, result, seconds)
+                processed += 1
+            except Exception as e:
+                send_message(conn, "error", index, str(e))
+    return processed
+
+
+def run_local_cluster(job_id: int, workers: int = 2, db_path: str = JOBS_DB_PATH,
+                      host: str = DEFAULT_HOST, port: int = 0, timeout: float = None) -> str:
+    """
+    Run a coordinator with worker processes on this machine.
+
+    Each worker is a separate `python -m utils.cluster worker` process, as
+    it would be on another node. The processes share a one-off random key.
+
+    Args:
+        job_id: Job id from create_job
+        workers: Number of worker processes
+        db_path: Path to the jobs database
+        host: Interface to listen on
+        port: Port to listen on (0 picks a free one)
+        timeout: Give up after this many seconds
+
+    Returns:
+        Final job status
+    """
+    key = secrets.token_hex(16)
+    coordinator = Coordinator(job_id, (host, port), key.encode(), db_path=db_path)
+    host, port = coordinator.address
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [package_root, os.environ.get("PYTHONPATH")])))
+    env[CLUSTER_KEY_ENV] = key
+    processes = [
+        subprocess.Popen(
+            [sys.executable, "-m", "utils.cluster", "worker", "--host", host, "--port", str(port),
+             "--name", f"local-{i}"],
+            env=env, cwd=package_root,
+        )
+        for i in range(workers)
+    ]
+    try:
+        return coordinator.serve(timeout)
+    finally:
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run batch jobs across several machines")
+    sub = parser.add_subparsers(dest="command", required=True)
+    coordinator = sub.add_parser("coordinator", help="Serve the shards of a job to workers")
+    coordinator.add_argument("job_id", type=int)
+    coordinator.add_argument("--host", default=DEFAULT_HOST, help="Interface to listen on (0.0.0.0 for all)")
+    coordinator.add_argument("--port", type=int, default=DEFAULT_PORT)
+    worker = sub.add_parser("worker", help="Process shards from a coordinator")
+    worker.add_argument("--host", default=DEFAULT_HOST)
+    worker.add_argument("--port", type=int, default=DEFAULT_PORT)
+    worker.add_argument("--name", default=None)
+    local = sub.add_parser("local", help="Run a coordinator and worker processes on this machine")
+    local.add_argument("job_id", type=int)
+    local.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    if args.command != "local":
+        try:
+            cluster_key()
+        except ValueError as e:
+            parser.error(str(e))
+
+    if args.command == "coordinator":
+        print(Coordinator(args.job_id, (args.host, args.port)).serve())
+    elif args.command == "worker":
+        print(run_worker((args.host, args.port), name=args.name))
+    else:
+        print(run_local_cluster(args.job_id, args.workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,50 @@
 """Export utilities for different formats"""
 import pandas as pd
 import json
+import re
+import numpy as np
 import streamlit as st
 from io import BytesIO, StringIO
 
+try:
+    import orjson
+except ImportError:  # optional faster encoder
+    orjson = None
+
+EXPORT_CHUNK_ROWS = 5000
+
+
+def _default(obj):
+    """Serialize NumPy/pandas scalars and other non-JSON types."""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, pd.DataFrame):
+        return obj.to_dict(orient="records")
+    return str(obj)
+
+
+def dumps(obj, compact: bool = False) -> bytes:
+    """
+    Serialize an object to JSON bytes, using orjson when it is installed.
+    
+    Args:
+        obj: JSON-serializable object
+        compact: Omit indentation and spaces
+        
+    Returns:
+        JSON bytes
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if not compact:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+    if compact:
+        return json.dumps(obj, default=_default, separators=(",", ":"), ensure_ascii=False).encode()
+    return json.dumps(obj, default=_default, indent=2, ensure_ascii=False).encode()
+
 
 def export_to_csv(results: dict) -> bytes:
     """
@@ -41,6 +82,11 @@ def export_to_csv(results: dict) -> bytes:
             ]
         }
         
+        for task, shares in (results.get("classification") or {}).items():
+            if isinstance(shares, dict):
+                data["Analysis Metric"].append(f"{task.title()} Labels")
+                data["Value"].append("; ".join(f"{label}={share}" for label, share in shares.items()))
+        
         df = pd.DataFrame(data)
         csv_buffer = StringIO()
         df.to_csv(csv_buffer, index=False)
@@ -51,12 +97,13 @@ def export_to_csv(results: dict) -> bytes:
         return b""
 
 
-def export_to_json(results: dict) -> bytes:
+def export_to_json(results: dict, compact: bool = False) -> bytes:
     """
     Export analysis results to JSON format.
     
     Args:
         results: Dictionary containing analysis results
+        compact: Omit indentation and spaces
         
     Returns:
         JSON bytes
@@ -75,30 +122,89 @@ def export_to_json(results: dict) -> bytes:
             "readability": results.get("readability", {}),
             "language": results.get("language", "unknown"),
             "entities": results.get("entities", {}),
+            "classification": results.get("classification", {}),
         }
         
         # Add top keywords if available
         if "freq_df" in results and not results["freq_df"].empty:
             json_data["top_keywords"] = results["freq_df"].head(10).to_dict(orient="records")
         
-        return json.dumps(json_data, indent=2).encode()
+        return dumps(json_data, compact)
     except Exception as e:
         st.error(f"Error exporting to JSON: {str(e)}")
         return b""
 
 
-def create_download_button(file_format: str, content: bytes, filename: str):
+def iter_detail_records(text: str, tokens: list = None, entities: dict = None):
+    """
+    Yield per-sentence, per-token and per-entity detail records.
+    
+    Args:
+        text: Original text
+        tokens: Preprocessed tokens
+        entities: Entity counts ({category: {name: count}}) or lists ({category: [names]})
+        
+    Yields:
+        Flat dictionaries with a "section" field
+    """
+    for index, match in enumerate(re.finditer(r"[^.!?]+[.!?]*", text)):
+        sentence = match.group().strip()
+        if sentence:
+            yield {"section": "sentence", "index": index, "start": match.start(),
+                   "end": match.end(), "text": sentence}
+    
+    for index, token in enumerate(tokens or []):
+        yield {"section": "token", "index": index, "text": token}
+    
+    if entities and "error" not in entities:
+        for category, names in entities.items():
+            counts = names.items() if isinstance(names, dict) else ((name, 1) for name in names)
+            for name, count in counts:
+                yield {"section": "entity", "category": category, "text": name, "count": count}
+
+
+def iter_jsonl(records, chunk_rows: int = EXPORT_CHUNK_ROWS):
+    """
+    Encode records as JSON Lines in chunks.
+    
+    Args:
+        records: Iterable of JSON-serializable dictionaries
+        chunk_rows: Number of records per yielded chunk
+        
+    Yields:
+        JSON Lines bytes, chunk_rows records at a time
+    """
+    batch = []
+    for record in records:
+        batch.append(dumps(record, compact=True))
+        if len(batch) >= chunk_rows:
+            yield b"\n".join(batch) + b"\n"
+            batch = []
+    if batch:
+        yield b"\n".join(batch) + b"\n"
+
+
+def create_download_button(file_format: str, content, filename: str, key: str = None):
     """
     Create a download button for the exported file.
     
     Args:
         file_format: File format (csv, json, txt)
-        content: File content as bytes
+        content: File content as bytes, or a zero-argument callable that
+            builds it when the user clicks download
         filename: Name of the file to download
+        key: Optional widget key
+
+    Clicking does not rerun the app, so results shown after an analysis
+    stay on screen while their exports download.
     """
+    mime = {"csv": "text/csv", "json": "application/json",
+            "jsonl": "application/x-ndjson"}.get(file_format, "text/plain")
     st.download_button(
         label=f"📥 Download as {file_format.upper()}",
         data=content,
         file_name=filename,
-        mime=f"application/{file_format if file_format != 'csv' else 'csv'}"
+        mime=mime,
+        key=key,
+        on_click="ignore",
     )
@@ -0,0 +1,157 @@
+"""Compiled token filter stage (stopwords, allow-list, minimum length)"""
+import os
+from functools import lru_cache
+import nltk
+from nltk.corpus import stopwords
+from .resources import get_resource_store
+
+try:
+    nltk.data.find('corpora/stopwords')
+except LookupError:
+    nltk.download('stopwords', quiet=True)
+
+# langdetect ISO 639-1 codes -> NLTK stopword corpus file ids
+LANGUAGE_NAMES = {
+    "ar": "arabic", "az": "azerbaijani", "da": "danish", "de": "german",
+    "el": "greek", "en": "english", "es": "spanish", "fi": "finnish",
+    "fr": "french", "hu": "hungarian", "id": "indonesian", "it": "italian",
+    "kk": "kazakh", "ne": "nepali", "nl": "dutch", "no": "norwegian",
+    "pt": "portuguese", "ro": "romanian", "ru": "russian", "sl": "slovene",
+    "sv": "swedish", "tg": "tajik", "tr": "turkish",
+}
+
+DEFAULT_LANGUAGE = "english"
+
+
+@lru_cache(maxsize=128)
+def resolve_language(language: str) -> str:
+    """
+    Resolve a language code or name to an NLTK stopword list name.
+
+    Args:
+        language: ISO code from get_language (e.g. 'en') or NLTK name (e.g. 'english')
+
+    Returns:
+        NLTK stopword list name, falling back to English when unsupported
+    """
+    language = (language or "").lower()
+    name = LANGUAGE_NAMES.get(language, language)
+    if name in stopwords.fileids():
+        return name
+    return DEFAULT_LANGUAGE
+
+
+@lru_cache(maxsize=32)
+def _load_language_stopwords(language: str) -> frozenset:
+    """Load one NLTK stopword list once per process (from the resource store if built)."""
+    store = get_resource_store()
+    if store is not None and f"stopwords/{language}" in store:
+        return store.table(f"stopwords/{language}").words()
+    return frozenset(stopwords.words(language))
+
+
+def get_stopwords(language: str = "en") -> frozenset:
+    """
+    Get the stopword list for a language (loaded once per process).
+
+    Args:
+        language: ISO code from get_language or NLTK language name
+
+    Returns:
+        Frozenset of lowercase stopwords
+    """
+    return _load_language_stopwords(resolve_language(language))
+
+
+@lru_cache(maxsize=64)
+def _load_stopword_file(path: str, mtime: float) -> frozenset:
+    """Load a domain stopword file (one word per line, '#' for comments)."""
+    with open(path, encoding="utf-8") as f:
+        words = (line.split("#", 1)[0].strip().lower() for line in f)
+        return frozenset(word for word in words if word)
+
+
+def load_stopword_file(path: str) -> frozenset:
+    """
+    Load a custom stopword file, re-reading it only when it changes on disk.
+
+    Args:
+        path: Path to a text file with one stopword per line
+
+    Returns:
+        Frozenset of lowercase stopwords
+    """
+    return _load_stopword_file(os.path.abspath(path), os.path.getmtime(path))
+
+
+class TokenFilter:
+    """
+    A filter compiled once per configuration.
+
+    Stopwords are stored in buckets keyed by word length, and only lengths
+    that survive the minimum-length check are kept, so each token costs one
+    length comparison plus at most one lookup in a small frozenset.
+    """
+
+    def __init__(self, stopword_set: frozenset, min_length: int):
+        self.min_length = min_length
+        buckets = {}
+        for word in stopword_set:
+            if len(word) >= min_length:
+                buckets.setdefault(len(word), set()).add(word)
+        self.buckets = {length: frozenset(words) for length, words in buckets.items()}
+        self.size = sum(len(words) for words in self.buckets.values())
+
+    def __call__(self, tokens) -> list:
+        """Keep alphabetic tokens of at least min_length that are not stopwords."""
+        min_length = self.min_length
+        get_bucket = self.buckets.get
+        empty = frozenset()
+        return [
+            t for t in tokens
+            if len(t) >= min_length and t.isalpha() and t not in get_bucket(len(t), empty)
+        ]
+
+
+@lru_cache(maxsize=64)
+def _compile_filter(language: str, remove_stopwords: bool, min_length: int,
+                    stopword_files: tuple, extra_stopwords: frozenset,
+                    allow_words: frozenset) -> TokenFilter:
+    """Build the TokenFilter for one fully-resolved configuration."""
+    stopword_set = set()
+    if remove_stopwords:
+        stopword_set |= _load_language_stopwords(language)
+        for path, mtime in stopword_files:
+            stopword_set |= _load_stopword_file(path, mtime)
+        stopword_set |= extra_stopwords
+    stopword_set -= allow_words
+    return TokenFilter(frozenset(stopword_set), min_length)
+
+
+def get_token_filter(language: str = "en", remove_stopwords: bool = True, min_length: int = 3,
+                     stopword_files: tuple = (), extra_stopwords=(), allow_words=()) -> TokenFilter:
+    """
+    Get the compiled token filter for a configuration (cached).
+
+    Args:
+        language: ISO code from get_language or NLTK language name
+        remove_stopwords: Whether to remove stopwords
+        min_length: Minimum word length to keep
+        stopword_files: Paths to custom domain stopword files
+        extra_stopwords: Additional stopwords
+        allow_words: Words that are never removed as stopwords
+
+    Returns:
+        TokenFilter callable that filters a list of tokens
+    """
+    files = tuple(
+        (os.path.abspath(path), os.path.getmtime(path)) for path in stopword_files
+    )
+    return _compile_filter(
+        resolve_language(language),
+        remove_stopwords,
+        min_length,
+        files,
+        frozenset(w.strip().lower() for w in extra_stopwords if w.strip()),
+        frozenset(w.strip().lower() for w in allow_words if w.strip()),
+    )
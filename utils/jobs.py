@@ -0,0 +1,407 @@
+"""Persistent, resumable batch analysis jobs backed by SQLite"""
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+from .chunking import CHUNK_FEATURES, analyze_chunk, combine_partials, finalize_results
+from .classifiers import classification_counts
+from .sketches import CorpusSketch
+
+JOBS_DB_PATH = os.environ.get("NLP_INSPECTOR_JOBS_DB", os.path.join("data", "jobs.sqlite3"))
+DEFAULT_SHARD_SIZE = 100  # documents per shard
+# Jobs can also keep corpus sketches (opt-in: a few KB per shard)
+JOB_FEATURES = CHUNK_FEATURES + ("sketches",)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    features TEXT NOT NULL,
+    total_items INTEGER NOT NULL,
+    total_shards INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS shards (
+    job_id INTEGER NOT NULL REFERENCES jobs(id),
+    shard_index INTEGER NOT NULL,
+    start_item INTEGER NOT NULL,
+    end_item INTEGER NOT NULL,
+    locator TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    seconds REAL,
+    finished_at REAL,
+    PRIMARY KEY (job_id, shard_index)
+);
+"""
+
+_running = {}
+_running_lock = threading.Lock()
+
+
+def connect(db_path: str = JOBS_DB_PATH) -> sqlite3.Connection:
+    """
+    Open the jobs database, creating it if needed.
+
+    Args:
+        db_path: Path to the SQLite database file
+
+    Returns:
+        SQLite connection
+    """
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+@contextmanager
+def _session(db_path: str):
+    """Open a connection, commit on success and always close it."""
+    conn = connect(db_path)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def plan_shards(source: str, shard_size: int = DEFAULT_SHARD_SIZE) -> list:
+    """
+    Split an input source into shards of documents.
+
+    A directory yields one document per .txt file (in name order); any
+    other file yields one document per non-empty line (the "text" field
+    for .jsonl files). Each shard records how to find its documents again
+    without rescanning the source: file names for directories and a byte
+    range for line-per-document files.
+
+    Args:
+        source: Path to a directory or file
+        shard_size: Documents per shard
+
+    Returns:
+        List of (start item, end item, locator) tuples
+    """
+    shards = []
+    if os.path.isdir(source):
+        names = sorted(name for name in os.listdir(source) if name.endswith(".txt"))
+        for start in range(0, len(names), shard_size):
+            batch = names[start:start + shard_size]
+            shards.append((start, start + len(batch), batch))
+        return shards
+
+    items = 0
+    shard_start_item, shard_start_byte, offset = 0, 0, 0
+    with open(source, "rb") as f:
+        for line in f:
+            offset += len(line)
+            if line.strip():
+                items += 1
+                if items - shard_start_item == shard_size:
+                    shards.append((shard_start_item, items, [shard_start_byte, offset]))
+                    shard_start_item, shard_start_byte = items, offset
+    if items > shard_start_item:
+        shards.append((shard_start_item, items, [shard_start_byte, offset]))
+    return shards
+
+
+def read_shard(source: str, locator) -> list:
+    """
+    Read the documents of one shard.
+
+    Args:
+        source: Path to a directory or file
+        locator: Shard locator from plan_shards
+
+    Returns:
+        List of document texts
+    """
+    if os.path.isdir(source):
+        texts = []
+        for name in locator:
+            with open(os.path.join(source, name), encoding="utf-8", errors="ignore") as f:
+                texts.append(f.read())
+        return texts
+
+    start, end = locator
+    with open(source, "rb") as f:
+        f.seek(start)
+        lines = f.read(end - start).decode("utf-8", errors="ignore").splitlines()
+    lines = [line for line in lines if line.strip()]
+    if source.endswith(".jsonl"):
+        return [json.loads(line)["text"] for line in lines]
+    return [line.strip() for line in lines]
+
+
+def encode_partial(partial: dict) -> str:
+    """Serialize a partial result from analyze_chunk/combine_partials to JSON."""
+    return json.dumps(partial, default=lambda sketch: sketch.to_dict())
+
+
+def decode_partial(data: str) -> dict:
+    """Deserialize a partial result, restoring its Counters and sketches."""
+    partial = json.loads(data)
+    for key, value in partial.items():
+        if key == "sketches":
+            partial[key] = CorpusSketch.from_dict(value)
+        elif key == "entities":
+            if "error" not in value:
+                partial[key] = {category: Counter(names) for category, names in value.items()}
+        elif isinstance(value, dict):
+            partial[key] = Counter(value)
+    return partial
+
+
+def process_shard(source: str, locator, features: tuple) -> tuple:
+    """
+    Analyze one shard of documents (runs in a worker process).
+
+    Args:
+        source: Input source path
+        locator: Shard locator from plan_shards
+        features: Features to compute (see JOB_FEATURES)
+
+    Returns:
+        Tuple of (encoded combined partial, seconds spent)
+    """
+    began = time.perf_counter()
+    combined = {"chunks": 0}
+    texts = list(read_shard(source, locator))
+    # Classifiers score the whole shard in one vectorized batch
+    per_document = tuple(f for f in features if f != "classification")
+    for text in texts:
+        combine_partials(combined, analyze_chunk(text, per_document))
+        combined["chunks"] += 1
+    if "classification" in features:
+        combine_partials(combined, {"classification": classification_counts(texts)})
+    return encode_partial(combined), time.perf_counter() - began
+
+
+def create_job(source: str, features: tuple = CHUNK_FEATURES, shard_size: int = DEFAULT_SHARD_SIZE,
+               db_path: str = JOBS_DB_PATH) -> int:
+    """
+    Register a batch job and split its input into shards.
+
+    Args:
+        source: Path to a directory of .txt files or a line-per-document file
+        features: Features to compute (see JOB_FEATURES)
+        shard_size: Documents per shard
+        db_path: Path to the jobs database
+
+    Returns:
+        New job id
+    """
+    shards = plan_shards(source, shard_size)
+    total = shards[-1][1] if shards else 0
+    with _session(db_path) as conn:
+        cursor = conn.execute(
+            "INSERT INTO jobs (source, features, total_items, total_shards, status, created_at) "
+            "VALUES (?, ?, ?, ?, 'pending', ?)",
+            (os.path.abspath(source), json.dumps(list(features)), total, len(shards), time.time()),
+        )
+        job_id = cursor.lastrowid
+        conn.executemany(
+            "INSERT INTO shards (job_id, shard_index, start_item, end_item, locator, status) "
+            "VALUES (?, ?, ?, ?, ?, 'pending')",
+            [(job_id, index, start, end, json.dumps(locator))
+             for index, (start, end, locator) in enumerate(shards)],
+        )
+    return job_id
+
+
+def _start_job(conn: sqlite3.Connection, job_id: int) -> tuple:
+    """Mark a job running; return (job row, unfinished shard rows)."""
+    job = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    todo = conn.execute(
+        "SELECT shard_index, locator FROM shards "
+        "WHERE job_id = ? AND status != 'done' ORDER BY shard_index",
+        (job_id,),
+    ).fetchall()
+    with conn:
+        conn.execute(
+            "UPDATE jobs SET status = 'running', started_at = COALESCE(started_at, ?) WHERE id = ?",
+            (time.time(), job_id),
+        )
+    return job, todo
+
+
+def _record_shard(conn: sqlite3.Connection, job_id: int, index: int, status: str,
+                  result: str = None, error: str = None, seconds: float = None):
+    """Checkpoint the outcome of one shard."""
+    with conn:
+        conn.execute(
+            "UPDATE shards SET status = ?, result = ?, error = ?, seconds = ?, finished_at = ? "
+            "WHERE job_id = ? AND shard_index = ?",
+            (status, result, error, seconds, time.time(), job_id, index),
+        )
+
+
+def _finish_job(conn: sqlite3.Connection, job_id: int) -> str:
+    """Set and return the final job status from its shards."""
+    failed = conn.execute(
+        "SELECT COUNT(*) FROM shards WHERE job_id = ? AND status != 'done'", (job_id,)
+    ).fetchone()[0]
+    status = "failed" if failed else "done"
+    with conn:
+        conn.execute(
+            "UPDATE jobs SET status = ?, finished_at = ? WHERE id = ?", (status, time.time(), job_id)
+        )
+    return status
+
+
+def run_job(job_id: int, max_workers: int = None, db_path: str = JOBS_DB_PATH) -> str:
+    """
+    Process every unfinished shard of a job, checkpointing each one.
+
+    Finished shards are skipped, so calling this again after a crash or
+    restart resumes where the job stopped without double counting.
+
+    Args:
+        job_id: Job id from create_job
+        max_workers: Worker processes (None for the executor default)
+        db_path: Path to the jobs database
+
+    Returns:
+        Final job status ("done" or "failed")
+    """
+    conn = connect(db_path)
+    try:
+        job, todo = _start_job(conn, job_id)
+        features = tuple(json.loads(job["features"]))
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(process_shard, job["source"], json.loads(shard["locator"]), features):
+                    shard["shard_index"]
+                for shard in todo
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    result, seconds = future.result()
+                    _record_shard(conn, job_id, index, "done", result, seconds=seconds)
+                except Exception as e:
+                    _record_shard(conn, job_id, index, "failed", error=str(e))
+
+        return _finish_job(conn, job_id)
+    finally:
+        conn.close()
+
+
+def start_job_in_background(job_id: int, max_workers: int = None, db_path: str = JOBS_DB_PATH) -> bool:
+    """
+    Run a job on a background thread unless it is already running here.
+
+    Args:
+        job_id: Job id from create_job
+        max_workers: Worker processes (None for the executor default)
+        db_path: Path to the jobs database
+
+    Returns:
+        True if a new runner was started
+    """
+    with _running_lock:
+        thread = _running.get(job_id)
+        if thread is not None and thread.is_alive():
+            return False
+        thread = threading.Thread(target=run_job, args=(job_id, max_workers, db_path), daemon=True)
+        _running[job_id] = thread
+        thread.start()
+        return True
+
+
+def job_progress(db_path: str = JOBS_DB_PATH) -> pd.DataFrame:
+    """
+    Report progress, throughput and ETA for all jobs.
+
+    Returns:
+        DataFrame with one row per job
+    """
+    with _session(db_path) as conn:
+        rows = conn.execute("""
+            SELECT j.id, j.source, j.status, j.total_items, j.total_shards, j.started_at, j.finished_at,
+                   SUM(s.status = 'done') AS done_shards,
+                   SUM(s.status = 'failed') AS failed_shards,
+                   SUM(CASE WHEN s.status = 'done' THEN s.end_item - s.start_item ELSE 0 END) AS done_items,
+                   MAX(s.finished_at) AS last_finished
+            FROM jobs j LEFT JOIN shards s ON s.job_id = j.id
+            GROUP BY j.id ORDER BY j.id DESC
+        """).fetchall()
+
+    records = []
+    now = time.time()
+    for row in rows:
+        done_items = row["done_items"] or 0
+        end = row["finished_at"] or (now if row["status"] == "running" else row["last_finished"])
+        elapsed = (end - row["started_at"]) if row["started_at"] and end else 0
+        throughput = done_items / elapsed if elapsed > 0 else 0.0
+        remaining = row["total_items"] - done_items
+        records.append({
+            "job": row["id"],
+            "source": row["source"],
+            "status": row["status"],
+            "progress": done_items / row["total_items"] if row["total_items"] else 1.0,
+            "shards": f"{row['done_shards'] or 0}/{row['total_shards']}",
+            "failed_shards": row["failed_shards"] or 0,
+            "docs_per_sec": round(throughput, 2),
+            "eta_seconds": round(remaining / throughput) if throughput and remaining else None,
+        })
+    return pd.DataFrame(records)
+
+
+def job_results(job_id: int, db_path: str = JOBS_DB_PATH) -> dict:
+    """
+    Merge the checkpointed results of a job's finished shards.
+
+    Args:
+        job_id: Job id from create_job
+        db_path: Path to the jobs database
+
+    Returns:
+        Dictionary of merged results (see finalize_results)
+    """
+    combined = {}
+    with _session(db_path) as conn:
+        for (result,) in conn.execute(
+            "SELECT result FROM shards WHERE job_id = ? AND status = 'done' ORDER BY shard_index", (job_id,)
+        ):
+            combine_partials(combined, decode_partial(result))
+    return finalize_results(combined)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resumable batch analysis jobs")
+    sub = parser.add_subparsers(dest="command", required=True)
+    create = sub.add_parser("create", help="Register a job for a corpus")
+    create.add_argument("source", help="Directory of .txt files or a line-per-document file")
+    create.add_argument("--features", nargs="+", default=list(CHUNK_FEATURES), choices=JOB_FEATURES)
+    create.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE)
+    run = sub.add_parser("run", help="Run or resume a job")
+    run.add_argument("job_id", type=int)
+    run.add_argument("--workers", type=int, default=None)
+    sub.add_parser("status", help="Show job progress")
+    args = parser.parse_args()
+
+    if args.command == "create":
+        print(create_job(args.source, tuple(args.features), args.shard_size))
+    elif args.command == "run":
+        print(run_job(args.job_id, args.workers))
+    else:
+        print(job_progress().to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
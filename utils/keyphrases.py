@@ -0,0 +1,162 @@
+"""Keyphrase extraction (TextRank / RAKE) over original sentence spans"""
+import re
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from .filters import get_stopwords
+
+WORD_PATTERN = re.compile(r"[^\W\d_]+(?:[-'][^\W\d_]+)*")
+# Phrase boundaries: sentence punctuation, clause punctuation and line breaks
+BOUNDARY_PATTERN = re.compile(r"[.!?;:,()\[\]{}\"“”]|\n")
+SENTENCE_END = frozenset(".!?\n")
+
+
+def extract_candidates(text: str, language: str = "en", max_words: int = 4) -> list:
+    """
+    Build candidate phrases from the original text.
+
+    Candidates are maximal runs of content words that are not broken by a
+    stopword or punctuation, so every phrase actually occurs in the text.
+
+    Args:
+        text: Input text
+        language: Stopword language (ISO code or NLTK name)
+        max_words: Maximum number of words per candidate phrase
+
+    Returns:
+        List of (phrase words, start offset, end offset, sentence index) tuples
+    """
+    stop = get_stopwords(language)
+    candidates = []
+    boundaries = [(m.start(), m.group() in SENTENCE_END) for m in BOUNDARY_PATTERN.finditer(text)]
+    boundaries.append((len(text), True))
+    b = 0
+    sentence = 0
+
+    run, run_start, run_end = [], 0, 0
+    for match in WORD_PATTERN.finditer(text):
+        # Close the current run at any punctuation between it and this word
+        while boundaries[b][0] < match.start():
+            if run:
+                candidates.append((run, run_start, run_end, sentence))
+                run = []
+            sentence += boundaries[b][1]
+            b += 1
+        word = match.group().lower()
+        if word in stop or len(word) < 2:
+            if run:
+                candidates.append((run, run_start, run_end, sentence))
+                run = []
+            continue
+        if not run:
+            run_start = match.start()
+        run.append(word)
+        run_end = match.end()
+        if len(run) == max_words:
+            candidates.append((run, run_start, run_end, sentence))
+            run = []
+    if run:
+        candidates.append((run, run_start, run_end, sentence))
+    return candidates
+
+
+def _textrank_scores(sequences: list, vocab_size: int, window: int = 2,
+                     damping: float = 0.85, max_iter: int = 50, tol: float = 1e-6) -> np.ndarray:
+    """Run TextRank power iteration on a sparse word co-occurrence graph."""
+    rows, cols = [], []
+    for seq in sequences:
+        for offset in range(1, window):
+            rows.append(seq[:-offset])
+            cols.append(seq[offset:])
+    if rows:
+        rows = np.concatenate(rows)
+        cols = np.concatenate(cols)
+        keep = rows != cols
+        rows, cols = rows[keep], cols[keep]
+    else:
+        rows = cols = np.zeros(0, dtype=np.int64)
+
+    graph = sparse.coo_matrix(
+        (np.ones(len(rows)), (rows, cols)), shape=(vocab_size, vocab_size)
+    ).tocsr()
+    graph = graph + graph.T
+    graph.data[:] = 1.0  # unweighted, undirected edges
+
+    out_degree = np.asarray(graph.sum(axis=0)).ravel()
+    out_degree[out_degree == 0] = 1
+    transition = graph.multiply(1.0 / out_degree).tocsr()  # column-normalized
+
+    scores = np.ones(vocab_size)
+    for _ in range(max_iter):
+        updated = (1 - damping) + damping * (transition @ scores)
+        if np.abs(updated - scores).sum() < tol:
+            return updated
+        scores = updated
+    return scores
+
+
+def _rake_scores(phrases: list, vocab_size: int) -> np.ndarray:
+    """Score words by RAKE degree / frequency."""
+    ids = np.concatenate(phrases)
+    lengths = np.repeat([len(p) for p in phrases], [len(p) for p in phrases])
+    freq = np.bincount(ids, minlength=vocab_size)
+    degree = np.bincount(ids, weights=lengths, minlength=vocab_size)
+    return degree / np.maximum(freq, 1)
+
+
+def extract_keyphrases(text: str, n_keyphrases: int = 10, method: str = "textrank",
+                       language: str = "en", max_words: int = 4) -> pd.DataFrame:
+    """
+    Extract ranked keyphrases using TextRank or RAKE.
+
+    Args:
+        text: Input text
+        n_keyphrases: Number of keyphrases to return
+        method: "textrank" or "rake"
+        language: Stopword language (ISO code or NLTK name)
+        max_words: Maximum number of words per keyphrase
+
+    Returns:
+        DataFrame with keyphrase, score, count and first offset
+    """
+    try:
+        candidates = extract_candidates(text, language, max_words)
+        if not candidates:
+            return pd.DataFrame({"keyphrase": [], "score": [], "count": [], "offset": []})
+
+        vocab = {}
+        phrases = [
+            np.fromiter((vocab.setdefault(w, len(vocab)) for w in words), dtype=np.int64)
+            for words, _, _, _ in candidates
+        ]
+
+        if method == "textrank":
+            # Words co-occur when adjacent in a sentence's content-word stream
+            sentences = {}
+            for (_, _, _, sentence), ids in zip(candidates, phrases):
+                sentences.setdefault(sentence, []).append(ids)
+            sequences = [np.concatenate(parts) for parts in sentences.values()]
+            word_scores = _textrank_scores(sequences, len(vocab))
+        elif method == "rake":
+            word_scores = _rake_scores(phrases, len(vocab))
+        else:
+            raise ValueError(f"Unknown keyphrase method: {method}")
+
+        # Aggregate duplicate phrases, keeping the first occurrence's span
+        table = {}
+        for (words, start, end, _), ids in zip(candidates, phrases):
+            key = " ".join(words)
+            entry = table.get(key)
+            if entry is None:
+                table[key] = [float(word_scores[ids].sum()), 1, start, text[start:end]]
+            else:
+                entry[1] += 1
+
+        df = pd.DataFrame(
+            [(surface, score, count, start) for score, count, start, surface in table.values()],
+            columns=["keyphrase", "score", "count", "offset"],
+        )
+        df["score"] = df["score"].round(4)
+        return df.nlargest(n_keyphrases, "score").reset_index(drop=True)
+    except Exception as e:
+        return pd.DataFrame({"error": [str(e)]})
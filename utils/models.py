@@ -0,0 +1,226 @@
+"""Process-wide registry of heavy NLP models and analysis concurrency limits"""
+import gc
+import os
+import sys
+import threading
+import time
+import types
+from contextlib import contextmanager
+from functools import partial
+import pandas as pd
+
+MAX_CONCURRENT_ANALYSES = int(os.environ.get("NLP_INSPECTOR_MAX_ANALYSES", "4"))
+
+_models = {}
+_footprints = {}
+_load_lock = threading.RLock()  # loaders may load the models they depend on
+_analysis_slots = threading.BoundedSemaphore(MAX_CONCURRENT_ANALYSES)
+_active = 0
+_active_lock = threading.Lock()
+
+
+def _load_pos_tagger():
+    from nltk.tag.perceptron import PerceptronTagger
+    return PerceptronTagger()
+
+
+def _load_ne_chunker():
+    from nltk.chunk import ne_chunker
+    from .resources import get_resource_store
+    chunker = ne_chunker()
+    store = get_resource_store()
+    if store is not None and "words/en-basic" in store:
+        chunker._tagger._en_wordlist = store.table("words/en-basic")
+    return chunker
+
+
+def _load_sentiment_analyzer():
+    from .resources import get_resource_store, load_mapped_sentiment_analyzer
+    store = get_resource_store()
+    if store is not None and "sentiment/en" in store:
+        return load_mapped_sentiment_analyzer(store)
+
+    from textblob.en.sentiments import PatternAnalyzer
+    analyzer = PatternAnalyzer()
+    analyzer.analyze("good")  # forces the lexicon to load
+    return analyzer
+
+
+def _load_easy_words():
+    from textstat.backend.utils import get_lang_root
+    from textstat.backend.validations import _is_difficult_word
+    from .resources import get_resource_store
+    store = get_resource_store()
+    names = store.names if store is not None else []
+    tables = {name.split("/", 1)[1]: store.table(name) for name in names if name.startswith("easy_words/")}
+    if tables:
+        # textstat's only lookup of the Dale-Chall list; unknown languages still parse its own files
+        parse = _is_difficult_word.get_lang_easy_words
+        _is_difficult_word.get_lang_easy_words = lambda lang: tables.get(get_lang_root(lang)) or parse(lang)
+    return tables
+
+
+def _load_language_profiles():
+    from langdetect import detector_factory
+    detector_factory.init_factory()
+    return detector_factory._factory
+
+
+def _load_classifier(task: str):
+    from .classifiers import load_classifier
+    return load_classifier(task)  # None until a model has been trained
+
+
+def _load_resource_store():
+    from .resources import ResourceStore, RESOURCE_STORE_PATH
+    if not os.path.exists(RESOURCE_STORE_PATH):
+        return None  # optional; built with `python -m utils.resources`
+    return ResourceStore(RESOURCE_STORE_PATH)
+
+
+MODEL_LOADERS = {
+    "resource_store": _load_resource_store,
+    "pos_tagger": _load_pos_tagger,
+    "ne_chunker": _load_ne_chunker,
+    "sentiment_analyzer": _load_sentiment_analyzer,
+    "easy_words": _load_easy_words,
+    "language_profiles": _load_language_profiles,
+    "emotion_classifier": partial(_load_classifier, "emotion"),
+    "toxicity_classifier": partial(_load_classifier, "toxicity"),
+}
+
+
+# Shared by every model: not counted in a model's footprint
+_SHARED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+def _deep_size(obj) -> int:
+    """
+    Approximate bytes reachable from an object.
+
+    Walks the object graph rather than tracing allocations, so loads
+    running on other threads do not count towards it. Memory-mapped data
+    and data held in module globals (e.g. TextBlob's lexicon) are not counted.
+    """
+    seen, size, stack = set(), 0, [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, _SHARED_TYPES):
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        stack.extend(gc.get_referents(item))
+    return size
+
+
+def register_model(name: str, loader):
+    """
+    Register a loader for a shared model.
+
+    Args:
+        name: Model name used with get_model
+        loader: Zero-argument callable that returns the loaded model
+    """
+    MODEL_LOADERS[name] = loader
+
+
+def get_model(name: str):
+    """
+    Get a shared, read-only model, loading it once per process.
+
+    Args:
+        name: Registered model name (see MODEL_LOADERS)
+
+    Returns:
+        The loaded model object
+    """
+    model = _models.get(name)
+    if model is not None:
+        return model
+
+    with _load_lock:
+        if name in _models:
+            return _models[name]
+        loader = MODEL_LOADERS[name]
+
+        start = time.perf_counter()
+        model = loader()
+        elapsed = time.perf_counter() - start
+
+        _footprints[name] = {"size_bytes": _deep_size(model), "load_seconds": elapsed}
+        _models[name] = model
+        return model
+
+
+def reset_model(name: str):
+    """
+    Drop a loaded model so the next get_model call reloads it (e.g. after retraining).
+
+    Args:
+        name: Registered model name
+    """
+    with _load_lock:
+        _models.pop(name, None)
+        _footprints.pop(name, None)
+
+
+def warm_models(names: list = None) -> dict:
+    """
+    Load models ahead of the first request.
+
+    Args:
+        names: Model names to load (all registered models by default)
+
+    Returns:
+        Dictionary mapping model name to an error message for models that failed to load
+    """
+    errors = {}
+    for name in names or list(MODEL_LOADERS):
+        try:
+            get_model(name)
+        except Exception as e:
+            errors[name] = str(e)
+    return errors
+
+
+def model_footprints() -> pd.DataFrame:
+    """
+    Report the memory footprint of loaded models.
+
+    Returns:
+        DataFrame with model name, size in MB and load time in seconds
+    """
+    rows = [
+        (name, round(info["size_bytes"] / 2 ** 20, 2), round(info["load_seconds"], 2))
+        for name, info in _footprints.items()
+    ]
+    return pd.DataFrame(rows, columns=["model", "size_mb", "load_seconds"])
+
+
+@contextmanager
+def analysis_slot(timeout: float = None):
+    """
+    Limit the number of analyses running at once across all sessions.
+
+    Args:
+        timeout: Seconds to wait for a free slot (None waits forever)
+
+    Raises:
+        TimeoutError: If no slot became free within timeout
+    """
+    global _active
+    if not _analysis_slots.acquire(timeout=timeout):
+        raise TimeoutError("Too many analyses are running; please try again shortly.")
+    with _active_lock:
+        _active += 1
+    try:
+        yield
+    finally:
+        with _active_lock:
+            _active -= 1
+        _analysis_slots.release()
+
+
+def active_analyses() -> int:
+    """Get the number of analyses currently holding a slot."""
+    return _active
@@ -1,13 +1,13 @@
 """Advanced NLP features"""
 from textblob import TextBlob
 import textstat
-from langdetect import detect, DetectorFactory
+from langdetect import DetectorFactory
 import nltk
-from nltk import pos_tag, ne_chunk
 from nltk.tokenize import word_tokenize, sent_tokenize
 from sklearn.feature_extraction.text import TfidfVectorizer
 import pandas as pd
 from collections import Counter
+from .models import get_model
 
 DetectorFactory.seed = 0
 
@@ -33,6 +33,48 @@ except LookupError:
     nltk.download('words', quiet=True)
 
 
+def label_sentiment(polarity: float) -> tuple:
+    """
+    Map a polarity score to a display label and color.
+    
+    Args:
+        polarity: Sentiment polarity (-1 to 1)
+        
+    Returns:
+        Tuple of (label, color)
+    """
+    if polarity > 0.1:
+        return "Positive 😊", "green"
+    if polarity < -0.1:
+        return "Negative 😔", "red"
+    return "Neutral 😐", "gray"
+
+
+def interpret_reading_ease(flesch_reading: float) -> str:
+    """
+    Interpret a Flesch Reading Ease score as a difficulty level.
+    
+    Args:
+        flesch_reading: Flesch Reading Ease score
+        
+    Returns:
+        Difficulty level description
+    """
+    if flesch_reading > 90:
+        return "Very Easy (5-6 years)"
+    if flesch_reading > 80:
+        return "Easy (6-7 years)"
+    if flesch_reading > 70:
+        return "Fairly Easy (7-9 years)"
+    if flesch_reading > 60:
+        return "Standard (9-12 years)"
+    if flesch_reading > 50:
+        return "Fairly Difficult (12-15 years)"
+    if flesch_reading > 30:
+        return "Difficult (College)"
+    return "Very Difficult (College graduate)"
+
+
 def get_sentiment(text: str) -> dict:
     """
     Perform sentiment analysis using TextBlob.
@@ -44,19 +86,10 @@ def get_sentiment(text: str) -> dict:
         Dictionary with polarity, subjectivity, and label
     """
     try:
-        blob = TextBlob(text)
+        blob = TextBlob(text, analyzer=get_model("sentiment_analyzer"))
         polarity = blob.sentiment.polarity
         subjectivity = blob.sentiment.subjectivity
-        
-        if polarity > 0.1:
-            label = "Positive 😊"
-            color = "green"
-        elif polarity < -0.1:
-            label = "Negative 😔"
-            color = "red"
-        else:
-            label = "Neutral 😐"
-            color = "gray"
+        label, color = label_sentiment(polarity)
         
         return {
             "polarity": round(polarity, 3),
@@ -85,31 +118,16 @@ def get_readability(text: str) -> dict:
         Dictionary with various readability scores
     """
     try:
+        get_model("easy_words")  # Dale-Chall list from the resource store, when built
         flesch_kincaid = textstat.flesch_kincaid_grade(text)
         flesch_reading = textstat.flesch_reading_ease(text)
         dale_chall = textstat.dale_chall_readability_score(text)
         
-        # Interpret Flesch Reading Ease
-        if flesch_reading > 90:
-            difficulty = "Very Easy (5-6 years)"
-        elif flesch_reading > 80:
-            difficulty = "Easy (6-7 years)"
-        elif flesch_reading > 70:
-            difficulty = "Fairly Easy (7-9 years)"
-        elif flesch_reading > 60:
-            difficulty = "Standard (9-12 years)"
-        elif flesch_reading > 50:
-            difficulty = "Fairly Difficult (12-15 years)"
-        elif flesch_reading > 30:
-            difficulty = "Difficult (College)"
-        else:
-            difficulty = "Very Difficult (College graduate)"
-        
         return {
             "flesch_kincaid_grade": round(flesch_kincaid, 2),
             "flesch_reading_ease": round(flesch_reading, 2),
             "dale_chall_score": round(dale_chall, 2),
-            "difficulty_level": difficulty,
+            "difficulty_level": interpret_reading_ease(flesch_reading),
         }
     except Exception as e:
         return {"error": str(e)}
@@ -126,11 +144,77 @@ def get_language(text: str) -> str:
         Language code (e.g., 'en', 'es', 'fr')
     """
     try:
-        return detect(text)
+        detector = get_model("language_profiles").create()
+        detector.append(text)
+        return detector.detect()
     except Exception:
         return "unknown"
 
 
+def tag_sentences(sentences: list) -> list:
+    """
+    POS-tag sentences with the shared tagger.
+    
+    Args:
+        sentences: List of sentence strings
+        
+    Returns:
+        List of tagged sentences, each a list of (word, tag) tuples
+    """
+    tagger = get_model("pos_tagger")
+    return [tagger.tag(word_tokenize(sentence)) for sentence in sentences]
+
+
+def count_tagged_entities(tagged_sentences: list) -> dict:
+    """
+    Count Named Entity mentions in POS-tagged sentences.
+    
+    Args:
+        tagged_sentences: Output of tag_sentences
+        
+    Returns:
+        Dictionary mapping entity category to a Counter of entity names
+    """
+    entity_counts = {
+        "PERSON": Counter(), "ORGANIZATION": Counter(),
+        "LOCATION": Counter(), "OTHER": Counter(),
+    }
+    
+    chunker = get_model("ne_chunker")
+    
+    for pos_tags in tagged_sentences:
+        ne_tree = chunker.parse(pos_tags)
+        
+        for subtree in ne_tree:
+            if hasattr(subtree, 'label'):
+                entity_name = " ".join([word for word, tag in subtree.leaves()])
+                entity_type = subtree.label()
+                
+                if entity_type == "PERSON":
+                    entity_counts["PERSON"][entity_name] += 1
+                elif entity_type == "ORGANIZATION":
+                    entity_counts["ORGANIZATION"][entity_name] += 1
+                elif entity_type == "GPE":  # Geo-political entity
+                    entity_counts["LOCATION"][entity_name] += 1
+                else:
+                    entity_counts["OTHER"][f"{entity_name} ({entity_type})"] += 1
+    
+    return entity_counts
+
+
+def count_entities(text: str) -> dict:
+    """
+    Count Named Entity mentions using NLTK.
+    
+    Args:
+        text: Input text
+        
+    Returns:
+        Dictionary mapping entity category to a Counter of entity names
+    """
+    return count_tagged_entities(tag_sentences(sent_tokenize(text)))
+
+
 def extract_entities(text: str) -> dict:
     """
     Extract Named Entities using NLTK.
@@ -142,33 +226,9 @@ def extract_entities(text: str) -> dict:
         Dictionary with persons, organizations, locations
     """
     try:
-        sentences = sent_tokenize(text)
-        all_entities = {"PERSON": [], "ORGANIZATION": [], "LOCATION": [], "OTHER": []}
-        
-        for sentence in sentences:
-            tokens = word_tokenize(sentence)
-            pos_tags = pos_tag(tokens)
-            ne_tree = ne_chunk(pos_tags)
-            
-            for subtree in ne_tree:
-                if hasattr(subtree, 'label'):
-                    entity_name = " ".join([word for word, tag in subtree.leaves()])
-                    entity_type = subtree.label()
-                    
-                    if entity_type == "PERSON":
-                        all_entities["PERSON"].append(entity_name)
-                    elif entity_type == "ORGANIZATION":
-                        all_entities["ORGANIZATION"].append(entity_name)
-                    elif entity_type == "GPE":  # Geo-political entity
-                        all_entities["LOCATION"].append(entity_name)
-                    else:
-                        all_entities["OTHER"].append(f"{entity_name} ({entity_type})")
-        
+        entity_counts = count_entities(text)
         # Remove duplicates
-        for key in all_entities:
-            all_entities[key] = list(set(all_entities[key]))
-        
-        return all_entities
+        return {key: list(names) for key, names in entity_counts.items()}
     except Exception as e:
         return {"error": str(e)}
 
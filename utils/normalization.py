@@ -0,0 +1,121 @@
+"""Unicode-aware text normalization stage run before tokenization"""
+import html
+import re
+import unicodedata
+from functools import lru_cache
+
+NORMALIZATION_STEPS = ("nfkc", "html", "urls", "emails", "handles", "contractions", "dehyphenate")
+DEFAULT_NORMALIZATION = NORMALIZATION_STEPS
+
+# Replacements for masked spans when placeholders are requested
+MASK_TOKENS = {"urls": " URL ", "emails": " EMAIL ", "handles": " USER "}
+
+# Typographic characters NFKC leaves alone, folded to their ASCII forms
+TRANSLATE_TABLE = str.maketrans({
+    "‘": "'", "’": "'", "‚": "'", "‛": "'", "′": "'",
+    "“": '"', "”": '"', "„": '"', "‟": '"', "″": '"',
+    "‐": "-", "‑": "-", "‒": "-", "–": "-", "—": "-", "―": "-",
+    "­": None, "​": None, "‌": None, "‍": None, "⁠": None, "﻿": None,
+})
+
+CONTRACTIONS = {
+    "can't": "can not", "won't": "will not", "shan't": "shall not", "ain't": "is not",
+}
+CONTRACTION_SUFFIXES = {
+    "n't": " not", "'re": " are", "'ve": " have", "'ll": " will", "'m": " am", "'d": " would",
+    "'s": "",  # possessive or "is"; keep the stem either way
+}
+
+# One alternative per step, combined into a single pattern in this order
+STEP_PATTERNS = {
+    "html": (
+        r"(?P<html_block><(?P<html_tag>script|style)\b[^>]*>.*?</(?P=html_tag)\s*>)"
+        r"|(?P<html_markup><!--.*?-->|</?[A-Za-z][^<>]*>)"
+        r"|(?P<html_entity>&(?:#\d+|#[xX][0-9a-fA-F]+|[A-Za-z][A-Za-z0-9]*);)"
+    ),
+    "urls": r"(?P<urls>\b(?:https?://|www\.)[^\s<>\"']*[^\s<>\"'.,;:!?)\]])",
+    "emails": r"(?P<emails>\b[\w.+-]+@[\w-]+(?:\.[\w-]+)+\b)",
+    "handles": r"(?P<handles>(?<![\w@])@\w+)",
+    "contractions": r"(?P<contractions>\b\w+?(?:n't|'(?:re|ve|ll|m|d|s))\b)",
+    "dehyphenate": r"(?P<dehyphenate>(?<=\w)-[ \t]*\r?\n[ \t]*(?=\w))",
+}
+
+
+class Normalizer:
+    """
+    A normalization pipeline compiled once per configuration.
+
+    Character-level folding (NFKC plus a translate table for quotes, dashes
+    and invisible characters) is skipped for pure-ASCII input, and every
+    span-level rewrite runs in one pass of a single compiled regex.
+    """
+
+    def __init__(self, steps: tuple = DEFAULT_NORMALIZATION, placeholders: bool = False):
+        unknown = set(steps) - set(NORMALIZATION_STEPS)
+        if unknown:
+            raise ValueError(f"Unknown normalization steps: {sorted(unknown)}")
+        self.steps = tuple(step for step in NORMALIZATION_STEPS if step in steps)
+        self.placeholders = placeholders
+        self.fold_unicode = "nfkc" in self.steps
+        alternatives = [STEP_PATTERNS[step] for step in self.steps if step in STEP_PATTERNS]
+        self.pattern = (
+            re.compile("|".join(alternatives), re.IGNORECASE | re.DOTALL) if alternatives else None
+        )
+
+    def _replace(self, match) -> str:
+        kind = match.lastgroup
+        if kind in MASK_TOKENS:
+            return MASK_TOKENS[kind] if self.placeholders else " "
+        if kind == "contractions":
+            word = match.group().lower()
+            if word in CONTRACTIONS:
+                return CONTRACTIONS[word]
+            for suffix, expansion in CONTRACTION_SUFFIXES.items():
+                if word.endswith(suffix):
+                    return match.group()[:-len(suffix)] + expansion
+        if kind == "html_entity":
+            return html.unescape(match.group())
+        if kind == "dehyphenate":
+            return ""
+        return " "  # html_block, html_markup
+
+    def __call__(self, text: str) -> str:
+        """Normalize text."""
+        if self.fold_unicode and not text.isascii():
+            if not unicodedata.is_normalized("NFKC", text):
+                text = unicodedata.normalize("NFKC", text)
+            text = text.translate(TRANSLATE_TABLE)
+        if self.pattern is not None:
+            text = self.pattern.sub(self._replace, text)
+        return text
+
+
+@lru_cache(maxsize=32)
+def get_normalizer(steps: tuple = DEFAULT_NORMALIZATION, placeholders: bool = False) -> Normalizer:
+    """
+    Get the compiled normalizer for a set of steps (cached).
+
+    Args:
+        steps: Normalization steps to apply (see NORMALIZATION_STEPS)
+        placeholders: Replace masked URLs, emails and handles with URL/EMAIL/USER
+            instead of removing them
+
+    Returns:
+        Normalizer callable that normalizes a string
+    """
+    return Normalizer(steps, placeholders)
+
+
+def normalize_text(text: str, steps=DEFAULT_NORMALIZATION, placeholders: bool = True) -> str:
+    """
+    Normalize text for display or downstream analyzers.
+
+    Args:
+        text: Input text
+        steps: Normalization steps to apply (see NORMALIZATION_STEPS)
+        placeholders: Replace masked URLs, emails and handles with URL/EMAIL/USER
+
+    Returns:
+        Normalized text
+    """
+    return get_normalizer(tuple(steps), placeholders)(text)
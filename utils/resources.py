@@ -0,0 +1,360 @@
+"""Precompiled, memory-mapped store for lexicons and word lists"""
+import argparse
+import json
+import mmap
+import os
+import struct
+from importlib import resources as package_resources
+import numpy as np
+from .models import get_model
+
+RESOURCE_STORE_PATH = os.environ.get(
+    "NLP_INSPECTOR_RESOURCE_STORE",
+    os.path.join(os.environ.get("NLP_INSPECTOR_MODEL_DIR", "models"), "resources.bin"),
+)
+
+MAGIC = b"NLPRES01"
+HEADER = struct.Struct("<8sQ")  # magic, table-of-contents length
+ALIGNMENT = 8
+
+SENTIMENT_COLUMNS = ("polarity", "subjectivity", "intensity", "modifier")
+
+
+class MappedTable:
+    """
+    A sorted string table with an optional value array, viewed in place.
+
+    Keys are fixed-width UTF-8 byte strings sorted in byte order, so a
+    lookup is one binary search over the mapped pages and nothing is
+    copied into the process heap.
+    """
+
+    def __init__(self, keys: np.ndarray, values: np.ndarray = None,
+                 columns: tuple = (), categories: list = None):
+        self.keys = keys
+        self.values = values
+        self.columns = tuple(columns)
+        self.categories = categories
+        self.width = keys.dtype.itemsize
+
+    def index(self, word: str) -> int:
+        """Get the row of a word, or -1 if it is not in the table."""
+        key = word.encode("utf-8")
+        if not key or len(key) > self.width:
+            return -1
+        i = int(self.keys.searchsorted(key))
+        if i < len(self.keys) and self.keys[i] == key:
+            return i
+        return -1
+
+    def __contains__(self, word) -> bool:
+        return isinstance(word, str) and self.index(word) >= 0
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __iter__(self):
+        return (key.decode("utf-8") for key in self.keys)
+
+    def get(self, word: str, default=None):
+        """
+        Look up the value stored for a word.
+
+        Args:
+            word: Word to look up
+            default: Value returned for unknown words
+
+        Returns:
+            Category name for label tables, the value row for numeric tables,
+            True for plain word lists, or default
+        """
+        i = self.index(word) if isinstance(word, str) else -1
+        if i < 0:
+            return default
+        if self.values is None:
+            return True
+        if self.categories is not None:
+            return self.categories[int(self.values[i, 0])]
+        return self.values[i]
+
+    def words(self) -> frozenset:
+        """Copy the keys into a frozenset (for small, hot lists)."""
+        return frozenset(self)
+
+
+class ResourceStore:
+    """
+    Read-only view of a compiled resource file.
+
+    The file is mapped once with mmap and every table is a numpy view into
+    the mapping, so worker processes share the same OS pages instead of
+    each parsing and holding its own copy.
+    """
+
+    def __init__(self, path: str = RESOURCE_STORE_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, toc_length = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a resource store: {path}")
+        self.toc = json.loads(self._mmap[HEADER.size:HEADER.size + toc_length])
+        self._tables = {}
+
+    @property
+    def names(self) -> list:
+        """Names of the tables in the store."""
+        return sorted(self.toc)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.toc
+
+    def table(self, name: str) -> MappedTable:
+        """
+        Get a table by name.
+
+        Args:
+            name: Table name, e.g. 'stopwords/english' or 'sentiment/en'
+
+        Returns:
+            MappedTable viewing the mapped file
+        """
+        table = self._tables.get(name)
+        if table is None:
+            meta = self.toc[name]
+            keys = np.frombuffer(
+                self._mmap, dtype=f"S{meta['width']}", count=meta["count"], offset=meta["keys"]
+            )
+            values = None
+            if meta.get("values") is not None:
+                values = np.frombuffer(
+                    self._mmap, dtype=meta["dtype"], count=meta["count"] * len(meta["columns"]),
+                    offset=meta["values"],
+                ).reshape(meta["count"], len(meta["columns"]))
+            table = MappedTable(keys, values, meta.get("columns", ()), meta.get("categories"))
+            self._tables[name] = table
+        return table
+
+
+def load_mapped_sentiment_analyzer(store: ResourceStore):
+    """
+    Build a TextBlob pattern analyzer whose lexicon is read from the store.
+
+    Scores match textblob.en.sentiment for plain-text input, which only
+    uses the per-word averages, the adverb (modifier) flag and the labels.
+
+    Args:
+        store: Resource store containing the 'sentiment/en' tables
+
+    Returns:
+        PatternAnalyzer-compatible sentiment analyzer
+    """
+    from collections import namedtuple
+    from textblob import en
+    from textblob.en.sentiments import PatternAnalyzer
+
+    class MappedSentiment(en.Sentiment):
+        def __init__(self, table, labels, **kwargs):
+            super().__init__(**kwargs)
+            self.table = table
+            self.labeler = labels
+
+        def load(self, path=None):
+            pass
+
+        def __contains__(self, word):
+            return word in self.table
+
+        def __getitem__(self, word):
+            row = self.table.get(word)
+            if row is None:
+                raise KeyError(word)
+            polarity, subjectivity, intensity, modifier = row.tolist()
+            senses = {None: (polarity, subjectivity, intensity)}
+            if modifier:
+                senses[self.modifiers[0]] = senses[None]
+            return senses
+
+    class MappedSentimentAnalyzer(PatternAnalyzer):
+        def __init__(self, lexicon):
+            super().__init__()
+            self.lexicon = lexicon
+
+        def analyze(self, text, keep_assessments=False):
+            score = self.lexicon(text)
+            if keep_assessments:
+                Sentiment = namedtuple("Sentiment", ["polarity", "subjectivity", "assessments"])
+                return Sentiment(score[0], score[1], score.assessments)
+            Sentiment = namedtuple("Sentiment", ["polarity", "subjectivity"])
+            return Sentiment(*score)
+
+    default = en.sentiment
+    lexicon = MappedSentiment(
+        store.table("sentiment/en"),
+        store.table("sentiment/en-labels"),
+        negations=default.negations,
+        modifiers=default.modifiers,
+        modifier=default.modifier,
+        tokenizer=default.tokenizer,
+        language="en",
+    )
+    return MappedSentimentAnalyzer(lexicon)
+
+
+def get_resource_store():
+    """
+    Get the process-wide resource store.
+
+    Returns:
+        ResourceStore, or None if the store had not been built when the
+        process first asked for it
+    """
+    return get_model("resource_store")
+
+
+def _pad(offset: int) -> int:
+    return -offset % ALIGNMENT
+
+
+def write_resource_store(tables: dict, path: str = RESOURCE_STORE_PATH) -> dict:
+    """
+    Write tables to a resource store file.
+
+    Args:
+        tables: Mapping of table name to (words, values, meta) where values is
+            None or an array with one row per word, and meta may hold
+            'columns' and 'categories'
+        path: Output path (replaced atomically)
+
+    Returns:
+        Dictionary mapping table name to number of entries
+    """
+    sections, toc = [], {}
+    for name, (words, values, meta) in tables.items():
+        rows = {}
+        for i, word in enumerate(words):
+            key = word.encode("utf-8")
+            if key and not key.endswith(b"\0"):
+                rows[key] = i  # last value wins for duplicate words
+        keys = np.array(sorted(rows), dtype=f"S{max(map(len, rows), default=1)}")
+        entry = {"count": len(keys), "width": keys.dtype.itemsize}
+        sections.append((name, "keys", keys.tobytes()))
+        if values is not None:
+            values = np.asarray(values, dtype=np.float64).reshape(len(words), -1)
+            ordered = values[[rows[key] for key in keys.tolist()]] if len(keys) else values[:0]
+            entry.update(dtype="<f8", columns=list(meta.get("columns", range(values.shape[1]))))
+            sections.append((name, "values", np.ascontiguousarray(ordered, dtype="<f8").tobytes()))
+        if meta.get("categories") is not None:
+            entry["categories"] = list(meta["categories"])
+        toc[name] = entry
+
+    # Offsets depend on the TOC length, which depends on the offsets; fix
+    # the TOC size first with placeholder offsets wide enough for any file
+    for name, _, _ in sections:
+        toc[name]["keys"] = 10 ** 15
+        if "columns" in toc[name]:
+            toc[name]["values"] = 10 ** 15
+    toc_length = len(json.dumps(toc).encode("utf-8"))
+    offset = HEADER.size + toc_length
+    offset += _pad(offset)
+    for name, kind, data in sections:
+        toc[name][kind] = offset
+        offset += len(data) + _pad(len(data))
+    toc_bytes = json.dumps(toc).encode("utf-8").ljust(toc_length)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, toc_length))
+        f.write(toc_bytes)
+        f.write(b"\0" * _pad(HEADER.size + toc_length))
+        for _, _, data in sections:
+            f.write(data)
+            f.write(b"\0" * _pad(len(data)))
+    os.replace(tmp_path, path)
+    return {name: entry["count"] for name, entry in toc.items()}
+
+
+def _collect_stopwords(tables: dict):
+    from nltk.corpus import stopwords
+    for language in stopwords.fileids():
+        tables[f"stopwords/{language}"] = (stopwords.words(language), None, {})
+
+
+def _collect_easy_words(tables: dict):
+    root = package_resources.files("textstat") / "resources"
+    for lang_dir in root.iterdir():
+        path = lang_dir / "easy_words.txt"
+        if path.is_file():
+            words = [line.strip() for line in path.read_text(encoding="utf-8").splitlines()]
+            tables[f"easy_words/{lang_dir.name}"] = ([w for w in words if w], None, {})
+
+
+def _collect_wordlists(tables: dict):
+    from nltk.corpus import words
+    for fileid in words.fileids():
+        tables[f"words/{fileid}"] = (words.words(fileid), None, {})
+
+
+def _collect_sentiment(tables: dict):
+    from textblob.en import sentiment as lexicon
+    if dict.__len__(lexicon) == 0:
+        lexicon.load()
+    entries = dict.items(lexicon)
+    tables["sentiment/en"] = (
+        [word for word, _ in entries],
+        [list(senses[None]) + [any(m in senses for m in lexicon.modifiers)] for _, senses in entries],
+        {"columns": SENTIMENT_COLUMNS},
+    )
+    categories = sorted(set(lexicon.labeler.values()))
+    tables["sentiment/en-labels"] = (
+        list(lexicon.labeler),
+        [[categories.index(label)] for label in lexicon.labeler.values()],
+        {"columns": ("label",), "categories": categories},
+    )
+
+
+RESOURCE_COLLECTORS = {
+    "stopwords": _collect_stopwords,
+    "easy_words": _collect_easy_words,
+    "words": _collect_wordlists,
+    "sentiment": _collect_sentiment,
+}
+
+
+def build_resource_store(path: str = RESOURCE_STORE_PATH) -> dict:
+    """
+    Compile the available lexicons and word lists into one store file.
+
+    Resources whose source data is not installed are skipped.
+
+    Args:
+        path: Output path
+
+    Returns:
+        Dictionary with table sizes and any skipped resources with the reason
+    """
+    tables, skipped = {}, {}
+    for name, collect in RESOURCE_COLLECTORS.items():
+        try:
+            collect(tables)
+        except (LookupError, OSError) as e:
+            reason = (line.strip() for line in str(e).splitlines() if line.strip(" *"))
+            skipped[name] = next(reason, type(e).__name__)
+    sizes = write_resource_store(tables, path)
+    return {"tables": sizes, "skipped": skipped}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile lexicons into a memory-mapped store")
+    parser.add_argument("--path", default=RESOURCE_STORE_PATH, help="Output file")
+    args = parser.parse_args()
+    report = build_resource_store(args.path)
+    for name, count in report["tables"].items():
+        print(f"{name}: {count}")
+    for name, reason in report["skipped"].items():
+        print(f"skipped {name}: {reason}")
+
+
+if __name__ == "__main__":
+    main()
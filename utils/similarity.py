@@ -0,0 +1,213 @@
+"""N-way document comparison with sparse TF-IDF similarity matrices"""
+from functools import partial
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.cluster.hierarchy import leaves_list, linkage
+from scipy.spatial.distance import squareform
+from sklearn.feature_extraction.text import TfidfVectorizer
+from .text_processing import get_tokens
+
+SIMILARITY_METRICS = ("cosine", "jaccard")
+FULL_MATRIX_LIMIT = 2000  # above this many documents only the top-k per row is kept
+DEFAULT_TOP_K = 10
+BLOCK_CELLS = 4_000_000  # dense cells per block of rows (~32 MB of float64)
+HEATMAP_LIMIT = 300  # largest matrix drawn as a heatmap
+
+
+def vectorize_documents(documents: list, remove_stopwords: bool = True, min_length: int = 3,
+                        filter_options: dict = None) -> tuple:
+    """
+    Build one sparse TF-IDF matrix for a corpus.
+
+    Args:
+        documents: List of document strings
+        remove_stopwords: Whether to remove stopwords
+        min_length: Minimum word length
+        filter_options: Extra get_tokens keyword arguments (language, stopword lists)
+
+    Returns:
+        Tuple of (L2-normalized CSR matrix of shape (n_docs, n_terms), term array)
+    """
+    vectorizer = TfidfVectorizer(
+        analyzer=partial(get_tokens, remove_stopwords=remove_stopwords, min_length=min_length,
+                         **(filter_options or {})),
+        sublinear_tf=True,
+        dtype=np.float32,
+    )
+    X = vectorizer.fit_transform(documents).tocsr()
+    return X, vectorizer.get_feature_names_out()
+
+
+def _block_similarity(X, Y, start: int, stop: int, metric: str, sizes: np.ndarray) -> np.ndarray:
+    """Dense similarity of rows start:stop of X against every row of Y."""
+    block = (X[start:stop] @ Y.T).toarray()
+    if metric == "jaccard":
+        union = sizes[start:stop, None] + sizes[None, :] - block
+        np.divide(block, union, out=block, where=union > 0)
+    return block
+
+
+def similarity_matrix(X, metric: str = "cosine", top_k: int = None, block_cells: int = BLOCK_CELLS):
+    """
+    Pairwise document similarity by blocked sparse matrix multiply.
+
+    Rows are processed in blocks whose dense product stays under
+    block_cells, so peak memory is bounded by the block (plus the output).
+    With top_k only the k most similar other documents per row are kept,
+    which bounds the output to n_docs * k entries.
+
+    Args:
+        X: CSR document-term matrix (L2-normalized rows for cosine)
+        metric: "cosine" or "jaccard" (on term presence)
+        top_k: Keep only the top k neighbours per row (None for the full matrix)
+        block_cells: Dense cells computed per block
+
+    Returns:
+        Dense (n_docs, n_docs) array, or a CSR matrix with top_k entries per
+        row (self-similarity excluded) when top_k is given
+    """
+    if metric not in SIMILARITY_METRICS:
+        raise ValueError(f"Unknown similarity metric: {metric}")
+    n = X.shape[0]
+    if metric == "jaccard":
+        X = (X > 0).astype(np.float32)
+    sizes = np.asarray(X.sum(axis=1)).ravel()
+    block_rows = max(block_cells // max(n, 1), 1)
+
+    if top_k is None:
+        result = np.empty((n, n), dtype=np.float32)
+        for start in range(0, n, block_rows):
+            stop = min(start + block_rows, n)
+            result[start:stop] = _block_similarity(X, X, start, stop, metric, sizes)
+        return result
+
+    k = min(top_k, n - 1)
+    rows, cols, values = [], [], []
+    for start in range(0, n, block_rows):
+        stop = min(start + block_rows, n)
+        block = _block_similarity(X, X, start, stop, metric, sizes)
+        block[np.arange(stop - start), np.arange(start, stop)] = -np.inf  # exclude self
+        if k <= 0:
+            continue
+        best = np.argpartition(-block, k - 1, axis=1)[:, :k]
+        rows.append(np.repeat(np.arange(start, stop), k))
+        cols.append(best.ravel())
+        values.append(np.take_along_axis(block, best, axis=1).ravel())
+    if not rows:
+        return sparse.csr_matrix((n, n), dtype=np.float32)
+    return sparse.csr_matrix(
+        (np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))), shape=(n, n)
+    )
+
+
+def cluster_order(matrix: np.ndarray) -> np.ndarray:
+    """
+    Order documents so that similar ones sit together (average-linkage clustering).
+
+    Args:
+        matrix: Dense symmetric similarity matrix with values in [0, 1]
+
+    Returns:
+        Array of document indices in leaf order
+    """
+    n = matrix.shape[0]
+    if n < 3:
+        return np.arange(n)
+    distance = np.clip(1 - (matrix + matrix.T) / 2, 0, None).astype(np.float64)
+    np.fill_diagonal(distance, 0)
+    return leaves_list(linkage(squareform(distance, checks=False), method="average"))
+
+
+def top_pairs(matrix, names: list, n_pairs: int = 20) -> pd.DataFrame:
+    """
+    List the most similar document pairs.
+
+    Args:
+        matrix: Dense similarity matrix or top-k CSR matrix
+        names: Document names
+        n_pairs: Number of pairs to return
+
+    Returns:
+        DataFrame with document_a, document_b and similarity, most similar first
+    """
+    if sparse.issparse(matrix):
+        coo = sparse.triu(matrix.maximum(matrix.T), k=1).tocoo()
+        a, b, values = coo.row, coo.col, coo.data
+    else:
+        a, b = np.triu_indices(matrix.shape[0], k=1)
+        values = matrix[a, b]
+    best = np.argsort(-values, kind="stable")[:n_pairs]
+    return pd.DataFrame({
+        "document_a": [names[i] for i in a[best]],
+        "document_b": [names[i] for i in b[best]],
+        "similarity": np.round(values[best].astype(np.float64), 4),
+    })
+
+
+def shared_terms(X, terms, i: int, j: int, top_n: int = 20) -> pd.DataFrame:
+    """
+    Explain one pair: the terms both documents use, by contribution to their cosine similarity.
+
+    Args:
+        X: CSR document-term matrix from vectorize_documents
+        terms: Term array from vectorize_documents
+        i: Index of the first document
+        j: Index of the second document
+        top_n: Number of terms to return
+
+    Returns:
+        DataFrame with term, weight_a, weight_b and contribution
+    """
+    a, b = X[i], X[j]
+    common, index_a, index_b = np.intersect1d(a.indices, b.indices, return_indices=True)
+    weight_a, weight_b = a.data[index_a], b.data[index_b]
+    contribution = weight_a * weight_b
+    best = np.argsort(-contribution, kind="stable")[:top_n]
+    return pd.DataFrame({
+        "term": terms[common[best]],
+        "weight_a": weight_a[best].round(4),
+        "weight_b": weight_b[best].round(4),
+        "contribution": contribution[best].round(4),
+    })
+
+
+def compare_corpus(documents: list, names: list = None, metric: str = "cosine",
+                   top_k: int = None, **options) -> dict:
+    """
+    Compare every document of a corpus with every other in one call.
+
+    The full matrix is computed up to FULL_MATRIX_LIMIT documents; larger
+    corpora keep only the top_k (DEFAULT_TOP_K by default) neighbours per row.
+
+    Args:
+        documents: List of document strings
+        names: Display names (Doc 1, Doc 2, ... by default)
+        metric: "cosine" or "jaccard"
+        top_k: Neighbours kept per row (None for automatic)
+        **options: remove_stopwords, min_length and filter_options for tokens
+
+    Returns:
+        Dictionary with matrix, names, order (clustered leaf order, or None
+        for top-k results), pairs, and the vectors and terms for drill-down,
+        or an error
+    """
+    try:
+        names = list(names) if names is not None else [f"Doc {i + 1}" for i in range(len(documents))]
+        if len(documents) < 2:
+            raise ValueError("Add at least two documents to compare")
+        X, terms = vectorize_documents(documents, **options)
+        if top_k is None and len(documents) > FULL_MATRIX_LIMIT:
+            top_k = DEFAULT_TOP_K
+        matrix = similarity_matrix(X, metric, top_k)
+        return {
+            "matrix": matrix,
+            "names": names,
+            "order": cluster_order(matrix) if top_k is None and len(documents) <= HEATMAP_LIMIT else None,
+            "pairs": top_pairs(matrix, names),
+            "vectors": X,
+            "terms": terms,
+            "metric": metric,
+        }
+    except Exception as e:
+        return {"error": str(e)}
@@ -0,0 +1,349 @@
+"""Mergeable, serializable sketches for corpus-scale statistics"""
+import base64
+import heapq
+import zlib
+from collections import Counter
+import numpy as np
+import pandas as pd
+
+HLL_PRECISION = 14  # 16,384 registers, ~0.8% standard error
+CMS_WIDTH = 2048
+CMS_DEPTH = 4
+HEAVY_HITTERS = 100
+TDIGEST_COMPRESSION = 100
+# Fixed so that sketches built in different processes agree
+CMS_MULTIPLIERS = (
+    np.random.default_rng(20240601).integers(2 ** 62, size=16, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+)
+
+
+def hash_items(items) -> np.ndarray:
+    """Stable 64-bit hashes of strings (the same in every process and run)."""
+    return pd.util.hash_array(np.asarray(list(items), dtype=object), categorize=False)
+
+
+def _encode(array: np.ndarray) -> str:
+    """Compress a table for JSON (mostly-zero tables shrink to a few hundred bytes)."""
+    return base64.b64encode(zlib.compress(np.ascontiguousarray(array).tobytes())).decode("ascii")
+
+
+def _decode(data: str, dtype, shape=None) -> np.ndarray:
+    array = np.frombuffer(zlib.decompress(base64.b64decode(data)), dtype=dtype).copy()
+    return array.reshape(shape) if shape is not None else array
+
+
+class HyperLogLog:
+    """
+    Distinct count estimate in 2**precision bytes.
+
+    Merging takes the register-wise maximum, so the sketch of a union is
+    the merge of the sketches of its parts.
+    """
+
+    def __init__(self, precision: int = HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(2 ** precision, dtype=np.uint8)
+
+    def add(self, items):
+        """Add an iterable of strings."""
+        hashes = hash_items(items)
+        if not len(hashes):
+            return self
+        p = self.precision
+        index = (hashes >> np.uint64(64 - p)).astype(np.int64)
+        rest = hashes & np.uint64((1 << (64 - p)) - 1)
+        # Rank: position of the leftmost 1-bit in the remaining 64 - p bits
+        # (exact: the remaining bits fit a float64 mantissa for p >= 11)
+        _, bit_length = np.frexp(rest.astype(np.float64))
+        rank = (64 - p - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def count(self) -> int:
+        """Estimated number of distinct items added."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)  # linear counting for small cardinalities
+        return int(round(estimate))
+
+    def merge(self, other: "HyperLogLog"):
+        """Merge another sketch with the same precision into this one."""
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def to_dict(self) -> dict:
+        return {"precision": self.precision, "registers": _encode(self.registers)}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "HyperLogLog":
+        sketch = cls(data["precision"])
+        sketch.registers = _decode(data["registers"], np.uint8)
+        return sketch
+
+
+class HeavyHitters:
+    """
+    Top-k frequent items from a Count-Min sketch plus a bounded candidate set.
+
+    Counts are over-estimates by at most total / width with high
+    probability. Only the k best candidates are remembered, so memory does
+    not grow with the vocabulary.
+    """
+
+    def __init__(self, k: int = HEAVY_HITTERS, width: int = CMS_WIDTH, depth: int = CMS_DEPTH):
+        self.k = k
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.total = 0
+        self.candidates = {}
+
+    def _columns(self, hashes: np.ndarray) -> np.ndarray:
+        """Column per row by multiply-shift hashing with a fixed odd multiplier per row."""
+        multipliers = CMS_MULTIPLIERS[:self.depth, None]
+        with np.errstate(over="ignore"):
+            mixed = hashes[None, :] * multipliers  # wraps modulo 2**64
+        return ((mixed >> np.uint64(32)) % np.uint64(self.width)).astype(np.int64)
+
+    def _estimate(self, items: list) -> np.ndarray:
+        columns = self._columns(hash_items(items))
+        return self.table[np.arange(self.depth)[:, None], columns].min(axis=0)
+
+    def _trim(self, items):
+        """Re-estimate candidates plus new items and keep the k largest."""
+        pool = list(set(self.candidates) | set(items))
+        if not pool:
+            return
+        estimates = self._estimate(pool)
+        best = heapq.nlargest(self.k, zip(pool, estimates.tolist()), key=lambda pair: pair[1])
+        self.candidates = dict(best)
+
+    def add(self, counts: dict):
+        """
+        Add item counts.
+
+        Args:
+            counts: Mapping of item to count (e.g. a Counter of one document's terms)
+        """
+        if not counts:
+            return self
+        items = list(counts)
+        weights = np.fromiter(counts.values(), dtype=np.int64, count=len(items))
+        columns = self._columns(hash_items(items))
+        for row in range(self.depth):
+            np.add.at(self.table[row], columns[row], weights)
+        self.total += int(weights.sum())
+        self._trim(items)
+        return self
+
+    def merge(self, other: "HeavyHitters"):
+        """Merge another sketch with the same shape into this one."""
+        self.table += other.table
+        self.total += other.total
+        self._trim(other.candidates)
+        return self
+
+    def top(self, n: int = 10) -> list:
+        """The n most frequent items as (item, estimated count) pairs."""
+        return sorted(self.candidates.items(), key=lambda pair: (-pair[1], pair[0]))[:n]
+
+    def to_dict(self) -> dict:
+        return {
+            "k": self.k, "width": self.width, "depth": self.depth, "total": self.total,
+            "table": _encode(self.table), "candidates": self.candidates,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "HeavyHitters":
+        sketch = cls(data["k"], data["width"], data["depth"])
+        sketch.table = _decode(data["table"], np.int64, (data["depth"], data["width"]))
+        sketch.total = data["total"]
+        sketch.candidates = {item: int(count) for item, count in data["candidates"].items()}
+        return sketch
+
+
+class TDigest:
+    """
+    Quantile sketch (merging t-digest).
+
+    Values are clustered into at most about `compression` centroids, small
+    near the tails and larger near the median, so extreme quantiles stay
+    accurate. Merging pools both sets of centroids and recompresses.
+    """
+
+    def __init__(self, compression: int = TDIGEST_COMPRESSION):
+        self.compression = compression
+        self.means = np.zeros(0)
+        self.weights = np.zeros(0)
+        self._buffer = []
+
+    def add(self, values):
+        """Add an iterable of numbers (NaNs are ignored)."""
+        self._buffer.extend(v for v in values if v == v)
+        if len(self._buffer) > 10 * self.compression:
+            self._compress()
+        return self
+
+    def _compress(self, force: bool = False):
+        """Fold buffered values into the centroids."""
+        if not self._buffer and (not force or not len(self.means)):
+            return
+        means = np.concatenate([self.means, np.asarray(self._buffer, dtype=np.float64)])
+        weights = np.concatenate([self.weights, np.ones(len(self._buffer))])
+        self._buffer = []
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+
+        # k1 scale function: centroid size limit shrinks towards q = 0 and 1
+        def k_scale(q):
+            return self.compression / (2 * np.pi) * np.arcsin(2 * np.clip(q, 0, 1) - 1)
+
+        merged_means, merged_weights = [means[0]], [weights[0]]
+        cumulative = 0.0
+        k_lower = k_scale(0.0)
+        for mean, weight in zip(means[1:], weights[1:]):
+            q = (cumulative + merged_weights[-1] + weight) / total
+            if k_scale(q) - k_lower <= 1:
+                combined = merged_weights[-1] + weight
+                merged_means[-1] += (mean - merged_means[-1]) * weight / combined
+                merged_weights[-1] = combined
+            else:
+                cumulative += merged_weights[-1]
+                k_lower = k_scale(cumulative / total)
+                merged_means.append(mean)
+                merged_weights.append(weight)
+        self.means, self.weights = np.array(merged_means), np.array(merged_weights)
+
+    def count(self) -> int:
+        return int(self.weights.sum()) + len(self._buffer)
+
+    def quantile(self, q: float) -> float:
+        """Estimated value at quantile q (0 to 1); NaN when empty."""
+        self._compress()
+        if not len(self.means):
+            return float("nan")
+        if len(self.means) == 1:
+            return float(self.means[0])
+        # Each centroid sits at the middle of its weight on the cumulative axis
+        centers = np.cumsum(self.weights) - self.weights / 2
+        return float(np.interp(q * self.weights.sum(), centers, self.means))
+
+    def merge(self, other: "TDigest"):
+        """Merge another digest into this one."""
+        other._compress()
+        self.means = np.concatenate([self.means, other.means])
+        self.weights = np.concatenate([self.weights, other.weights])
+        self._compress(force=True)
+        return self
+
+    def to_dict(self) -> dict:
+        self._compress()
+        return {"compression": self.compression, "means": self.means.tolist(), "weights": self.weights.tolist()}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TDigest":
+        digest = cls(data["compression"])
+        digest.means = np.asarray(data["means"], dtype=np.float64)
+        digest.weights = np.asarray(data["weights"], dtype=np.float64)
+        return digest
+
+
+class CorpusSketch:
+    """
+    Fixed-memory vocabulary and distribution statistics for a corpus.
+
+    Holds distinct-count sketches of terms and entities, heavy-hitter
+    sketches of terms and bigrams, and quantile digests of per-document
+    readability and sentiment. Every part merges, so sketches built on
+    separate shards or machines combine into the sketch of the whole
+    corpus, and size stays the same however many documents are added.
+    """
+
+    def __init__(self, top_k: int = HEAVY_HITTERS):
+        self.documents = 0
+        self.terms = HyperLogLog()
+        self.entities = HyperLogLog()
+        self.top_terms = HeavyHitters(top_k)
+        self.top_bigrams = HeavyHitters(top_k)
+        self.readability = TDigest()
+        self.sentiment = TDigest()
+
+    def add_document(self, tokens: list, entities: dict = None, polarity: float = None,
+                     reading_ease: float = None):
+        """
+        Add one document (or chunk).
+
+        Args:
+            tokens: Cleaned tokens in document order
+            entities: Entity counts by category, as from count_entities
+            polarity: Sentiment polarity of the document
+            reading_ease: Flesch reading ease of the document
+        """
+        self.documents += 1
+        counts = Counter(tokens)
+        self.terms.add(counts)
+        self.top_terms.add(counts)
+        self.top_bigrams.add(Counter(f"{a} {b}" for a, b in zip(tokens, tokens[1:])))
+        if entities:
+            self.entities.add({name for names in entities.values() for name in names})
+        if polarity is not None:
+            self.sentiment.add([polarity])
+        if reading_ease is not None:
+            self.readability.add([reading_ease])
+        return self
+
+    def merge(self, other: "CorpusSketch"):
+        """Merge another corpus sketch into this one."""
+        self.documents += other.documents
+        for name in ("terms", "entities", "top_terms", "top_bigrams", "readability", "sentiment"):
+            getattr(self, name).merge(getattr(other, name))
+        return self
+
+    def summary(self, top_n: int = 20, quantiles: tuple = (0.1, 0.5, 0.9)) -> dict:
+        """
+        Approximate corpus statistics.
+
+        Args:
+            top_n: Number of heavy-hitter terms and bigrams to list
+            quantiles: Quantiles of readability and sentiment to report
+
+        Returns:
+            Dictionary with documents, distinct_terms, distinct_entities,
+            top_terms and top_bigrams DataFrames, and a quantiles DataFrame
+            (one row per quantile, NaN where nothing was recorded)
+        """
+        return {
+            "documents": self.documents,
+            "distinct_terms": self.terms.count(),
+            "distinct_entities": self.entities.count(),
+            "top_terms": pd.DataFrame(self.top_terms.top(top_n), columns=["word", "frequency"]),
+            "top_bigrams": pd.DataFrame(self.top_bigrams.top(top_n), columns=["bigram", "frequency"]),
+            "quantiles": pd.DataFrame({
+                "quantile": [f"p{round(q * 100)}" for q in quantiles],
+                "flesch_reading_ease": [round(self.readability.quantile(q), 2) for q in quantiles],
+                "polarity": [round(self.sentiment.quantile(q), 3) for q in quantiles],
+            }),
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "documents": self.documents,
+            **{name: getattr(self, name).to_dict()
+               for name in ("terms", "entities", "top_terms", "top_bigrams", "readability", "sentiment")},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CorpusSketch":
+        sketch = cls()
+        sketch.documents = data["documents"]
+        sketch.terms = HyperLogLog.from_dict(data["terms"])
+        sketch.entities = HyperLogLog.from_dict(data["entities"])
+        sketch.top_terms = HeavyHitters.from_dict(data["top_terms"])
+        sketch.top_bigrams = HeavyHitters.from_dict(data["top_bigrams"])
+        sketch.readability = TDigest.from_dict(data["readability"])
+        sketch.sentiment = TDigest.from_dict(data["sentiment"])
+        return sketch
@@ -0,0 +1,105 @@
+"""Extractive summarization with sparse TF-IDF sentence vectors"""
+import re
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from .filters import get_stopwords
+
+SENTENCE_PATTERN = re.compile(r"[^.!?\n]+[.!?]*[\"'”’)\]]*")
+MIN_SENTENCE_WORDS = 4
+SUMMARY_THRESHOLD = 2000  # cleaned-text length above which the UI shows a summary instead
+
+
+def split_sentences(text: str, min_words: int = MIN_SENTENCE_WORDS) -> list:
+    """
+    Split text into sentences with their character offsets.
+
+    Args:
+        text: Input text
+        min_words: Skip fragments with fewer words (headings, list bullets)
+
+    Returns:
+        List of (start offset, end offset) tuples into text
+    """
+    spans = []
+    for match in SENTENCE_PATTERN.finditer(text):
+        start, end = match.span()
+        sentence = match.group()
+        start += len(sentence) - len(sentence.lstrip())
+        end -= len(sentence) - len(sentence.rstrip())
+        if end > start and len(text[start:end].split()) >= min_words:
+            spans.append((start, end))
+    return spans
+
+
+def _mmr_select(X, relevance: np.ndarray, n_sentences: int, diversity: float) -> list:
+    """Greedy maximal marginal relevance over L2-normalized sparse rows."""
+    selected = []
+    redundancy = np.zeros(X.shape[0])
+    candidates = np.ones(X.shape[0], dtype=bool)
+    for _ in range(min(n_sentences, X.shape[0])):
+        scores = (1 - diversity) * relevance - diversity * redundancy
+        scores[~candidates] = -np.inf
+        best = int(scores.argmax())
+        selected.append(best)
+        candidates[best] = False
+        # Only similarities to the newest pick change: one sparse mat-vec per step
+        similarity = np.asarray((X @ X[best].T).todense()).ravel()
+        np.maximum(redundancy, similarity, out=redundancy)
+    return selected
+
+
+def summarize(text: str, n_sentences: int = 5, method: str = "centrality",
+              diversity: float = 0.3, language: str = "en") -> pd.DataFrame:
+    """
+    Extract the most representative sentences of a text.
+
+    Sentences are TF-IDF vectors in one sparse matrix. Centrality scores
+    each sentence by cosine similarity to the document centroid, one sparse
+    mat-vec that scales linearly with the text. MMR re-ranks by the same
+    relevance while penalizing similarity to sentences already picked.
+
+    Args:
+        text: Input text
+        n_sentences: Number of sentences to return
+        method: "centrality" or "mmr"
+        diversity: MMR trade-off between relevance (0) and novelty (1)
+        language: Stopword language (ISO code or NLTK name)
+
+    Returns:
+        DataFrame with sentence, score, start and end offsets, in text order
+    """
+    try:
+        if method not in ("centrality", "mmr"):
+            raise ValueError(f"Unknown summarization method: {method}")
+        spans = split_sentences(text)
+        columns = ["sentence", "score", "start", "end"]
+        if not spans:
+            return pd.DataFrame(columns=columns)
+
+        sentences = [text[start:end] for start, end in spans]
+        vectorizer = TfidfVectorizer(stop_words=list(get_stopwords(language)), sublinear_tf=True)
+        try:
+            X = vectorizer.fit_transform(sentences)
+        except ValueError:  # only stopwords
+            return pd.DataFrame(columns=columns)
+
+        centroid = np.asarray(X.mean(axis=0)).ravel()
+        norm = np.linalg.norm(centroid)
+        relevance = X @ (centroid / norm) if norm else np.zeros(len(sentences))
+
+        if method == "mmr":
+            selected = _mmr_select(X, relevance, n_sentences, diversity)
+        else:
+            k = min(n_sentences, len(sentences))
+            selected = np.argpartition(-relevance, k - 1)[:k]
+        selected = sorted(int(i) for i in selected)
+
+        return pd.DataFrame({
+            "sentence": [sentences[i] for i in selected],
+            "score": relevance[selected].round(4),
+            "start": [spans[i][0] for i in selected],
+            "end": [spans[i][1] for i in selected],
+        })
+    except Exception as e:
+        return pd.DataFrame({"error": [str(e)]})
@@ -2,49 +2,52 @@
 import re
 from collections import Counter
 import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
 import pandas as pd
+from .filters import get_token_filter
+from .normalization import DEFAULT_NORMALIZATION, get_normalizer
+from .nlp_features import get_language
 # Ensure NLTK data is available
 try:
     nltk.data.find('tokenizers/punkt_tab')
 except LookupError:
     nltk.download('punkt_tab', quiet=True)
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords', quiet=True)
-
-STOPWORDS = set(stopwords.words("english"))
+NON_WORD = re.compile(r"(?:[^\w\s]|\d)+")
+WORD_PATTERN = re.compile(r"\S+")
+# A maximal run between sentence delimiters that holds a non-space character
+SENTENCE_PATTERN = re.compile(r"[^.!?]*?[^.!?\s][^.!?]*")
 
 @staticmethod
-def preprocess_text(text: str, remove_stopwords: bool = True, min_length: int = 3) -> str:
+def preprocess_text(text: str, remove_stopwords: bool = True, min_length: int = 3,
+                    language: str = "en", stopword_files: tuple = (),
+                    extra_stopwords: tuple = (), allow_words: tuple = (),
+                    normalization: tuple = DEFAULT_NORMALIZATION) -> str:
     """
     Clean and preprocess text.
     
     Args:
         text: Input text to preprocess
-        remove_stopwords: Whether to remove English stopwords
+        remove_stopwords: Whether to remove stopwords
         min_length: Minimum word length to keep
+        language: Stopword language (ISO code, NLTK name, or "auto" to detect)
+        stopword_files: Paths to custom domain stopword files
+        extra_stopwords: Additional stopwords
+        allow_words: Words that are never removed as stopwords
+        normalization: Normalization steps applied before tokenizing (see NORMALIZATION_STEPS)
         
     Returns:
         Cleaned text
     """
-    text = text.lower()
-    text = re.sub(r"\d+", " ", text)  # remove numbers
-    text = re.sub(r"[^\w\s]", " ", text)  # remove punctuation
-    tokens = word_tokenize(text)
-    
-    if remove_stopwords:
-        tokens = [t for t in tokens if t.isalpha() and t not in STOPWORDS and len(t) >= min_length]
-    else:
-        tokens = [t for t in tokens if t.isalpha() and len(t) >= min_length]
-    
-    return " ".join(tokens)
+    return " ".join(get_tokens(
+        text, remove_stopwords, min_length, language,
+        stopword_files, extra_stopwords, allow_words, normalization,
+    ))
 
 @staticmethod
-def get_tokens(text: str, remove_stopwords: bool = True, min_length: int = 3) -> list:
+def get_tokens(text: str, remove_stopwords: bool = True, min_length: int = 3,
+               language: str = "en", stopword_files: tuple = (),
+               extra_stopwords: tuple = (), allow_words: tuple = (),
+               normalization: tuple = DEFAULT_NORMALIZATION) -> list:
     """
     Get list of tokens from text.
     
@@ -52,21 +55,81 @@ def get_tokens(text: str, remove_stopwords: bool = True, min_length: int = 3) ->
         text: Input text
         remove_stopwords: Whether to remove stopwords
         min_length: Minimum word length
+        language: Stopword language (ISO code, NLTK name, or "auto" to detect)
+        stopword_files: Paths to custom domain stopword files
+        extra_stopwords: Additional stopwords
+        allow_words: Words that are never removed as stopwords
+        normalization: Normalization steps applied before tokenizing (see NORMALIZATION_STEPS)
         
     Returns:
         List of tokens
     """
-    text = text.lower()
-    text = re.sub(r"\d+", " ", text)
-    text = re.sub(r"[^\w\s]", " ", text)
-    tokens = word_tokenize(text)
-    
-    if remove_stopwords:
-        tokens = [t for t in tokens if t.isalpha() and t not in STOPWORDS and len(t) >= min_length]
-    else:
-        tokens = [t for t in tokens if t.isalpha() and len(t) >= min_length]
+    if language == "auto":
+        language = get_language(text)
+    token_filter = get_token_filter(
+        language, remove_stopwords, min_length,
+        tuple(stopword_files), tuple(extra_stopwords), tuple(allow_words),
+    )
     
-    return tokens
+    text = get_normalizer(tuple(normalization))(text).lower()
+    # Digits and punctuation become spaces and tokens are split on whitespace.
+    # Unlike word_tokenize, fused forms stay whole: "cannot", "gonna", "wanna",
+    # "gotta", "gimme" and "lemme" are one token each.
+    return token_filter(NON_WORD.sub(" ", text).split())
+
+class FrequencyTable:
+    """
+    Word counts that behave like the sorted word/count DataFrame.
+
+    Only what is read gets built: len() and .empty come from the Counter,
+    head(n) builds n rows from a heapq.nlargest top-k, and the full sorted
+    DataFrame is materialized (once) only when a whole table is requested,
+    through to_frame() or any other DataFrame attribute.
+    """
+
+    columns = ["word", "count"]
+
+    def __init__(self, counts: Counter):
+        self.counts = counts
+        self._frame = None
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    @property
+    def empty(self) -> bool:
+        return not self.counts
+
+    def head(self, n: int = 5) -> pd.DataFrame:
+        """Top n words by count."""
+        if self._frame is not None:
+            return self._frame.head(n)
+        return pd.DataFrame(self.counts.most_common(n), columns=self.columns)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Full table of words sorted by count."""
+        if self._frame is None:
+            self._frame = pd.DataFrame(self.counts.most_common(), columns=self.columns)
+        return self._frame
+
+    def __getitem__(self, key):
+        return self.to_frame()[key]
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.to_frame(), name)
+
+
+def count_words(text: str) -> int:
+    """Number of whitespace-separated words, without building a word list."""
+    return sum(1 for _ in WORD_PATTERN.finditer(text))
+
+
+def count_sentences(text: str) -> int:
+    """Number of non-blank segments between runs of . ! ?, without splitting the text."""
+    return sum(1 for _ in SENTENCE_PATTERN.finditer(text))
+
 
 def get_text_statistics(text: str, tokens: list) -> dict:
     """
@@ -77,31 +140,27 @@ def get_text_statistics(text: str, tokens: list) -> dict:
         tokens: Preprocessed tokens
         
     Returns:
-        Dictionary of statistics
+        Dictionary of statistics; freq_df is a FrequencyTable
     """
-    sentences = re.split(r'[.!?]+', text)
-    sentences = [s.strip() for s in sentences if s.strip()]
-    
-    words_in_original = len(text.split())
+    words_in_original = count_words(text)
     characters = len(text)
-    characters_no_space = len(text.replace(" ", ""))
-    avg_word_length = characters_no_space / len(text.split()) if text.split() else 0
+    characters_no_space = characters - text.count(" ")
+    avg_word_length = characters_no_space / words_in_original if words_in_original else 0
     
     # Estimate reading time (200 words per minute)
-    reading_time_minutes = len(text.split()) / 200
+    reading_time_minutes = words_in_original / 200
     
-    freq = Counter(tokens)
-    freq_df = pd.DataFrame(freq.items(), columns=["word", "count"]).sort_values(by="count", ascending=False)
+    freq = FrequencyTable(Counter(tokens))
     
     return {
         "total_words_cleaned": len(tokens),
-        "unique_words": len(set(tokens)),
+        "unique_words": len(freq),
         "total_words_original": words_in_original,
         "characters": characters,
         "characters_no_space": characters_no_space,
         "avg_word_length": round(avg_word_length, 2),
-        "sentence_count": len(sentences),
+        "sentence_count": count_sentences(text),
         "reading_time_minutes": round(reading_time_minutes, 2),
-        "freq_df": freq_df,
-        "top10": freq_df.head(10),
+        "freq_df": freq,
+        "top10": freq.head(10),
     }
@@ -0,0 +1,262 @@
+"""Windowed analysis of timestamped document streams"""
+import math
+from collections import Counter
+import pandas as pd
+from .chunking import analyze_chunk
+from .nlp_features import label_sentiment
+
+TIMESERIES_FEATURES = ("statistics", "sentiment", "language", "entities")
+
+
+def _empty_state() -> dict:
+    return {
+        "documents": 0, "words": 0, "freq": Counter(), "sentiment": Counter(),
+        "language": Counter(), "entities": Counter(),
+    }
+
+
+def _add(state: dict, partial: dict, sign: int = 1):
+    """Add (sign=1) or subtract (sign=-1) one bucket or document partial."""
+    state["documents"] += sign * partial["documents"]
+    state["words"] += sign * partial["words"]
+    for key in ("freq", "sentiment", "language", "entities"):
+        if sign > 0:
+            state[key].update(partial[key])
+        else:
+            state[key].subtract(partial[key])
+
+
+def _prune(counter: Counter):
+    """Drop keys whose running count fell to zero."""
+    for key in [k for k, v in counter.items() if v <= 0]:
+        del counter[key]
+
+
+class WindowedAnalyzer:
+    """
+    Tumbling or sliding window aggregates over (timestamp, text) records.
+
+    Records are analyzed once and folded into per-step buckets of additive
+    counts. A window is the sum of its buckets and is maintained as a
+    running sum while scanning: the bucket entering the window is added and
+    the one leaving it is subtracted, so nothing is recomputed from text
+    and adding records only touches their own buckets.
+    """
+
+    def __init__(self, window: str = "1D", step: str = None,
+                 features: tuple = ("statistics", "sentiment", "language"),
+                 remove_stopwords: bool = True, min_length: int = 3, filter_options: dict = None):
+        self.window = pd.Timedelta(window)
+        self.step = pd.Timedelta(step or window)
+        if self.window < self.step or self.window % self.step:
+            raise ValueError("Window length must be a whole multiple of the step")
+        self.span = int(self.window / self.step)
+        self.features = tuple(f for f in features if f in TIMESERIES_FEATURES)
+        self.remove_stopwords = remove_stopwords
+        self.min_length = min_length
+        self.filter_options = filter_options
+        self.buckets = {}
+
+    def _bucket_of(self, timestamp) -> int:
+        return int(pd.Timestamp(timestamp).value // self.step.value)
+
+    def add(self, records):
+        """
+        Analyze records and fold them into their buckets.
+
+        Args:
+            records: Iterable of (timestamp, text) pairs, or a DataFrame with
+                'timestamp' and 'text' columns; order does not matter
+
+        Returns:
+            self
+        """
+        if isinstance(records, pd.DataFrame):
+            records = zip(pd.to_datetime(records["timestamp"], errors="coerce"), records["text"])
+        for timestamp, text in records:
+            if pd.isna(timestamp) or not isinstance(text, str) or not text.strip():
+                continue
+            chunk = analyze_chunk(text, self.features, self.remove_stopwords,
+                                  self.min_length, self.filter_options)
+            partial = {
+                "documents": 1,
+                "words": chunk["words"],
+                "freq": chunk.get("freq", Counter()),
+                "sentiment": chunk.get("sentiment", Counter()),
+                "language": chunk.get("language", Counter()),
+                "entities": Counter(
+                    (category, name)
+                    for category, names in chunk.get("entities", {}).items() if category != "error"
+                    for name in names.elements()
+                ),
+            }
+            bucket = self.buckets.setdefault(self._bucket_of(timestamp), _empty_state())
+            _add(bucket, partial)
+        return self
+
+    def iter_windows(self):
+        """
+        Yield the running aggregate of every window that contains records, oldest first.
+
+        Only windows overlapping an occupied bucket are visited, so a lone
+        outlier timestamp costs a few windows rather than every step in
+        between; windows without records are left out of the results.
+        The yielded state is reused between windows; copy it to keep it.
+
+        Yields:
+            Tuples of (window start, window end, aggregate state); bounds
+            are naive UTC timestamps
+        """
+        if not self.buckets:
+            return
+        last = max(self.buckets)
+        ends = sorted({index + k for index in self.buckets for k in range(self.span) if index + k <= last})
+        empty = _empty_state()
+        state, previous = _empty_state(), None
+        for index in ends:
+            contiguous = previous == index - 1
+            if not contiguous:
+                state = _empty_state()  # every earlier bucket has left the window
+            _add(state, self.buckets.get(index, empty))
+            leaving = self.buckets.get(index - self.span)
+            if contiguous and leaving is not None:
+                _add(state, leaving, -1)
+                for key in ("freq", "language", "entities"):
+                    _prune(state[key])
+            previous = index
+            end = pd.Timestamp((index + 1) * self.step.value)
+            yield end - self.window, end, state
+
+    def trends(self, top_n: int = 5) -> pd.DataFrame:
+        """
+        Summarize each window.
+
+        Args:
+            top_n: Number of top terms listed per window
+
+        Returns:
+            DataFrame with window bounds, document and word counts, mean
+            polarity and subjectivity, main language and top terms
+        """
+        rows = []
+        for start, end, state in self.iter_windows():
+            sentiment = state["sentiment"]
+            weight = sentiment["weight"]
+            polarity = sentiment["polarity"] / weight if weight else None
+            languages = [lang for lang, n in state["language"].most_common() if lang != "unknown" and n > 0]
+            rows.append({
+                "window_start": start,
+                "window_end": end,
+                "documents": state["documents"],
+                "words": state["words"],
+                "polarity": round(polarity, 3) if polarity is not None else None,
+                "subjectivity": round(sentiment["subjectivity"] / weight, 3) if weight else None,
+                "sentiment": label_sentiment(polarity)[0] if polarity is not None else None,
+                "language": languages[0] if languages else None,
+                "top_terms": ", ".join(term for term, _ in state["freq"].most_common(top_n)),
+            })
+        return pd.DataFrame(rows)
+
+    def term_trends(self, terms: list = None, top_n: int = 8, kind: str = "freq") -> pd.DataFrame:
+        """
+        Count terms (or entities) per window.
+
+        Args:
+            terms: Terms to track (the overall top_n by default)
+            top_n: Number of terms when terms is not given
+            kind: "freq" for keywords or "entities" for named entities
+
+        Returns:
+            Wide DataFrame with window_start and one column per term
+        """
+        if terms is None:
+            overall = Counter()
+            for bucket in self.buckets.values():
+                overall.update(bucket[kind])
+            terms = [term for term, _ in overall.most_common(top_n)]
+        rows = []
+        for start, _, state in self.iter_windows():
+            counts = state[kind]
+            row = {"window_start": start}
+            row.update({_term_label(term): counts.get(term, 0) for term in terms})
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+    def bursty_terms(self, history: int = 4, z_threshold: float = 3.0, min_count: int = 3,
+                     kind: str = "freq") -> pd.DataFrame:
+        """
+        Find terms whose window count jumps above their recent rate.
+
+        A term's expected count is its share of words over the previous
+        `history` non-overlapping windows times the current window size;
+        the burst score is a Poisson z-score of the observed count.
+
+        Args:
+            history: Number of earlier windows forming the baseline
+            z_threshold: Minimum z-score to report
+            min_count: Minimum count in the window to report
+            kind: "freq" for keywords or "entities" for named entities
+
+        Returns:
+            DataFrame with window_start, term, count, expected and z, strongest first
+        """
+        past = {}  # window start -> (words, counts) for recent windows
+        first = None
+        rows = []
+        for start, _, state in self.iter_windows():
+            first = start if first is None else first
+            # The previous non-overlapping windows; a skipped window had no records
+            earlier = [start - k * self.window for k in range(1, history + 1)]
+            baselines = [past.get(s, (0, Counter())) for s in earlier if s >= first]
+            if baselines:
+                base_words = sum(words for words, _ in baselines)
+                for term, count in state[kind].items():
+                    if count < min_count:
+                        continue
+                    base_count = sum(counts.get(term, 0) for _, counts in baselines)
+                    expected = state["words"] * (base_count + 0.5) / max(base_words, 1)
+                    z = (count - expected) / math.sqrt(expected)
+                    if z >= z_threshold:
+                        rows.append((start, _term_label(term), count, round(expected, 2), round(z, 2)))
+            past[start] = (state["words"], Counter(state[kind]))
+            for stale in [s for s in past if s <= start - history * self.window]:
+                del past[stale]
+        df = pd.DataFrame(rows, columns=["window_start", "term", "count", "expected", "z"])
+        return df.sort_values("z", ascending=False).reset_index(drop=True)
+
+
+def _term_label(term) -> str:
+    """Display label for a keyword or (category, name) entity key."""
+    return f"{term[1]} ({term[0]})" if isinstance(term, tuple) else term
+
+
+def analyze_timeseries(records, window: str = "1D", step: str = None,
+                       features: tuple = ("statistics", "sentiment", "language"),
+                       **options) -> dict:
+    """
+    Run a windowed analysis in one call.
+
+    Args:
+        records: Iterable of (timestamp, text) pairs or a DataFrame with
+            'timestamp' and 'text' columns
+        window: Window length (pandas offset string, e.g. '1D', '6h')
+        step: Slide between windows (defaults to window, i.e. tumbling)
+        features: Features to aggregate (see TIMESERIES_FEATURES)
+        **options: remove_stopwords, min_length and filter_options for tokens
+
+    Returns:
+        Dictionary with trends, term_trends and bursts DataFrames (plus
+        entity_trends when entities are tracked), or an error
+    """
+    try:
+        analyzer = WindowedAnalyzer(window, step, features, **options).add(records)
+        results = {
+            "trends": analyzer.trends(),
+            "term_trends": analyzer.term_trends(),
+            "bursts": analyzer.bursty_terms(),
+        }
+        if "entities" in analyzer.features:
+            results["entity_trends"] = analyzer.term_trends(kind="entities")
+        return results
+    except Exception as e:
+        return {"error": str(e)}
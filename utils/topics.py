@@ -0,0 +1,206 @@
+"""Incremental topic modeling over analyzed corpora"""
+import os
+import threading
+from collections import Counter
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.decomposition import LatentDirichletAllocation, MiniBatchNMF
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.utils import murmurhash3_32
+from .text_processing import get_tokens
+
+MODEL_DIR = os.environ.get("NLP_INSPECTOR_MODEL_DIR", "models")
+TOPIC_MODEL_PATH = os.path.join(MODEL_DIR, "topic_model.joblib")
+
+N_FEATURES = 2 ** 18
+MAX_TRACKED_TERMS = 50000  # bound on the hashed-index -> term lookup
+
+
+def _identity(tokens: list) -> list:
+    """Analyzer for pre-tokenized documents (module-level so it pickles)."""
+    return tokens
+
+
+class TopicModel:
+    """
+    Online LDA / mini-batch NMF topic model over hashed term counts.
+
+    Documents are vectorized with a stateless HashingVectorizer, so new
+    batches never change the feature space and the model can be updated
+    with partial_fit. A bounded term lookup maps hashed columns back to the
+    most frequent words seen for them, for topic summaries.
+    """
+
+    def __init__(self, n_topics: int = 8, method: str = "lda", n_features: int = N_FEATURES,
+                 random_state: int = 0):
+        if method not in ("lda", "nmf"):
+            raise ValueError(f"Unknown topic model method: {method}")
+        self.n_topics = n_topics
+        self.method = method
+        self.n_features = n_features
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features,
+            analyzer=_identity,
+            alternate_sign=False,
+            # LDA models raw counts; NMF works better on normalized rows
+            norm=None if method == "lda" else "l2",
+        )
+        if method == "lda":
+            self.model = LatentDirichletAllocation(
+                n_components=n_topics, learning_method="online", random_state=random_state,
+            )
+        else:
+            self.model = MiniBatchNMF(n_components=n_topics, random_state=random_state)
+        self.term_counts = Counter()
+        self.n_documents = 0
+
+    def _track_terms(self, tokenized: list):
+        """Update the hashed-index -> term lookup from a tokenized batch."""
+        for tokens in tokenized:
+            self.term_counts.update(tokens)
+        if len(self.term_counts) > 2 * MAX_TRACKED_TERMS:
+            self.term_counts = Counter(dict(self.term_counts.most_common(MAX_TRACKED_TERMS)))
+
+    def partial_fit(self, docs: list):
+        """
+        Update the model with a new batch of documents.
+
+        Args:
+            docs: List of raw document strings
+
+        Returns:
+            self
+        """
+        tokenized = [get_tokens(doc, True, 3) for doc in docs if doc and doc.strip()]
+        if not tokenized:
+            return self
+        self.model.partial_fit(self.vectorizer.transform(tokenized))
+        self._track_terms(tokenized)
+        self.n_documents += len(tokenized)
+        return self
+
+    def transform(self, docs: list) -> np.ndarray:
+        """
+        Get topic weights for documents in a single vectorized call.
+
+        Args:
+            docs: List of raw document strings
+
+        Returns:
+            Array of shape (n_docs, n_topics) with rows summing to 1
+        """
+        X = self.vectorizer.transform([get_tokens(doc, True, 3) for doc in docs])
+        weights = self.model.transform(X)
+        totals = weights.sum(axis=1, keepdims=True)
+        totals[totals == 0] = 1
+        return weights / totals
+
+    def assign_topics(self, docs: list) -> pd.DataFrame:
+        """
+        Assign the dominant topic to each document.
+
+        Args:
+            docs: List of raw document strings
+
+        Returns:
+            DataFrame with topic and weight per document
+        """
+        weights = self.transform(docs)
+        topics = weights.argmax(axis=1)
+        return pd.DataFrame({
+            "topic": topics,
+            "weight": weights[np.arange(len(docs)), topics].round(3),
+        })
+
+    def _index_terms(self) -> dict:
+        """Map each hashed column to its most frequent tracked term."""
+        index_terms = {}
+        for term, _ in self.term_counts.most_common():
+            index = abs(murmurhash3_32(term, seed=0)) % self.n_features
+            index_terms.setdefault(index, term)
+        return index_terms
+
+    def top_terms(self, n_terms: int = 10) -> list:
+        """
+        Get the top terms of each topic.
+
+        Args:
+            n_terms: Number of terms per topic
+
+        Returns:
+            List of term lists, one per topic
+        """
+        if not self.n_documents:
+            return []
+        index_terms = self._index_terms()
+        columns = np.fromiter(index_terms.keys(), dtype=np.int64)
+        names = np.array(list(index_terms.values()), dtype=object)
+        components = self.model.components_[:, columns]
+        order = np.argsort(-components, axis=1)[:, :n_terms]
+        return [list(names[row]) for row in order]
+
+    def topic_summary(self, n_terms: int = 8) -> pd.DataFrame:
+        """
+        Summarize topics as a table of top terms.
+
+        Args:
+            n_terms: Number of terms per topic
+
+        Returns:
+            DataFrame with topic id and top terms
+        """
+        terms = self.top_terms(n_terms)
+        return pd.DataFrame({
+            "topic": range(len(terms)),
+            "top_terms": [", ".join(t) for t in terms],
+        })
+
+    def save(self, path: str = TOPIC_MODEL_PATH):
+        """Save the fitted model to disk, replacing any saved model atomically."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        joblib.dump(self, tmp_path)
+        os.replace(tmp_path, path)
+
+
+def load_topic_model(path: str = TOPIC_MODEL_PATH):
+    """
+    Load a saved topic model.
+
+    Args:
+        path: Path to the saved model
+
+    Returns:
+        TopicModel, or None if no model has been saved yet
+    """
+    if not os.path.exists(path):
+        return None
+    return joblib.load(path)
+
+
+_update_lock = threading.Lock()
+
+
+def update_topic_model(docs: list, n_topics: int = 8, method: str = "lda",
+                       path: str = TOPIC_MODEL_PATH) -> TopicModel:
+    """
+    Fold a batch of documents into the saved topic model.
+
+    Updates are serialized and applied to a freshly loaded copy, so a model
+    other sessions are reading is never modified in place.
+
+    Args:
+        docs: List of document strings
+        n_topics: Number of topics when no model has been saved yet
+        method: "lda" or "nmf" when no model has been saved yet
+        path: Path to the saved model
+
+    Returns:
+        The updated TopicModel, already saved
+    """
+    with _update_lock:
+        model = load_topic_model(path) or TopicModel(n_topics=n_topics, method=method)
+        model.partial_fit(docs)
+        model.save(path)
+    return model
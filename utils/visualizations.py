@@ -1,33 +1,120 @@
 """Visualization utilities"""
+import hashlib
+import threading
+from collections import Counter, OrderedDict
 import matplotlib.pyplot as plt
+import numpy as np
 from wordcloud import WordCloud
 import plotly.graph_objects as go
-import plotly.express as px
-from collections import Counter
 import streamlit as st
 
+MAX_CHART_POINTS = 50  # default point budget per chart
+FIGURE_CACHE_SIZE = 64
+
+_figure_cache = OrderedDict()  # key -> figure dict
+_figure_lock = threading.Lock()
+
+
+def _data_key(kind: str, labels, values, *params) -> str:
+    """Hash chart data and parameters into a cache key."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(kind.encode())
+    h.update("\x1f".join(map(str, labels)).encode("utf-8"))
+    h.update(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+    h.update(repr(params).encode())
+    return h.hexdigest()
+
+
+def _cached_figure(key: str, build):
+    """
+    Return a figure for key, building and caching it on a miss.
+
+    The cache holds the plain dicts of already validated figures. Each
+    caller gets its own go.Figure rebuilt without validating again, so
+    layout changes made in one session or rerun do not leak into the
+    others. The lock guards the cache shared by concurrent script threads.
+    """
+    with _figure_lock:
+        spec = _figure_cache.get(key)
+        if spec is not None:
+            _figure_cache.move_to_end(key)
+    if spec is None:
+        spec = build().to_plotly_json()
+        with _figure_lock:
+            _figure_cache[key] = spec
+            if len(_figure_cache) > FIGURE_CACHE_SIZE:
+                _figure_cache.popitem(last=False)
+    return go.Figure(spec, _validate=False)
+
+
+def limit_points(labels, values, max_points: int = MAX_CHART_POINTS, other_label: str = "(other)"):
+    """
+    Aggregate ranked data down to a point budget.
+    
+    The largest max_points - 1 entries are kept and the remainder is summed
+    into a single trailing "other" bar.
+    
+    Args:
+        labels: Sequence of category labels
+        values: Sequence of numeric values
+        max_points: Maximum number of points in the output
+        other_label: Label for the aggregated remainder
+        
+    Returns:
+        Tuple of (labels, values) as NumPy arrays
+    """
+    labels = np.asarray(labels, dtype=object)
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) <= max_points:
+        return labels, values
+    
+    keep = max_points - 1
+    order = np.argpartition(-values, keep)[:keep]
+    order = order[np.argsort(-values[order], kind="stable")]
+    rest = np.ones(len(values), dtype=bool)
+    rest[order] = False
+    return (
+        np.append(labels[order], other_label),
+        np.append(values[order], values[rest].sum()),
+    )
+
+
+def figure_payload_size(fig) -> int:
+    """
+    Get the size in bytes of a figure's JSON payload.
+    
+    Args:
+        fig: Plotly figure
+        
+    Returns:
+        Number of bytes sent to the browser for this figure
+    """
+    return len(fig.to_json().encode("utf-8"))
+
 
 def create_wordcloud(tokens: list, title: str = "Word Cloud"):
     """
     Create and display a word cloud.
     
     Args:
-        tokens: List of tokens
+        tokens: List of tokens, or a {word: count} mapping (e.g. merged chunk counts)
         title: Title for the word cloud
         
     Returns:
         Plotly figure
     """
     try:
-        text = " ".join(tokens)
-        
         wordcloud = WordCloud(
             width=800,
             height=400,
             background_color='white',
             colormap='viridis',
             max_words=100
-        ).generate(text)
+        )
+        if isinstance(tokens, dict):
+            wordcloud.generate_from_frequencies(tokens)
+        else:
+            wordcloud.generate(" ".join(tokens))
         
         fig, ax = plt.subplots(figsize=(12, 6))
         ax.imshow(wordcloud, interpolation='bilinear')
@@ -40,13 +127,14 @@ def create_wordcloud(tokens: list, title: str = "Word Cloud"):
         return None
 
 
-def create_ngram_chart(ngrams: list, n: int = 2):
+def create_ngram_chart(ngrams: list, n: int = 2, max_points: int = MAX_CHART_POINTS):
     """
     Create a bar chart for n-grams.
     
     Args:
         ngrams: List of (ngram, frequency) tuples
         n: N-gram size
+        max_points: Maximum number of bars to draw
         
     Returns:
         Plotly figure
@@ -54,25 +142,28 @@ def create_ngram_chart(ngrams: list, n: int = 2):
     if not ngrams:
         return None
     
-    ngrams_text = [ng[0] for ng in ngrams]
-    frequencies = [ng[1] for ng in ngrams]
-    
-    fig = go.Figure(data=[
-        go.Bar(x=ngrams_text, y=frequencies, marker=dict(color='#4c78a8'))
-    ])
-    
-    fig.update_layout(
-        title=f"Top {len(ngrams)} {n}-grams",
-        xaxis_title="N-grams",
-        yaxis_title="Frequency",
-        template="plotly_white",
-        height=500,
-        showlegend=False,
+    ngrams_text, frequencies = limit_points(
+        [ng[0] for ng in ngrams], [ng[1] for ng in ngrams], max_points
     )
     
-    fig.update_xaxes(tickangle=-45)
+    def build():
+        fig = go.Figure(data=[
+            go.Bar(x=ngrams_text, y=frequencies, marker=dict(color='#4c78a8'))
+        ])
+        
+        fig.update_layout(
+            title=f"Top {len(ngrams_text)} {n}-grams",
+            xaxis_title="N-grams",
+            yaxis_title="Frequency",
+            template="plotly_white",
+            height=500,
+            showlegend=False,
+        )
+        
+        fig.update_xaxes(tickangle=-45)
+        return fig
     
-    return fig
+    return _cached_figure(_data_key("ngram", ngrams_text, frequencies, n), build)
 
 
 def create_sentiment_gauge(polarity: float, subjectivity: float):
@@ -88,34 +179,36 @@ def create_sentiment_gauge(polarity: float, subjectivity: float):
     """
     # Convert polarity from -1,1 to 0,100 scale
     polarity_scale = ((polarity + 1) / 2) * 100
-    subjectivity_scale = subjectivity * 100
-    
-    fig = go.Figure(data=[
-        go.Indicator(
-            mode="gauge+number",
-            value=polarity_scale,
-            domain={'x': [0, 1], 'y': [0, 1]},
-            title={'text': "Sentiment Polarity"},
-            gauge={
-                'axis': {'range': [0, 100]},
-                'bar': {'color': "darkblue"},
-                'steps': [
-                    {'range': [0, 33], 'color': "lightcoral"},
-                    {'range': [33, 66], 'color': "lightyellow"},
-                    {'range': [66, 100], 'color': "lightgreen"}
-                ],
-                'threshold': {
-                    'line': {'color': "red", 'width': 4},
-                    'thickness': 0.75,
-                    'value': 50
+    
+    def build():
+        fig = go.Figure(data=[
+            go.Indicator(
+                mode="gauge+number",
+                value=polarity_scale,
+                domain={'x': [0, 1], 'y': [0, 1]},
+                title={'text': "Sentiment Polarity"},
+                gauge={
+                    'axis': {'range': [0, 100]},
+                    'bar': {'color': "darkblue"},
+                    'steps': [
+                        {'range': [0, 33], 'color': "lightcoral"},
+                        {'range': [33, 66], 'color': "lightyellow"},
+                        {'range': [66, 100], 'color': "lightgreen"}
+                    ],
+                    'threshold': {
+                        'line': {'color': "red", 'width': 4},
+                        'thickness': 0.75,
+                        'value': 50
+                    }
                 }
-            }
-        )
-    ])
+            )
+        ])
     
-    fig.update_layout(height=400)
+        fig.update_layout(height=400)
     
-    return fig
+        return fig
+    
+    return _cached_figure(_data_key("gauge", [], [polarity_scale]), build)
 
 
 def create_frequency_comparison(freq_df, top_n=10):
@@ -130,22 +223,99 @@ def create_frequency_comparison(freq_df, top_n=10):
         Plotly figure
     """
     top_df = freq_df.head(top_n)
+    words = top_df["word"].to_numpy(dtype=object)
+    counts = top_df["count"].to_numpy(dtype=np.float64)
     
-    fig = px.bar(
-        top_df,
-        x='word',
-        y='count',
-        title=f"Top {top_n} Most Frequent Words",
-        labels={'word': 'Word', 'count': 'Frequency'},
-        color='count',
-        color_continuous_scale='Viridis',
-    )
+    def build():
+        fig = go.Figure(data=[
+            go.Bar(
+                x=words,
+                y=counts,
+                marker=dict(color=counts, colorscale='Viridis', showscale=True,
+                            colorbar=dict(title='Frequency')),
+                hovertemplate="Word=%{x}<br>Frequency=%{y}<extra></extra>",
+            )
+        ])
+        
+        fig.update_layout(
+            title=f"Top {top_n} Most Frequent Words",
+            xaxis_title="Word",
+            yaxis_title="Frequency",
+            template="plotly_white",
+            height=500,
+            showlegend=False,
+            xaxis_tickangle=-45,
+        )
+        return fig
     
-    fig.update_layout(
-        template="plotly_white",
-        height=500,
-        showlegend=False,
-        xaxis_tickangle=-45,
-    )
+    return _cached_figure(_data_key("frequency", words, counts, top_n), build)
+
+
+def create_trend_chart(trend_df, columns: list, title: str = "Trends", y_title: str = "Value",
+                       x_column: str = "window_start"):
+    """
+    Create a line chart of per-window values over time.
+    
+    Args:
+        trend_df: DataFrame with one row per window
+        columns: Columns to plot as lines
+        title: Chart title
+        y_title: Y axis title
+        x_column: Column with the window timestamps
+        
+    Returns:
+        Plotly figure
+    """
+    x = trend_df[x_column].astype(str).to_numpy(dtype=object)
+    values = trend_df[columns].to_numpy(dtype=np.float64)
+    
+    def build():
+        fig = go.Figure(data=[
+            go.Scatter(x=x, y=values[:, i], mode="lines+markers", name=str(column), connectgaps=False)
+            for i, column in enumerate(columns)
+        ])
+        fig.update_layout(
+            title=title,
+            xaxis_title="Window start",
+            yaxis_title=y_title,
+            template="plotly_white",
+            height=400,
+            hovermode="x unified",
+        )
+        return fig
+    
+    return _cached_figure(_data_key("trend", list(x) + list(columns), values.ravel(), title, y_title), build)
+
+
+def create_similarity_heatmap(matrix, names: list, order=None, title: str = "Document Similarity"):
+    """
+    Create a heatmap of a pairwise similarity matrix.
+    
+    Args:
+        matrix: Dense (n, n) similarity matrix
+        names: Document names
+        order: Document order (e.g. clustered leaf order); input order by default
+        title: Chart title
+        
+    Returns:
+        Plotly figure
+    """
+    order = np.arange(len(names)) if order is None else np.asarray(order)
+    labels = np.array(names, dtype=object)[order]
+    values = np.asarray(matrix, dtype=np.float64)[np.ix_(order, order)]
+    
+    def build():
+        fig = go.Figure(data=go.Heatmap(
+            z=values, x=labels, y=labels, colorscale="Viridis", zmin=0, zmax=1,
+            hovertemplate="%{y} ↔ %{x}<br>Similarity=%{z:.3f}<extra></extra>",
+        ))
+        fig.update_layout(
+            title=title,
+            template="plotly_white",
+            height=max(400, min(900, 20 * len(labels) + 150)),
+            xaxis=dict(showticklabels=len(labels) <= 60, tickangle=-45),
+            yaxis=dict(showticklabels=len(labels) <= 60, autorange="reversed"),
+        )
+        return fig
     
-    return fig
+    return _cached_figure(_data_key("similarity", list(labels), values.ravel(), title), build)